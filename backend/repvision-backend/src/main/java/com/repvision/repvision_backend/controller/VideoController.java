@@ -10,7 +10,10 @@ import org.springframework.security.core.Authentication;
 import org.springframework.web.bind.annotation.*;
 import com.repvision.repvision_backend.dto.AnalysisCategoryDto;
 import com.repvision.repvision_backend.dto.AnalysisSummaryDto;
+import java.util.ArrayList;
 import java.util.List;
+import java.util.Map;
+import java.util.NoSuchElementException;
 
 @RestController
 @RequestMapping("/api/videos")
@@ -47,6 +50,32 @@ public class VideoController {
         }
     }
 
+    @PostMapping("/results/batch")
+    public ResponseEntity<?> receiveAnalysisResultsBatch(
+            @RequestBody List<AnalysisResultRequest> resultRequests) {
+
+        // missingVideoIds: kayıt yok, tekrar denemek sonucu değiştirmez.
+        // failedVideoIds: geçici hata (örn. veritabanı), analiz servisi bunları tekrar gönderir.
+        List<Long> missingVideoIds = new ArrayList<>();
+        List<Long> failedVideoIds = new ArrayList<>();
+        for (AnalysisResultRequest resultRequest : resultRequests) {
+            try {
+                videoService.updateAnalysisResults(resultRequest);
+            } catch (NoSuchElementException e) {
+                System.out.println(e.getMessage());
+                missingVideoIds.add(resultRequest.getVideoId());
+            } catch (Exception e) {
+                e.printStackTrace();
+                failedVideoIds.add(resultRequest.getVideoId());
+            }
+        }
+        return ResponseEntity.ok().body(Map.of(
+                "received", resultRequests.size(),
+                "missingVideoIds", missingVideoIds,
+                "failedVideoIds", failedVideoIds
+        ));
+    }
+
     @GetMapping("/my-analysis-categories")
     public ResponseEntity<?> getMyAnalysisCategories(Authentication authentication) {
         try {
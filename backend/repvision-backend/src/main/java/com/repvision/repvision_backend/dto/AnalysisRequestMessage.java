@@ -11,4 +11,6 @@ public class AnalysisRequestMessage {
     private Long videoId;
     private String videoUrl;
     private String exerciseName;
+    // null: istemci belirtmedi, analiz servisinin varsayılanı (ANALYSIS_RENDER_OUTPUT) kullanılır
+    private Boolean renderOutput;
 }
@@ -6,4 +6,5 @@ import lombok.Data;
 public class VideoUploadRequest {
     private String videoUrl;
     private String exerciseName;
+    private Boolean renderOutput;
 }
\ No newline at end of file
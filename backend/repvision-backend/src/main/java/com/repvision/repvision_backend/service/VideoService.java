@@ -18,7 +18,9 @@ import org.springframework.beans.factory.annotation.Autowired;
 import org.springframework.security.core.userdetails.UsernameNotFoundException;
 import org.springframework.stereotype.Service;
 import org.springframework.transaction.annotation.Transactional;
+import java.util.Date;
 import java.util.List;
+import java.util.NoSuchElementException;
 
 
 import java.time.LocalDateTime;
@@ -53,9 +55,14 @@ public class VideoService {
         AnalysisRequestMessage message = new AnalysisRequestMessage(
                 savedAnalysis.getId(),
                 savedAnalysis.getVideoUrl(),
-                savedAnalysis.getExerciseName()
+                savedAnalysis.getExerciseName(),
+                videoRequest.getRenderOutput()
         );
-        rabbitTemplate.convertAndSend(RabbitMQConfig.QUEUE_NAME, message);
+        rabbitTemplate.convertAndSend(RabbitMQConfig.QUEUE_NAME, message, amqpMessage -> {
+            // Analiz servisi kuyruk gecikmesini (yayın -> ack) bu zamandan ölçer
+            amqpMessage.getMessageProperties().setTimestamp(new Date());
+            return amqpMessage;
+        });
 
         return savedAnalysis;
     }
@@ -63,7 +70,7 @@ public class VideoService {
     @Transactional
     public void updateAnalysisResults(AnalysisResultRequest resultRequest) {
         VideoAnalysis analysis = videoAnalysisRepository.findById(resultRequest.getVideoId())
-                .orElseThrow(() -> new RuntimeException("Video analizi kaydı bulunamadı: " + resultRequest.getVideoId()));
+                .orElseThrow(() -> new NoSuchElementException("Video analizi kaydı bulunamadı: " + resultRequest.getVideoId()));
 
         analysis.setCorrectReps(resultRequest.getCorrectReps());
         analysis.setWrongReps(resultRequest.getWrongReps());
@@ -0,0 +1,71 @@
+import numpy as np
+import queue
+import threading
+
+
+class FramePool:
+    """
+    Sabit sayıda kare tamponunu (buffer) döngüsel olarak kullandırır.
+    cap.read(tampon) aynı boyuttaki kareyi yeni dizi ayırmadan tamponun içine çözer;
+    tüketici kareyle işi bitince release() ile tamponu havuza geri verir.
+    Aynı anda bellekte en fazla 'size' kare bulunur (boru hattı kuyrukları dahil).
+    """
+
+    def __init__(self, size):
+        self.size = max(1, size)
+        self.allocated = 0
+        self._free = queue.Queue()
+        self._lock = threading.Lock()  # acquire (decode thread) / release (tüketici) sayaçları
+
+    def acquire(self, timeout=None):
+        """
+        Boş bir tampon döner. Henüz 'size' tampon ayrılmadıysa None döner:
+        cap.read yeni diziyi kendisi ayırır, dizi release() ile havuza girer.
+        Havuz doluysa bir tampon geri verilene kadar bekler (queue.Empty fırlatabilir).
+        """
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self.allocated < self.size:
+                self.allocated += 1
+                return None
+        return self._free.get(timeout=timeout)
+
+    def release(self, frame):
+        if frame is None:
+            return
+        with self._lock:
+            if self.allocated > self.size:
+                self.allocated -= 1  # Havuz küçültüldü: fazla tamponu bırak
+                return
+        self._free.put(frame)
+
+    def shrink(self, size):
+        """Havuzu küçültür; fazla tamponlar geri verildikçe serbest bırakılır."""
+        with self._lock:
+            self.size = max(1, min(self.size, size))
+            while self.allocated > self.size:
+                try:
+                    self._free.get_nowait()
+                except queue.Empty:
+                    break
+                self.allocated -= 1
+
+
+class BufferSet:
+    """
+    Adlandırılmış, yeniden kullanılan ara diziler (cvtColor / resize 'dst=' hedefleri).
+    İstenen şekil değişmedikçe aynı dizi döner, böylece her karede yeni bellek ayrılmaz.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+
+    def get(self, name, shape, dtype=np.uint8):
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buffer
+        return buffer
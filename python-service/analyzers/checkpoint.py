@@ -0,0 +1,109 @@
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass
+
+import numpy as np
+
+from analyzers.landmark_cache import LandmarkTrack, track_key
+
+# İşçi sürecinde 'kaydet ve dur' isteği (ana süreçle paylaşılan multiprocessing.Event)
+_interrupt = None
+
+
+class Interrupted(Exception):
+    """
+    Analiz, süreç kapanırken yarıda bırakıldı.
+    checkpoint: Kaydedilecek ilerleme (JobCheckpoint); kaydedilemiyorsa None.
+    """
+
+    def __init__(self, message, checkpoint=None):
+        super().__init__(message)
+        self.checkpoint = checkpoint
+
+
+def set_interrupt_event(event):
+    """İşçi süreci başlarken ana sürecin durdurma olayını kaydeder (executor initializer)."""
+    global _interrupt
+    _interrupt = event
+
+
+def interrupt_requested():
+    """Ana süreç, çalışan analizlerin ilerlemesini kaydedip durmasını istedi mi."""
+    return _interrupt is not None and _interrupt.is_set()
+
+
+def checkpoint_key(video_url, spec):
+    """Kontrol noktası anahtarı: aynı video farklı hareketle analiz edilirse ayrı tutulur."""
+    return track_key(f"{spec.name}|{video_url}")
+
+
+@dataclass
+class JobCheckpoint:
+    """
+    Yarıda kalan bir analizin ilerlemesi.
+    frame_index: Analizin devam edeceği kare (0..frame_index-1 işlendi).
+    track: İşlenen karelerin landmark izi (uzunluğu frame_index).
+    counter: O karedeki durum makinesi durumu (bkz. RepCounter.snapshot).
+    """
+    frame_index: int
+    track: LandmarkTrack
+    counter: dict
+
+
+class CheckpointStore:
+    """
+    Yarıda kalan analizlerin kontrol noktalarını diskte .npz dosyaları olarak tutar.
+    Mesaj yeniden teslim edildiğinde analiz kaydedilen kareden devam eder; iş bitince
+    kayıt silinir. Başka bir süreçte (pod) devam edilebilmesi için klasör paylaşılan
+    bir diskte olmalıdır. Sahipsiz kalan eski kayıtlar prune() ile temizlenir.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def save(self, key, checkpoint):
+        """Kontrol noktasını atomik olarak yazar."""
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = os.path.join(self.directory, f".{key}.{uuid.uuid4().hex}.tmp.npz")
+        track = checkpoint.track
+        np.savez(temp_path, landmarks=track.landmarks, sampled=track.sampled, fps=np.float64(track.fps),
+                 frame_index=np.int64(checkpoint.frame_index), counter=np.array(json.dumps(checkpoint.counter)))
+        os.replace(temp_path, self._path(key))
+
+    def load(self, key):
+        """Kontrol noktasını döner; yoksa veya okunamıyorsa None."""
+        try:
+            with np.load(self._path(key)) as data:
+                track = LandmarkTrack(data['landmarks'], data['sampled'], float(data['fps']))
+                checkpoint = JobCheckpoint(int(data['frame_index']), track, json.loads(str(data['counter'])))
+        except (OSError, KeyError, ValueError):
+            return None
+        if checkpoint.frame_index != len(track.sampled):
+            return None
+        return checkpoint
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def prune(self, max_age_seconds):
+        """Son yazımı max_age_seconds'tan eski kayıtları siler; silinen sayısını döner."""
+        if not os.path.isdir(self.directory):
+            return 0
+        removed = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if time.time() - os.stat(path).st_mtime > max_age_seconds:
+                    os.remove(path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: süreçler arası kilit yok, aynı video iki kez indirilebilir
+    fcntl = None
+
+# İndirme parça boyutu
+CHUNK_SIZE = 1024 * 1024
+# Sadece 'görüldü' işaretinin (video indirilmeden akışla analiz edildi) saklanma süresi
+SEEN_TTL_SECONDS = 24 * 3600
+
+
+class DownloadCache:
+    """
+    HTTP'den indirilen videoları diskte tutan, boyut sınırlı LRU içerik önbelleği.
+
+    - Anahtar URL'in SHA-256 özetidir; her kaydın yanında (ETag, boyut, URL, doğrulama
+      zamanı) tutan bir .json dosyası vardır. Dosya boyutu kayıtla uyuşmazsa kayıt silinir.
+    - max_age saniyeden eski kayıtlar kullanılmadan önce koşullu bir HEAD isteğiyle
+      (If-None-Match) doğrulanır; 304 veya aynı ETag/boyut gelirse dosya kullanılır.
+      Bu süre içinde (örn. yeniden deneme, parçalı analiz) hiç ağ isteği yapılmaz.
+    - Aynı videoyu aynı anda isteyen işçi süreçleri bir dosya kilidiyle sıralanır:
+      video bir kez indirilir, diğerleri önbellekten okur.
+    - Okunan dosyanın değiştirilme zamanı güncellenir; sınır aşılınca en eski
+      kullanılan videolar silinir.
+    """
+
+    def __init__(self, directory, max_bytes, max_age=3600.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    @staticmethod
+    def key(video_url):
+        return hashlib.sha256(video_url.encode('utf-8')).hexdigest()
+
+    def _paths(self, key):
+        return os.path.join(self.directory, f"{key}.video"), os.path.join(self.directory, f"{key}.json")
+
+    def _read_meta(self, key):
+        try:
+            with open(self._paths(key)[1], encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, key, meta):
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = os.path.join(self.directory, f".{key}.{uuid.uuid4().hex}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(temp_path, self._paths(key)[1])
+
+    def _remove(self, key):
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    @contextmanager
+    def _lock(self, key):
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, f".{key}.lock"), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def seen(self, video_url):
+        """Video daha önce istendi mi (indirilmiş olsun ya da olmasın)."""
+        return os.path.exists(self._paths(self.key(video_url))[1])
+
+    def mark_seen(self, video_url):
+        """Video indirilmeden (akışla) analiz edildi: bir sonraki istekte önbelleğe indirilsin."""
+        key = self.key(video_url)
+        if self._read_meta(key) is None:
+            self._write_meta(key, {"url": video_url, "seen_at": time.time()})
+
+    def _revalidate(self, video_url, meta, session):
+        """Kaydın hâlâ güncel olup olmadığını koşullu HEAD isteğiyle sorar."""
+        headers = {'If-None-Match': meta['etag']} if meta.get('etag') else {}
+        try:
+            response = session.head(video_url, headers=headers, allow_redirects=True, timeout=(3, 5))
+        except Exception as e:
+            # Sunucuya ulaşılamıyor: eldeki kopya kullanılır (bayat olsa da analiz edilebilir)
+            print(f" [!] Önbellekteki video doğrulanamadı ({type(e).__name__}), kopya kullanılıyor.")
+            return True
+        if response.status_code == 304:
+            return True
+        if response.status_code != 200:
+            return False
+        etag = response.headers.get('ETag')
+        if etag and meta.get('etag'):
+            return etag == meta['etag']
+        length = response.headers.get('Content-Length', '')
+        return length.isdigit() and int(length) == meta['size']
+
+    def lookup(self, video_url, session=None):
+        """Önbellekteki geçerli kopyanın yolunu döner; yoksa (veya bayatsa) None."""
+        key = self.key(video_url)
+        data_path = self._paths(key)[0]
+        meta = self._read_meta(key)
+        if meta is None or 'size' not in meta:
+            return None
+        try:
+            size = os.path.getsize(data_path)
+        except OSError:
+            return None
+        if size != meta['size']:
+            self._remove(key)  # Yarım / bozuk dosya
+            return None
+        if time.time() - meta['validated_at'] > self.max_age:
+            if session is None or not self._revalidate(video_url, meta, session):
+                self._remove(key)
+                return None
+            meta['validated_at'] = time.time()
+            self._write_meta(key, meta)
+        try:
+            os.utime(data_path)  # LRU: son kullanım zamanı
+        except FileNotFoundError:
+            return None  # Başka bir işçi bu arada silmiş
+        return data_path
+
+    def fetch(self, video_url, session, cancel=None):
+        """
+        Videoyu önbelleğe indirir (başka bir işçi indiriyorsa onu bekler) ve yolunu döner.
+        İndirilen boyut Content-Length ile uyuşmazsa dosya saklanmaz, IOError fırlatılır.
+        cancel (threading.Event) kurulursa indirme yarıda bırakılır (IOError).
+        """
+        key = self.key(video_url)
+        data_path = self._paths(key)[0]
+        with self._lock(key):
+            path = self.lookup(video_url, session)
+            if path is not None:
+                return path
+
+            print(f" [i] Video indiriliyor (önbelleğe)...")
+            temp_path = os.path.join(self.directory, f".{key}.{uuid.uuid4().hex}.tmp")
+            try:
+                with session.get(video_url, stream=True, timeout=(5, 60)) as response:
+                    response.raise_for_status()
+                    length = response.headers.get('Content-Length', '')
+                    # Sıkıştırılmış aktarımda Content-Length dosya boyutunu göstermez
+                    expected = int(length) if length.isdigit() and 'Content-Encoding' not in response.headers else None
+                    with open(temp_path, 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                            if cancel is not None and cancel.is_set():
+                                raise IOError("İndirme iptal edildi.")
+                            f.write(chunk)
+                    etag = response.headers.get('ETag')
+                size = os.path.getsize(temp_path)
+                if expected is not None and size != expected:
+                    raise IOError(f"Video eksik indirildi ({size} / {expected} bayt).")
+                os.replace(temp_path, data_path)
+            except Exception:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            self._write_meta(key, {"url": video_url, "etag": etag, "size": size, "validated_at": time.time()})
+            print(f" [i] Video önbelleğe indirildi: {size / 1024 / 1024:.1f} MB")
+        self.evict(keep=data_path)
+        return data_path
+
+    def evict(self, keep=None):
+        """Toplam boyut max_bytes altına inene kadar en eski kullanılan videoları siler."""
+        entries = []
+        now = time.time()
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            key = name.lstrip('.').split('.', 1)[0]
+            if name.startswith('.'):
+                # Kaydı kalmamış eski kilit / yarım kalmış geçici dosyalar
+                if now - stat.st_mtime > SEEN_TTL_SECONDS and not os.path.exists(self._paths(key)[1]):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+            elif name.endswith('.video'):
+                entries.append((stat.st_mtime, stat.st_size, path, key))
+            elif name.endswith('.json') and not os.path.exists(self._paths(key)[0]) \
+                    and now - stat.st_mtime > SEEN_TTL_SECONDS:
+                self._remove(key)  # Eski 'görüldü' işareti
+
+        total = sum(size for _, size, _, _ in entries)
+        for _, size, path, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue  # Az önce indirilen video (sınırdan büyük olsa da) analiz edilecek
+            self._remove(key)
+            print(f" [i] İndirme önbelleğinden silindi: {path}")
+            total -= size
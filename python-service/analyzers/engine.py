@@ -0,0 +1,629 @@
+import cv2
+import mediapipe as mp
+import numpy as np
+import time
+from dataclasses import dataclass
+
+from analyzers.geometry import landmarks_to_array
+from analyzers.buffers import BufferSet
+from analyzers.checkpoint import Interrupted, JobCheckpoint, checkpoint_key, interrupt_requested
+from analyzers.ingest import open_video
+from analyzers.landmark_cache import LandmarkTrack, track_key
+from analyzers.memory import MemoryBudget
+from analyzers.pipeline import PIPELINE_FRAMES, run_pipeline
+from analyzers.options import AnalysisOptions
+from analyzers.pose_pool import acquire_pose
+from analyzers.render import OverlayRenderer, open_writer
+from analyzers.sampling import FrameSampler, base_stride
+from analyzers.scoring import rule_fires, score_track, spec_angles, summarize
+from analyzers.smoothing import LandmarkFilter, frame_quality
+from analyzers.timing import JobTimer
+
+# MediaPipe'in araçları
+mp_pose = mp.solutions.pose
+PoseLandmark = mp_pose.PoseLandmark
+
+# Kontrol noktasından devam ederken poz takibinin oturması için yeniden işlenen süre (sn)
+RESUME_WARM_UP_SECONDS = 2.0
+
+
+# --- 1. HAREKET TANIMLARI ---
+@dataclass(frozen=True)
+class JointAngle:
+    """
+    Tekrar açısı dışında hesaplanan adlandırılmış açı (form kuralları için).
+    joints (a, b, c) ise b köşesindeki açı, (üst, alt) ise alt -> üst doğrultusunun
+    dikeyle yaptığı açı (örn. gövde eğimi). Eklemler sol taraf tanımıyla yazılır.
+    """
+    name: str
+    joints: tuple
+
+
+@dataclass(frozen=True)
+class FormRule:
+    """
+    Hareketin aktif fazında her karede kontrol edilen form kuralı.
+    'check' fonksiyonu (33, 4) landmark dizisini alır, hata varsa True döner.
+    Kurallar numpy operatörleriyle ('and' yerine '&', landmarks[..., eklem, sütun])
+    yazılır; böylece (kare, 33, 4) dizisine de tek çağrıda uygulanabilirler.
+    angle verilirse kural, spec.angles'daki o açının below altına / above üstüne
+    çıkmasıyla tetiklenir (check de verilmişse ikisi birlikte sağlanmalıdır).
+    """
+    message: str
+    check: object = None
+    angle: str = None
+    below: float = None
+    above: float = None
+
+
+@dataclass(frozen=True)
+class ExerciseSpec:
+    """
+    Bir hareketin bildirimsel (declarative) tanımı.
+    Motor; indirme, kare okuma, poz tahmini ve çıktıyı yönetir,
+    hareket sadece eklem üçlüsünü, eşikleri ve form kurallarını verir.
+
+    Tekrar döngüsü: 'rest_state' -> açı (extend_threshold - start_margin) altına
+    inince 'active_state' -> açı extend_threshold üstüne çıkınca tekrar biter.
+    Aktif fazda açı depth_threshold altına indiyse tekrar doğru sayılır.
+
+    Eklemler sol taraf tanımıyla (LEFT_*) yazılır; bilateral ise her karede eklemleri
+    daha görünür olan taraf kullanılır. angles: form kurallarının kullandığı ek açılar
+    (JointAngle); tekrar açısıyla birlikte tek vektörel çağrıda hesaplanır.
+    """
+    name: str
+    joints: tuple
+    rest_state: str
+    active_state: str
+    extend_threshold: float
+    depth_threshold: float
+    shallow_feedback: str
+    angle_label: str
+    start_margin: float = 10.0
+    form_rules: tuple = ()
+    angles: tuple = ()
+    bilateral: bool = True
+    draw_full_skeleton: bool = True
+    output_suffix: str = ""
+
+
+# --- 2. TEKRAR SAYACI (Durum Makinesi) ---
+class RepCounter:
+    """
+    ExerciseSpec'e göre kare kare tekrar sayan durum makinesi.
+    smoothing (SmoothingConfig) verilirse landmark'lar sayımdan önce LandmarkFilter'dan
+    geçer; filtre kareler arası süreyi kare numarasından (fps ile) hesaplar.
+    Her tekrar için, tekrar boyunca karelerin ortalama güvenilirliği (bkz.
+    smoothing.frame_quality) rep_confidence listesine eklenir.
+    """
+
+    def __init__(self, spec, smoothing=None, fps=30.0):
+        self.spec = spec
+        self.smoothing = smoothing
+        self.filter = LandmarkFilter(smoothing, fps) if smoothing else None
+        self.frames = 0
+        self.rep_confidence = []
+        self._rep_quality = []  # Süren tekrarın kare güvenilirlikleri
+        self.state = spec.rest_state
+        self.correct_reps = 0
+        self.wrong_reps = 0
+        self.reached_depth = False
+        self.angle = 180.0
+        self.feedback_list = []  # Tüm kalıcı hatalar (sıralı, tekrarsız)
+
+    def _add_feedback(self, message):
+        if message not in self.feedback_list:
+            self.feedback_list.append(message)
+
+    def update(self, landmarks, frame_index=None):
+        """
+        Bir karenin landmark dizisini işler ve anlık geri bildirimi döner.
+        landmarks None ise (iskelet bulunamadı) sayaç durumu değişmez; filtre açıksa
+        kısa kayıplarda son tahminle devam edilir.
+        frame_index: Karenin videodaki numarası (verilmezse çağrı sırası kullanılır).
+        """
+        if frame_index is None:
+            frame_index = self.frames
+        self.frames += 1
+        quality = frame_quality(landmarks, self.spec.joints, self.smoothing, self.spec.bilateral)
+        if self.filter is not None:
+            landmarks = self.filter.update(landmarks, frame_index)
+        active_before = self.state == self.spec.active_state
+
+        if landmarks is None:
+            self.angle = None
+            if active_before:
+                self._rep_quality.append(quality)
+            return "Kamerada insan tespiti basarisiz"
+
+        landmarks, angles = spec_angles(landmarks, self.spec)
+        self.angle = angles['rep']
+        feedback = self.step(self.angle)
+
+        # Tekrar güvenilirliği: giriş karesinden çıkış karesine kadar (dahil)
+        if self.state == self.spec.active_state and not active_before:
+            self._rep_quality = []
+        if active_before or self.state == self.spec.active_state:
+            self._rep_quality.append(quality)
+        if active_before and self.state != self.spec.active_state:
+            self.rep_confidence.append(round(float(np.mean(self._rep_quality)), 2))
+
+        # Ayrı form kontrolleri (sadece aktif fazda)
+        if self.state == self.spec.active_state:
+            for rule in self.spec.form_rules:
+                if rule_fires(rule, landmarks, angles):
+                    feedback = rule.message
+                    self._add_feedback(feedback)
+        return feedback
+
+    def step(self, angle):
+        """Tek bir açı değeriyle durum makinesini ilerletir."""
+        spec = self.spec
+        feedback = ""
+        if self.state == spec.rest_state:
+            if angle < spec.extend_threshold - spec.start_margin:  # (Harekete başladı)
+                self.state = spec.active_state
+                self.reached_depth = False  # Yeni tekrar için bayrağı sıfırla
+
+        elif self.state == spec.active_state:
+            if angle < spec.depth_threshold:
+                self.reached_depth = True
+
+            # Başlangıç pozisyonuna döndü mü?
+            if angle > spec.extend_threshold:
+                self.state = spec.rest_state
+                if self.reached_depth:
+                    self.correct_reps += 1
+                    feedback = "Dogru Tekrar!"
+                    print(f"    -> DOGRU TEKRAR! Toplam: {self.correct_reps}")
+                else:
+                    self.wrong_reps += 1
+                    feedback = spec.shallow_feedback
+                    self._add_feedback(feedback)
+                    print(f"    -> YANLIS TEKRAR! Toplam: {self.wrong_reps}")
+        return feedback
+
+    def snapshot(self):
+        """Durum makinesinin o anki durumu (kontrol noktasına JSON olarak yazılır)."""
+        return {
+            "frames": self.frames,
+            "state": self.state,
+            "reached_depth": self.reached_depth,
+            "correct_reps": self.correct_reps,
+            "wrong_reps": self.wrong_reps,
+            "feedback": list(self.feedback_list),
+            "rep_confidence": list(self.rep_confidence),
+        }
+
+    def summary(self):
+        """Toplanan sonuçlardan backend'e gidecek özeti üretir."""
+        result = summarize(self.spec, self.correct_reps, self.wrong_reps, self.feedback_list)
+        result["rep_confidence"] = list(self.rep_confidence)
+        return result
+
+
+# --- 3. POZ TAHMİNİ ---
+def inference_size(frame_size, max_side):
+    """
+    Poz tahmini için küçültülmüş kare boyutunu (en-boy oranı korunarak) döner.
+    Kare zaten yeterince küçükse veya max_side verilmediyse None döner.
+    """
+    width, height = frame_size
+    if not max_side or max(width, height) <= max_side:
+        return None
+    scale = max_side / max(width, height)
+    return (max(1, round(width * scale)), max(1, round(height * scale)))
+
+
+def estimate_pose(pose, frame, max_side=None, timer=None, buffers=None):
+    """
+    BGR kareyi poz modelinden geçirir ve (33, 4) landmark dizisini (veya None) döner.
+
+    MediaPipe zaten küçük bir iç girdi boyutuyla çalıştığından, 1080p/4K kareler
+    önce bir kez max_side'a küçültülür; renk dönüşümü (BGR->RGB) küçük kare
+    üzerinde tek sefer yapılır. Landmark'lar normalize (0-1) olduğu ve en-boy
+    oranı korunduğu için orijinal kare koordinatlarına doğrudan karşılık gelir.
+    timer verilirse küçültme/dönüşüm ve pose.process süreleri ayrı ayrı kaydedilir.
+    buffers (BufferSet) verilirse küçültme ve renk dönüşümü her karede yeni dizi
+    ayırmak yerine aynı tamponlara yazılır (dst=).
+    """
+    start = time.perf_counter()
+    size = inference_size((frame.shape[1], frame.shape[0]), max_side)
+    if size is not None:
+        # INTER_AREA 4K karede çok pahalı; MediaPipe de içeride bilinear küçültme yapar
+        resized = buffers.get('resize', (size[1], size[0], 3)) if buffers else None
+        frame = cv2.resize(frame, size, dst=resized, interpolation=cv2.INTER_LINEAR)
+    image = buffers.get('rgb', frame.shape) if buffers else None
+    if image is not None:
+        image.flags.writeable = True  # Önceki karede salt okunur işaretlendi
+    image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=image)
+    image.flags.writeable = False
+    inference_start = time.perf_counter()
+    results = pose.process(image)
+    if timer is not None:
+        timer.add('preprocess', inference_start - start)
+        timer.observe_inference(time.perf_counter() - inference_start)
+    return landmarks_to_array(results.pose_landmarks)
+
+
+# --- 4. ANA ANALİZ MOTORU ---
+def run_analysis(video_url, video_id, spec, options=None):
+    """
+    Videoyu açar, kareleri poz modelinden geçirir ve spec'e göre tekrar sayar.
+    options.streaming ise video indirme bitmeden çözülmeye başlar.
+    Sonuç, aşama sürelerini içeren bir "timings" raporu taşır (bkz. timing.JobTimer).
+    """
+    options = options or AnalysisOptions()
+    timer = JobTimer()
+    print(f"--- UZMAN: {spec.name.upper()} ANALİZİ (ID: {video_id}) ÇALIŞTI ---")
+
+    cache = options.landmark_cache
+    cache_key = track_key(video_url) if cache else None
+    if cache and not options.render_output:  # Çizimli çıktı için kareler yine çözülmeli
+        track = timer.wrap('cache', cache.get)(cache_key)
+        if track is not None:
+            print(f" [i] Landmark izi önbellekte bulundu, video çözülmeden analiz ediliyor.")
+            result = analyze_track(track, spec, timer, options.smoothing)
+            result["timings"] = timer.report()
+            return result
+
+    # Yarıda kalan analiz kaldığı yerden devam eder (çizimli çıktı yarım kalamaz, baştan yazılır)
+    checkpoints = options.checkpoints if not (options.render_output or options.preview) else None
+    checkpoint_id = checkpoint_key(video_url, spec) if checkpoints else None
+    resume = timer.wrap('checkpoint', checkpoints.load)(checkpoint_id) if checkpoints else None
+
+    open_start = time.perf_counter()
+    with open_video(video_url, stream=options.streaming, mounts=options.video_mounts,
+                    cache=options.download_cache, allow_local_files=options.allow_local_files) as cap:
+        timer.add('open', time.perf_counter() - open_start)
+        if cap is None:
+            return {"correct_reps": 0, "wrong_reps": 0, "feedback": "Video dosyası okunamadı.", "timings": timer.report()}
+        try:
+            result, track = analyze_capture(cap, video_id, spec, options,
+                                            record_track=(cache is not None or checkpoints is not None) and not options.preview,
+                                            timer=timer, resume=resume)
+        except Interrupted as e:
+            if checkpoints and e.checkpoint is not None:
+                checkpoints.save(checkpoint_id, e.checkpoint)
+                print(f" [i] Kontrol noktası kaydedildi: kare {e.checkpoint.frame_index}, "
+                      f"{e.checkpoint.counter['correct_reps']} doğru, {e.checkpoint.counter['wrong_reps']} yanlış.")
+            raise
+
+    if checkpoints:
+        checkpoints.delete(checkpoint_id)
+    if track is not None and cache:
+        timer.wrap('cache', cache.put)(cache_key, track)
+    result["timings"] = timer.report()
+    return result
+
+
+def analyze_track(track, spec, timer=None, smoothing=None):
+    """
+    Önceden kaydedilmiş bir landmark izini video çözmeden puanlar.
+    Açı serisi ve tekrar sınırları vektörel hesaplanır (bkz. scoring.score_track);
+    smoothing verilirse iz önce canlı sayımdaki filtreden geçirilir.
+    """
+    start_time = time.perf_counter()
+    result = score_track(track, spec, smoothing)
+
+    if timer is not None:
+        timer.add('scoring', time.perf_counter() - start_time)
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    print(f"    -> {len(track.sampled)} karelik iz {elapsed_ms:.1f} ms'de analiz edildi.")
+    print(f"    -> Sonuç: {result['correct_reps']} doğru, {result['wrong_reps']} yanlış.")
+
+    result["frame_count"] = len(track.sampled)
+    result["analyzed_frames"] = int(track.sampled.sum())
+    return result
+
+
+def replay_counter(checkpoint, spec, smoothing=None):
+    """
+    Kontrol noktasındaki landmark'ları poz tahmini yapmadan sayaçtan yeniden geçirir.
+    Filtre, tekrar güvenilirliği ve durum makinesi kaydedildiği ana birebir döner;
+    sonuç kaydedilen durumla (RepCounter.snapshot) uyuşmazsa (örn. eşikler veya filtre
+    ayarları değişmiş) None döner ve analiz baştan yapılır.
+    """
+    track = checkpoint.track
+    counter = RepCounter(spec, smoothing, track.fps)
+    for index in np.flatnonzero(track.sampled):
+        counter.update(track.frame(index), int(index))
+    if counter.snapshot() != checkpoint.counter:
+        return None
+    return counter
+
+
+def make_sampler(spec, options, fps):
+    """Spec'in eşiklerine göre (uyarlamalı) kare örnekleyiciyi kurar."""
+    return FrameSampler(
+        base_stride(fps, options.frame_stride, options.max_analysis_fps),
+        lambda landmarks: spec_angles(landmarks, spec)[1]['rep'],
+        thresholds=(spec.extend_threshold - spec.start_margin, spec.extend_threshold, spec.depth_threshold),
+        adaptive=options.adaptive_sampling
+    )
+
+
+def analyze_capture(cap, video_id, spec, options, record_track=False, timer=None, resume=None):
+    """
+    Açık bir VideoCapture üzerindeki tüm kareleri analiz eder.
+    (sonuç, iz) döner; record_track=True ise iz kare landmark'larını içeren
+    bir LandmarkTrack'tir, değilse None.
+    options.preview ise kareler gerçek zamanlı (waitKey beklemesiyle) gösterilir.
+    options.pipelined ise okuma, poz tahmini ve çizim/yazma ayrı thread'lerde
+    örtüşerek çalışır (önizleme modunda her zaman sıralı çalışır).
+    timer verilirse çözme, poz tahmini, sayma, çizim ve kodlama süreleri ona yazılır.
+    resume (JobCheckpoint) verilirse sayaç kaydedilen landmark'lardan yeniden kurulur ve
+    video kaldığı kareden (RESUME_WARM_UP_SECONDS öncesinden, poz takibi ısınsın diye) okunur.
+    Ana süreç durma isterse (bkz. checkpoint.interrupt_requested) okuma durur, okunan
+    kareler işlenir ve ilerleme (record_track ise) Interrupted.checkpoint ile fırlatılır.
+    """
+    preview = options.preview
+    timer = timer or JobTimer()
+    out = None
+
+    try:
+        frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        output_fps = cap.get(cv2.CAP_PROP_FPS)
+        if output_fps <= 0:
+            output_fps = 30.0
+
+        # Başsız (headless) modda kareler beklemeden, modelin izin verdiği hızda işlenir.
+        # Gerçek zamanlı önizleme sadece hata ayıklama için (preview=True) açılır.
+        frame_delay_ms = max(1, int(1000 / output_fps))
+        if preview:
+            print(f" [i] Önizleme modu: Video {output_fps} FPS ile işlenecek. Kareler arası bekleme: {frame_delay_ms} ms")
+        else:
+            print(f" [i] Başsız mod: Video ({output_fps} FPS) beklemeden işlenecek.")
+
+        size = inference_size((frame_width, frame_height), options.inference_max_side)
+        if size is not None:
+            print(f" [i] Kareler poz tahmini için {frame_width}x{frame_height} -> {size[0]}x{size[1]} küçültülecek.")
+
+        # Çizimli çıktı sadece istenirse (veya önizlemede) üretilir; kapalıyken hiç kodlama yapılmaz
+        renderer = None
+        if options.render_output or preview:
+            renderer = OverlayRenderer(spec, (frame_width, frame_height), options.render_scale)
+        if options.render_output:
+            out, output_path = open_writer(video_id, spec, output_fps, renderer.output_size)
+
+        # Kareler havuzdaki tamponlara çözülür; bütçe aşılırsa havuz ve çözünürlük düşer
+        budget = MemoryBudget(options.memory_budget_mb, (frame_width, frame_height),
+                              options.inference_max_side, PIPELINE_FRAMES)
+        buffers = BufferSet()
+
+        counter = RepCounter(spec, options.smoothing, output_fps)
+        sampler = make_sampler(spec, options, output_fps)
+        if sampler.stride > 1:
+            print(f" [i] Poz tahmini her {sampler.stride} karede bir yapılacak (uyarlamalı: {options.adaptive_sampling}).")
+        recorded_landmarks = []
+        recorded_sampled = []
+        frame_index = 0     # Sayaca verilecek sonraki kare
+        position = 0        # Çözülen sonraki kare (devam ederken ısınma kareleri dahil)
+
+        if resume is not None and resume.track.fps == output_fps:
+            restored = timer.wrap('checkpoint', replay_counter)(resume, spec, options.smoothing)
+            if restored is None:
+                print(f" [!] Kontrol noktası mevcut ayarlarla uyuşmuyor, analiz baştan yapılıyor.")
+            else:
+                counter = restored
+                frame_index = resume.frame_index
+                position = segment_frame(frame_index / output_fps - RESUME_WARM_UP_SECONDS, output_fps, sampler.stride)
+                recorded_landmarks = [resume.track.frame(index) for index in range(frame_index)]
+                recorded_sampled = list(resume.track.sampled)
+                if position > 0:
+                    timer.wrap('seek', cap.set)(cv2.CAP_PROP_POS_FRAMES, position)
+                print(f" [i] Kontrol noktasından devam: kare {frame_index} ({counter.correct_reps} doğru, "
+                      f"{counter.wrong_reps} yanlış; ısınma: {frame_index - position} kare)")
+
+        feedback = ""
+        decode = timer.wrap('decode', cap.read)
+        update_counter = timer.wrap('scoring', counter.update)
+        render = timer.wrap('draw', renderer.render) if renderer else None
+        write_frame = timer.wrap('encode', out.write) if out else None
+        interrupted = False
+        start_time = time.perf_counter()
+
+        def read_frame(buffer):
+            nonlocal interrupted
+            if interrupt_requested():
+                interrupted = True  # Okuma durur; zaten okunan kareler işlenip ilerleme kaydedilir
+                return False, None
+            return decode(buffer)
+
+        def annotate_and_write(frame, sampled):
+            nonlocal feedback, frame_index, position
+            position += 1
+            if position <= frame_index:
+                return None  # Devam ederken ısınma karesi: poz takibi oturur, sayılmaz
+            landmarks, fresh = sampled
+            if record_track:
+                recorded_landmarks.append(landmarks if fresh else None)
+                recorded_sampled.append(fresh)
+            # Sayaç çizim/yazma aşamasında güncellenir: kare sırası korunur.
+            # Atlanan karelerde sayaç ilerlemez, son landmark'lar ve geri bildirim çizilir.
+            if fresh:
+                feedback = update_counter(landmarks, frame_index)
+            frame_index += 1
+            budget.check()
+            if render is None:
+                return None
+            image = render(frame, landmarks, counter, feedback)
+            if write_frame:
+                write_frame(image)
+            return image
+
+        # Model her video için yeniden yüklenmez: havuzdan alınır, iş bitince sıfırlanıp geri verilir
+        with acquire_pose(options.pose_config) as pose:
+            def infer(frame):
+                return sampler.sample(frame, lambda image: estimate_pose(pose, image, budget.max_side, timer, buffers))
+
+            if options.pipelined and not preview:
+                frame_count = run_pipeline(read_frame, infer, annotate_and_write, pool=budget.pool)
+            else:
+                frame_count = 0
+                frame = None
+                while cap.isOpened():
+                    # Sıralı modda tek tampon yeterli: her kare öncekinin üzerine çözülür
+                    ret, frame = read_frame(frame)
+                    if not ret:
+                        break
+                    frame_count += 1
+                    image = annotate_and_write(frame, infer(frame))
+                    if preview:
+                        cv2.imshow('RepVision Onizleme', image)
+                        if cv2.waitKey(frame_delay_ms) & 0xFF == 27:
+                            break
+
+        # --- DÖNGÜ BİTTİ ---
+        timer.observe_rss(budget.monitor.peak)
+        if interrupted:
+            print(f"    -> Analiz kare {frame_index}'de durduruldu (süreç kapanıyor).")
+            checkpoint = None
+            if record_track and frame_index > 0:
+                track = LandmarkTrack.from_frames(recorded_landmarks, recorded_sampled, output_fps)
+                checkpoint = JobCheckpoint(frame_index, track, counter.snapshot())
+            raise Interrupted(f"Analiz kare {frame_index}'de yarıda bırakıldı.", checkpoint)
+        elapsed = time.perf_counter() - start_time
+        processing_fps = frame_count / elapsed if elapsed > 0 else 0.0
+        print(f"    -> {frame_count} kare {elapsed:.2f} sn'de işlendi ({processing_fps:.1f} kare/sn, {sampler.sampled_frames} kare poz modelinden geçti).")
+        if out:
+            print(f"    -> İşlenmiş video '{output_path}' olarak kaydedildi.")
+        print(f"    -> Sonuç: {counter.correct_reps} doğru, {counter.wrong_reps} yanlış.")
+
+        result = counter.summary()
+        result["frame_count"] = frame_index
+        result["analyzed_frames"] = int(np.sum(recorded_sampled)) if resume is not None else sampler.sampled_frames
+        result["processing_fps"] = round(processing_fps, 2)
+
+        track = None
+        if record_track:
+            track = LandmarkTrack.from_frames(recorded_landmarks, recorded_sampled, output_fps)
+        return result, track
+
+    finally:
+        if out:
+            out.release()
+        if preview:
+            # Başsız OpenCV derlemelerinde pencere fonksiyonları hata verir
+            cv2.destroyAllWindows()
+
+
+# --- 5. PARÇALI (SEGMENT) ANALİZ ---
+def segment_frame(seconds, fps, stride):
+    """
+    Saniyeyi kare numarasına çevirir ve örnekleme adımının katına yuvarlar.
+    Tüm parçalar aynı formülü kullandığı için bir parçanın bitişi, bir sonrakinin
+    başlangıcıyla birebir aynı karedir; örneklenen kareler de sıralı analizle aynı kalır.
+    """
+    return max(0, int(round(seconds * fps)) // stride * stride)
+
+
+def analyze_segment(video_url, spec, options, start_seconds, end_seconds=None, overlap_seconds=2.0):
+    """
+    Videonun [start_seconds, end_seconds) aralığının landmark izini çıkarır.
+    Video CAP_PROP_POS_FRAMES ile parçanın overlap_seconds öncesine konumlanır;
+    örtüşme (overlap) karelerinde poz modeli ve örnekleyici ısınır (takip/yumuşatma
+    durumu oturur), ama bu kareler ize yazılmaz. Sayma burada yapılmaz: parçalar
+    stitch_segments ile birleştirilip tek seri olarak puanlanır.
+    """
+    options = options or AnalysisOptions()
+    timer = JobTimer()
+    open_start = time.perf_counter()
+    with open_video(video_url, stream=options.streaming, mounts=options.video_mounts,
+                    cache=options.download_cache, allow_local_files=options.allow_local_files) as cap:
+        timer.add('open', time.perf_counter() - open_start)
+        if cap is None:
+            raise IOError("Video dosyası okunamadı.")
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        if fps <= 0:
+            fps = 30.0
+        sampler = make_sampler(spec, options, fps)
+        start = segment_frame(start_seconds, fps, sampler.stride)
+        end = segment_frame(end_seconds, fps, sampler.stride) if end_seconds is not None else None
+        warmup_start = segment_frame(start_seconds - overlap_seconds, fps, sampler.stride)
+        if warmup_start > 0:
+            timer.wrap('seek', cap.set)(cv2.CAP_PROP_POS_FRAMES, warmup_start)
+        print(f" [i] Parça analizi: kare {start} - {end if end is not None else 'son'} (ısınma: {start - warmup_start} kare)")
+
+        budget = MemoryBudget(options.memory_budget_mb,
+                              (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))),
+                              options.inference_max_side, PIPELINE_FRAMES)
+        buffers = BufferSet()
+        decode = timer.wrap('decode', cap.read)
+        position = warmup_start
+        recorded_landmarks = []
+        recorded_sampled = []
+        interrupted = False
+
+        def read_frame(buffer):
+            nonlocal position, interrupted
+            if end is not None and position >= end:
+                return False, None
+            if interrupt_requested():
+                interrupted = True
+                return False, None
+            position += 1
+            return decode(buffer)
+
+        def record(frame, sampled):
+            landmarks, fresh = sampled
+            recorded_landmarks.append(landmarks if fresh else None)
+            recorded_sampled.append(fresh)
+            budget.check()
+
+        with acquire_pose(options.pose_config) as pose:
+            def infer(frame):
+                return sampler.sample(frame, lambda image: estimate_pose(pose, image, budget.max_side, timer, buffers))
+            run_pipeline(read_frame, infer, record, pool=budget.pool)
+        timer.observe_rss(budget.monitor.peak)
+        if interrupted:
+            # Parçalar ayrı ayrı kaydedilmez: iş yeniden geldiğinde parçalar yeniden analiz edilir
+            raise Interrupted(f"Parça analizi kare {position}'de yarıda bırakıldı.")
+
+    # Isınma karelerini at: iz 'start' karesinden başlar
+    skip = start - warmup_start
+    track = LandmarkTrack.from_frames(recorded_landmarks[skip:], recorded_sampled[skip:], fps)
+    return {"start_frame": start, "track": track, "timings": timer.report()}
+
+
+def stitch_segments(segments):
+    """
+    Parça izlerini kare sırasına göre tek bir LandmarkTrack'te birleştirir.
+    Her parça bir öncekinin bittiği kareden başlamalıdır (boşluk / çakışma yok).
+    """
+    segments = sorted(segments, key=lambda segment: segment["start_frame"])
+    expected = 0
+    for segment in segments:
+        if segment["start_frame"] != expected:
+            raise ValueError(f"Parçalar bitişik değil: kare {expected} beklenirken {segment['start_frame']} geldi.")
+        expected += len(segment["track"].sampled)
+    tracks = [segment["track"] for segment in segments]
+    return LandmarkTrack(
+        np.concatenate([track.landmarks for track in tracks]),
+        np.concatenate([track.sampled for track in tracks]),
+        tracks[0].fps
+    )
+
+
+def analyze_segmented(video_url, segments, spec, options=None):
+    """
+    Parça izlerini birleştirip tek seri olarak puanlar. Durum makinesi birleşik
+    açı serisi üzerinde bir kez çalıştığı için parça sınırını geçen tekrarlar
+    tam olarak bir kez sayılır. Birleşik iz landmark önbelleğine de yazılır.
+    """
+    options = options or AnalysisOptions()
+    timer = JobTimer()
+    track = stitch_segments(segments)
+    result = analyze_track(track, spec, timer, options.smoothing)
+    if options.landmark_cache is not None:
+        timer.wrap('cache', options.landmark_cache.put)(track_key(video_url), track)
+
+    for segment in segments:
+        timer.merge(segment["timings"])
+    report = timer.report()
+    # Parçalar paralel çalıştığı için duvar süresi en uzun parça + birleştirme süresidir
+    report["total_seconds"] = round(max(s["timings"]["total_seconds"] for s in segments) + report["total_seconds"], 4)
+    result["timings"] = report
+    result["segments"] = len(segments)
+    return result
@@ -0,0 +1,104 @@
+import numpy as np
+
+# Landmark dizisinin sütunları: (x, y, z, visibility)
+VISIBILITY = 3
+
+
+def landmarks_to_array(pose_landmarks):
+    """MediaPipe sonucunu (33, 4) float32 diziye çevirir. İskelet yoksa None döner."""
+    if pose_landmarks is None:
+        return None
+    return np.array(
+        [[lm.x, lm.y, lm.z, lm.visibility] for lm in pose_landmarks.landmark],
+        dtype=np.float32
+    )
+
+
+def calculate_angle(a, b, c):
+    """
+    Üç eklem noktası arasındaki açıyı 2D olarak hesaplar.
+    (Sadece X ve Y koordinatlarını kullanır, sonuç 0-180 derece arasıdır)
+
+    Noktalar tek bir eklem (x, y, ...) ya da (kare, x, y, ...) dizisi olabilir;
+    diziler için tüm karelerin açıları tek bir vektörel çağrıda hesaplanır.
+    Kare başına ve toplu hesaplama aynı fonksiyonu kullandığından sonuçlar birebir aynıdır.
+    """
+    p_a = np.asarray(a, dtype=np.float64)
+    p_b = np.asarray(b, dtype=np.float64)
+    p_c = np.asarray(c, dtype=np.float64)
+    # 'atan2' ile açıları hesapla (radyan cinsinden)
+    radians_ba = np.arctan2(p_a[..., 1] - p_b[..., 1], p_a[..., 0] - p_b[..., 0])
+    radians_bc = np.arctan2(p_c[..., 1] - p_b[..., 1], p_c[..., 0] - p_b[..., 0])
+    angle_degrees = np.abs(np.degrees(radians_bc - radians_ba))
+    # Dış açıyı hesapladıysa 360'tan çıkar
+    angle_degrees = np.where(angle_degrees > 180.0, 360.0 - angle_degrees, angle_degrees)
+    return float(angle_degrees) if angle_degrees.ndim == 0 else angle_degrees
+
+
+def joint_angle(landmarks, joints):
+    """
+    Landmark dizisinden verilen eklem üçlüsünün açısını hesaplar.
+    landmarks (33, 4) ise tek bir açı, (kare, 33, 4) ise kare başına açı dizisi döner.
+    """
+    if landmarks.ndim == 2:
+        # Kare başına çağrı: üç noktayı tek dizide topla, ara dizi sayısını azalt.
+        # İşlemler calculate_angle ile aynı ufunc'lar olduğundan sonuç birebir aynıdır.
+        points = landmarks[list(joints), :2].astype(np.float64)
+        vectors = points[[0, 2]] - points[1]
+        radians = np.arctan2(vectors[:, 1], vectors[:, 0])
+        angle_degrees = abs(float(np.degrees(radians[1] - radians[0])))
+        return 360.0 - angle_degrees if angle_degrees > 180.0 else angle_degrees
+    a, b, c = (landmarks[..., joint, :] for joint in joints)
+    return calculate_angle(a, b, c)
+
+
+# Sol/sağ eşlemesi: MIRROR[i], i. landmark'ın vücudun diğer tarafındaki karşılığı
+# (LEFT_KNEE <-> RIGHT_KNEE, MOUTH_LEFT <-> MOUTH_RIGHT ...; burun kendisiyle eşlenir)
+MIRROR = (0, 4, 5, 6, 1, 2, 3, 8, 7, 10, 9, 12, 11, 14, 13, 16, 15, 18, 17, 20, 19, 22, 21,
+          24, 23, 26, 25, 28, 27, 30, 29, 32, 31)
+
+
+def select_side(landmarks, joints):
+    """
+    Hareketin eklemleri (sol taraf tanımıyla, örn. LEFT_HIP/KNEE/ANKLE) sağ tarafta daha
+    görünürse landmark'ları aynalar: LEFT_* indeksleri artık görünen tarafı gösterir.
+    Böylece sol taraf için yazılmış açı ve form kuralları iki tarafta da çalışır.
+    x koordinatları aynalanmaz (çizim görüntü koordinatlarını kullanır): açılar yönsüz
+    olduğundan etkilenmez, ancak x yönüne bakan kurallar kişinin baktığı yönü kendisi
+    belirlemelidir (örn. squat_analyzer.facing).
+    (33, 4) için tek kare, (kare, 33, 4) için kare başına seçim yapılır.
+    Görünürlükler eşitse (veya sağ taraf yoksa) sol taraf kullanılır.
+    """
+    joints = list(joints)
+    mirrored = [MIRROR[joint] for joint in joints]
+    left = landmarks[..., joints, VISIBILITY].sum(axis=-1)
+    right = landmarks[..., mirrored, VISIBILITY].sum(axis=-1)
+    if landmarks.ndim == 2:
+        return landmarks[list(MIRROR)] if right > left else landmarks
+    return np.where((right > left)[:, None, None], landmarks[:, list(MIRROR)], landmarks)
+
+
+def joint_angles(landmarks, definitions):
+    """
+    Birden çok açıyı tek vektörel çağrıda hesaplar; sonuç (..., açı sayısı) dizisidir.
+    Tanım (a, b, c) ise b köşesindeki açı (calculate_angle ile birebir aynı işlemler),
+    (üst, alt) ise alt -> üst doğrultusunun dikeyle yaptığı açıdır (0: dik, 90: yatay).
+    """
+    triples = [joints for joints in definitions if len(joints) == 3]
+    segments = [joints for joints in definitions if len(joints) == 2]
+    result = np.empty(landmarks.shape[:-2] + (len(definitions),))
+
+    if triples:
+        points = landmarks[..., np.asarray(triples), :2].astype(np.float64)  # (..., K, 3, 2)
+        vectors = points[..., [0, 2], :] - points[..., 1:2, :]
+        radians = np.arctan2(vectors[..., 1], vectors[..., 0])
+        angle_degrees = np.abs(np.degrees(radians[..., 1] - radians[..., 0]))
+        result[..., [i for i, joints in enumerate(definitions) if len(joints) == 3]] = \
+            np.where(angle_degrees > 180.0, 360.0 - angle_degrees, angle_degrees)
+    if segments:
+        points = landmarks[..., np.asarray(segments), :2].astype(np.float64)  # (..., K, 2, 2)
+        vectors = points[..., 0, :] - points[..., 1, :]
+        # Görüntüde y aşağı doğru artar: dik duran bir gövdenin vektörü (0, -1)
+        result[..., [i for i, joints in enumerate(definitions) if len(joints) == 2]] = \
+            np.abs(np.degrees(np.arctan2(vectors[..., 0], -vectors[..., 1])))
+    return result
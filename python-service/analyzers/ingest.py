@@ -0,0 +1,124 @@
+import cv2
+import os
+import requests
+import tempfile
+import time
+from contextlib import contextmanager
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from analyzers.sources import is_remote, local_path
+
+# İndirme parça boyutu (8 KB yerine 1 MB: daha az Python döngüsü / sistem çağrısı)
+CHUNK_SIZE = 1024 * 1024
+
+# OpenCV'nin FFmpeg arka ucu HTTP akışında bağlantı koparsa yeniden bağlansın
+os.environ.setdefault(
+    'OPENCV_FFMPEG_CAPTURE_OPTIONS',
+    'reconnect;1|reconnect_streamed;1|reconnect_delay_max;5'
+)
+
+_session = None
+
+
+def get_session():
+    """
+    Süreç başına tek, bağlantı havuzlu (keep-alive) requests.Session döner.
+    Aynı Cloudinary sunucusuna yapılan ardışık isteklerde TCP/TLS el sıkışması tekrarlanmaz.
+    """
+    global _session
+    if _session is None:
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504), allowed_methods=('GET', 'HEAD'))
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+        _session = requests.Session()
+        _session.mount('http://', adapter)
+        _session.mount('https://', adapter)
+    return _session
+
+
+def download_video(video_url):
+    """Videoyu geçici bir dosyaya indirir ve dosya yolunu döner."""
+    print(f" [i] Video Cloudinary'den indiriliyor...")
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as temp_file:
+        temp_file_path = temp_file.name
+    try:
+        with get_session().get(video_url, stream=True, timeout=(5, 60)) as r:
+            r.raise_for_status()
+            with open(temp_file_path, 'wb') as f:
+                for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                    f.write(chunk)
+    except Exception:
+        os.remove(temp_file_path)
+        raise
+    print(f" [i] Video başarıyla indirildi: {temp_file_path}")
+    return temp_file_path
+
+
+@contextmanager
+def open_video(video_url, stream=True, mounts=(), cache=None, allow_local_files=False):
+    """
+    Videoyu okumaya hazır bir cv2.VideoCapture olarak açar (açılamazsa None verir).
+
+    Kaynak sırası:
+    - Yerel dosya ('mounts' ile eşleşen paylaşılan klasör; allow_local_files ise file:// ve
+      mutlak yollar): doğrudan diskten açılır, hiç ağ isteği yapılmaz ve dosya silinmez.
+      Bunların dışındaki HTTP(S) olmayan adresler açılmaz (FFmpeg yerel dosyaları da okur).
+    - İndirme önbelleği ('cache', DownloadCache): geçerli kopya varsa oradan açılır.
+    - stream=True ise URL doğrudan FFmpeg ile açılır: kareler indirme sürerken
+      çözülmeye başlar (gerekirse HTTP Range istekleriyle), ilk kareye ulaşma
+      süresi dosya boyutundan bağımsız olur. Önbellek varsa video 'görüldü' olarak
+      işaretlenir; aynı video yeniden gelirse (yeniden deneme, parçalı analiz,
+      yeniden analiz) bu kez önbelleğe indirilir. Tek seferlik videolar diske yazılmaz.
+    - Akış açılamazsa tam indirmeye düşülür (önbellek varsa önbelleğe).
+    Çıkışta capture serbest bırakılır ve (önbellek dışındaki) geçici dosya silinir.
+    """
+    cap = None
+    temp_file_path = None
+    start_time = time.perf_counter()
+    try:
+        path = local_path(video_url, mounts, allow_local_files)
+        if path is not None:
+            cap = cv2.VideoCapture(path)
+            print(f" [i] Video yerel diskten açıldı: {path}")
+        elif not is_remote(video_url):
+            print(f" [!] Desteklenmeyen video adresi (sadece HTTP(S) ve tanımlı klasörler): {video_url}")
+            yield None
+            return
+        elif cache is not None:
+            path = cache.lookup(video_url, get_session())
+            if path is not None:
+                cap = cv2.VideoCapture(path)
+                print(f" [i] Video indirme önbelleğinden açıldı ({time.perf_counter() - start_time:.2f} sn).")
+            elif not stream or cache.seen(video_url):
+                path = cache.fetch(video_url, get_session())
+                cap = cv2.VideoCapture(path)
+                print(f" [i] Video indirilip açıldı ({time.perf_counter() - start_time:.2f} sn).")
+
+        if cap is None and stream:
+            cap = cv2.VideoCapture(video_url, cv2.CAP_FFMPEG)
+            if cap.isOpened():
+                print(f" [i] Video akış (stream) olarak açıldı ({time.perf_counter() - start_time:.2f} sn).")
+                if cache is not None:
+                    cache.mark_seen(video_url)
+            else:
+                print(f" [!] Video akış olarak açılamadı, tam indirmeye geçiliyor.")
+                cap.release()
+                cap = None
+
+        if cap is None:
+            if cache is not None:
+                path = cache.fetch(video_url, get_session())
+            else:
+                path = temp_file_path = download_video(video_url)
+            cap = cv2.VideoCapture(path)
+            print(f" [i] Video indirilip açıldı ({time.perf_counter() - start_time:.2f} sn).")
+
+        yield cap if cap.isOpened() else None
+
+    finally:
+        # Kaynakları serbest bırak ve geçici dosyayı sil
+        if cap:
+            cap.release()
+        if temp_file_path and os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+            print(f" [i] Geçici dosya silindi: {temp_file_path}")
@@ -0,0 +1,113 @@
+import hashlib
+import os
+import numpy as np
+import uuid
+from dataclasses import dataclass
+
+
+@dataclass
+class LandmarkTrack:
+    """
+    Bir videonun kare kare poz landmark'ları.
+    landmarks: (kare, 33, 4) float32 -> (x, y, z, visibility); iskelet yoksa NaN.
+    sampled: (kare,) bool -> o kare poz modelinden geçti mi (atlanan kareler False).
+    """
+    landmarks: np.ndarray
+    sampled: np.ndarray
+    fps: float
+
+    @classmethod
+    def from_frames(cls, frames, sampled, fps):
+        """Kare başına (33, 4) dizi veya None listesinden bir iz (track) oluşturur."""
+        landmarks = np.full((len(frames), 33, 4), np.nan, dtype=np.float32)
+        for index, frame in enumerate(frames):
+            if frame is not None:
+                landmarks[index] = frame
+        return cls(landmarks, np.asarray(sampled, dtype=bool), float(fps))
+
+    @classmethod
+    def load(cls, path):
+        """.npz dosyasından izi okur."""
+        with np.load(path) as data:
+            return cls(data['landmarks'], data['sampled'], float(data['fps']))
+
+    def save(self, path):
+        """İzi .npz dosyasına yazar (uzantı '.npz' olmalı)."""
+        np.savez(path, landmarks=self.landmarks, sampled=self.sampled, fps=np.float64(self.fps))
+
+    def frame(self, index):
+        """Karenin landmark dizisini döner (iskelet yoksa None)."""
+        landmarks = self.landmarks[index]
+        return None if np.isnan(landmarks[0, 0]) else landmarks
+
+
+def track_key(video_url):
+    """
+    Önbellek anahtarı. Cloudinary URL'leri sürüm numarası içerdiğinden
+    aynı URL her zaman aynı içeriği gösterir; anahtar URL'in SHA-256 özetidir.
+    """
+    return hashlib.sha256(video_url.encode('utf-8')).hexdigest()
+
+
+class LandmarkCache:
+    """
+    Landmark izlerini diskte .npz dosyaları olarak tutan boyut sınırlı LRU önbellek.
+    Okunan dosyanın değiştirilme zamanı güncellenir; sınır aşılınca en eski
+    kullanılan dosyalar silinir.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def contains(self, key):
+        """Kayıt var mı (dosyayı okumadan)."""
+        return os.path.exists(self._path(key))
+
+    def get(self, key):
+        """İzi döner, yoksa None."""
+        path = self._path(key)
+        try:
+            track = LandmarkTrack.load(path)
+        except (OSError, KeyError, ValueError):
+            return None
+        try:
+            os.utime(path)  # LRU: son kullanım zamanı
+        except FileNotFoundError:
+            pass  # Başka bir işçi bu arada silmiş olabilir
+        return track
+
+    def put(self, key, track):
+        """İzi atomik olarak yazar ve gerekirse eski kayıtları siler."""
+        os.makedirs(self.directory, exist_ok=True)
+        # Yarım yazılmış dosya okunmasın diye önce geçici dosyaya yaz
+        temp_path = os.path.join(self.directory, f".{key}.{uuid.uuid4().hex}.tmp.npz")
+        track.save(temp_path)
+        os.replace(temp_path, self._path(key))
+        self.evict()
+
+    def evict(self):
+        """Toplam boyut max_bytes altına inene kadar en eski kullanılan kayıtları siler."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz') and not name.startswith('.'):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                print(f" [i] Landmark önbelleğinden silindi: {path}")
+            except FileNotFoundError:
+                pass  # Başka bir işçi zaten silmiş
+            total -= size
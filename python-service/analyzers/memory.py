@@ -0,0 +1,98 @@
+import os
+import resource
+
+from analyzers.buffers import FramePool
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def current_rss():
+    """Sürecin şu anki RSS'i (bayt). /proc yoksa süreç ömrü boyunca görülen tepe değer."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def available_memory():
+    """Sistemde kullanılabilir bellek (bayt, /proc/meminfo MemAvailable); bilinmiyorsa None."""
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+class MemoryMonitor:
+    """
+    Bir iş boyunca RSS'i her 'interval' karede bir örnekler.
+    İşin tepe RSS'ini tutar (ru_maxrss süreç ömrünü kapsadığı için iş başına kullanılamaz)
+    ve bütçe aşıldığında over_budget() True döner.
+    """
+
+    def __init__(self, budget_bytes=None, interval=15):
+        self.budget_bytes = budget_bytes
+        self.interval = interval
+        self.baseline = current_rss()
+        self.peak = self.baseline
+        self._frames = 0
+
+    def sample(self):
+        rss = current_rss()
+        self.peak = max(self.peak, rss)
+        return rss
+
+    def tick(self):
+        """Kare başına çağrılır; örnekleme zamanıysa ve bütçe aşıldıysa True döner."""
+        self._frames += 1
+        if self._frames % self.interval:
+            return False
+        rss = self.sample()
+        return self.budget_bytes is not None and rss > self.budget_bytes
+
+    def frames_within_budget(self, frame_bytes, maximum):
+        """Bütçeye sığan, aynı anda bellekte tutulabilecek kare sayısı (en az 2, en fazla maximum)."""
+        if self.budget_bytes is None or frame_bytes <= 0:
+            return maximum
+        headroom = self.budget_bytes - self.baseline
+        return max(2, min(maximum, int(headroom // frame_bytes)))
+
+
+class MemoryBudget:
+    """
+    Bir analiz işinin bellek bütçesi (options.memory_budget_mb, işçi sürecinin RSS'i).
+
+    - İş başında, bütçeye sığan kare sayısı kadar tamponlu bir FramePool kurulur
+      (4K'da tek kare ~25 MB; boru hattı kuyrukları dolu iken ~19 kare bellekte olabilir).
+    - İş sırasında RSS bütçeyi aşarsa önce havuz yarıya indirilir, sonra poz tahmini
+      çözünürlüğü yarıya düşürülür (en az MIN_INFERENCE_SIDE). İş yarıda kesilmez.
+    Bütçe verilmediyse havuz yine kurulur (tampon yeniden kullanımı) ama sınır uygulanmaz.
+    """
+
+    MIN_INFERENCE_SIDE = 320
+
+    def __init__(self, budget_mb, frame_size, max_side, max_frames):
+        self.monitor = MemoryMonitor(budget_mb * 1024 * 1024 if budget_mb else None)
+        self.frame_size = frame_size
+        self.max_side = max_side
+        frame_bytes = frame_size[0] * frame_size[1] * 3
+        self.pool = FramePool(self.monitor.frames_within_budget(frame_bytes, max_frames))
+        if self.pool.size < max_frames:
+            print(f" [i] Bellek bütçesi ({budget_mb} MB): aynı anda en fazla {self.pool.size} kare tutulacak.")
+
+    def check(self):
+        """Kare başına çağrılır; bütçe aşıldıysa kare havuzunu ve çözünürlüğü düşürür."""
+        if not self.monitor.tick():
+            return
+        if self.pool.size > 2:
+            self.pool.shrink(self.pool.size // 2)
+            print(f" [!] Bellek bütçesi aşıldı: kare havuzu {self.pool.size} tampona indirildi.")
+            return
+        current_side = self.max_side or max(self.frame_size)
+        if current_side > self.MIN_INFERENCE_SIDE:
+            self.max_side = max(self.MIN_INFERENCE_SIDE, current_side // 2)
+            print(f" [!] Bellek bütçesi aşıldı: poz tahmini çözünürlüğü {self.max_side} piksele düşürüldü.")
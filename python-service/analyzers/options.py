@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+
+# Bu modül bilerek hafif tutulur (cv2 / mediapipe import etmez): consumer'ın ana
+# süreci ayarları, analizci modüllerini yüklemeden oluşturabilsin.
+
+
+@dataclass(frozen=True)
+class PoseConfig:
+    """mp_pose.Pose yapılandırması; havuzdaki modeller bu değerlere göre ayrılır."""
+    model_complexity: int = 1
+    min_detection_confidence: float = 0.5
+    min_tracking_confidence: float = 0.5
+
+
+@dataclass(frozen=True)
+class SmoothingConfig:
+    """
+    Poz tahmini ile tekrar sayımı arasındaki landmark filtresi (bkz. smoothing.LandmarkFilter).
+    min_cutoff / beta / derivative_cutoff: One-Euro filtresi; yavaş harekette titreşim
+        güçlü bastırılır, hızlı harekette kesim frekansı hız ile artar (gecikme azalır).
+    min_visibility / full_visibility: Görünürlük bu aralıkta ölçümün ağırlığını 0'dan 1'e
+        çıkarır; min_visibility altındaki eklemler filtreyi hiç güncellemez.
+    max_gap_seconds: İskeletin bu süreden kısa kaybolduğu karelerde son tahmin korunur;
+        daha uzun boşluklarda filtre sıfırlanır.
+    """
+    min_cutoff: float = 1.0
+    beta: float = 8.0
+    derivative_cutoff: float = 1.0
+    min_visibility: float = 0.3
+    full_visibility: float = 0.8
+    max_gap_seconds: float = 0.5
+
+
+@dataclass(frozen=True)
+class AnalysisOptions:
+    """
+    Analiz motorunun çalışma ayarları (hareketten bağımsız).
+    preview: Gerçek zamanlı önizleme penceresi (sadece hata ayıklama).
+    pipelined: Okuma / poz tahmini / yazma aşamalarını thread'lerde örtüştür.
+    frame_stride: Her N karede bir poz tahmini yap.
+    max_analysis_fps: Saniyede en fazla bu kadar kareyi analiz et (None: sınırsız).
+    adaptive_sampling: Eşik geçişlerine yakınken her kareyi analiz et.
+    streaming: Videoyu tam indirmeden, URL'den akış olarak çözmeye başla.
+    landmark_cache: LandmarkCache; varsa kare landmark'ları saklanır ve aynı video
+        tekrar geldiğinde çözme/poz tahmini yapılmadan analiz edilir.
+    download_cache: DownloadCache; varsa HTTP'den indirilen videolar diskte saklanır,
+        yeniden deneme ve yeniden analizde ağa çıkılmaz (bkz. download_cache.DownloadCache).
+    video_mounts: ((URL öneki, yerel klasör), ...); öneki eşleşen videolar indirilmeden
+        paylaşılan klasörden okunur (bkz. sources.local_path).
+    allow_local_files: file:// URL'leri ve mutlak yollar doğrudan açılsın mı. Kapalıyken
+        sadece HTTP(S) ve 'video_mounts' altındaki dosyalar okunur.
+    checkpoints: CheckpointStore; varsa süreç kapanırken yarıda kalan analizin ilerlemesi
+        kaydedilir ve iş yeniden geldiğinde kaldığı kareden devam edilir.
+    render_output: İşlenmiş (çizimli) videoyu yaz. Kapalıyken hiç kodlama yapılmaz.
+    render_scale: Çizimli çıktı videosunun orijinal çözünürlüğe oranı.
+    inference_max_side: Poz tahmini öncesi karenin uzun kenarının küçültüleceği
+        piksel değeri (None: orijinal çözünürlük).
+    pose_config: Poz modeli yapılandırması; modeller bu anahtarla süreç havuzundan alınır.
+    smoothing: Landmark filtresi ayarları (None: ham landmark'larla sayılır).
+    memory_budget_mb: İşçi süreci başına bellek (RSS) bütçesi; aşılırsa bellekteki kare
+        sayısı ve poz tahmini çözünürlüğü düşürülür (None: sınırsız, bkz. memory.MemoryBudget).
+    """
+    preview: bool = False
+    pipelined: bool = True
+    frame_stride: int = 1
+    max_analysis_fps: float = None
+    adaptive_sampling: bool = False
+    streaming: bool = True
+    landmark_cache: object = None
+    download_cache: object = None
+    video_mounts: tuple = ()
+    allow_local_files: bool = False
+    checkpoints: object = None
+    render_output: bool = False
+    render_scale: float = 0.5
+    inference_max_side: int = 640
+    pose_config: PoseConfig = PoseConfig()
+    smoothing: SmoothingConfig = SmoothingConfig()
+    memory_budget_mb: int = None
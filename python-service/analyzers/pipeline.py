@@ -0,0 +1,113 @@
+import queue
+import threading
+
+# Kuyruğun bittiğini bildiren işaret
+_END = object()
+
+# Varsayılan kuyruk boyutu ve dolu kuyruklarla aynı anda bellekte olabilecek kare sayısı
+# (iki kuyruk + her aşamanın elindeki birer kare)
+QUEUE_SIZE = 8
+PIPELINE_FRAMES = 2 * QUEUE_SIZE + 3
+
+
+def _put(q, item, stop):
+    """Kuyruk doluysa bekler; tüketici durduysa (stop) vazgeçer."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q, stop):
+    """Kuyruk boşsa bekler; durdurulduysa _END döner."""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _END
+
+
+def run_pipeline(read_frame, infer, consume, queue_size=QUEUE_SIZE, pool=None):
+    """
+    Kareleri 3 aşamalı bir boru hattında işler:
+      decode (thread) -> inference (thread) -> consume (çağıran thread)
+
+    read_frame(tampon) -> (ok, frame), infer(frame) -> sonuç, consume(frame, sonuç).
+    Her aşama tek thread olduğu ve kuyruklar FIFO olduğu için kare sırası
+    sıralı (sequential) işlemle birebir aynıdır. Kuyruklar sınırlı (bounded)
+    olduğundan bellek kullanımı queue_size kare ile sınırlı kalır.
+    pool (buffers.FramePool) verilirse kareler havuzdaki tamponlara çözülür ve
+    consume'dan sonra havuza geri verilir: her kare için yeni dizi ayrılmaz ve
+    bellekteki kare sayısı havuz boyutunu geçmez. pool yoksa read_frame(None) çağrılır.
+    Toplam işlenen kare sayısını döner.
+    """
+    decoded = queue.Queue(maxsize=queue_size)
+    inferred = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors = []
+
+    def decode_stage():
+        try:
+            while not stop.is_set():
+                buffer = None
+                if pool is not None:
+                    try:
+                        buffer = pool.acquire(timeout=0.1)
+                    except queue.Empty:
+                        continue  # Tüm tamponlar kullanımda: tüketici birini bırakana kadar bekle
+                ok, frame = read_frame(buffer)
+                if not ok:
+                    if pool is not None:
+                        pool.release(buffer)
+                    break
+                if not _put(decoded, frame, stop):
+                    break
+        except Exception as e:
+            errors.append(e)
+        finally:
+            _put(decoded, _END, stop)
+
+    def inference_stage():
+        try:
+            while True:
+                frame = _get(decoded, stop)
+                if frame is _END:
+                    break
+                if not _put(inferred, (frame, infer(frame)), stop):
+                    break
+        except Exception as e:
+            errors.append(e)
+        finally:
+            _put(inferred, _END, stop)
+
+    threads = [
+        threading.Thread(target=decode_stage, name="decode", daemon=True),
+        threading.Thread(target=inference_stage, name="inference", daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+
+    frame_count = 0
+    try:
+        while True:
+            item = _get(inferred, stop)
+            if item is _END:
+                break
+            frame, result = item
+            consume(frame, result)
+            if pool is not None:
+                pool.release(frame)
+            frame_count += 1
+    finally:
+        # Hata olsa bile arka plan thread'lerinin kuyrukta asılı kalmasını engelle
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
+    return frame_count
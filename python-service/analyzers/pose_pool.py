@@ -0,0 +1,108 @@
+import atexit
+import mediapipe as mp
+import numpy as np
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+
+mp_pose = mp.solutions.pose
+
+# Isınma (warm-up) karesi: grafiğin hesaplayıcıları ve TFLite tamponları ilk çağrıda ayrılır
+WARM_UP_FRAME = np.zeros((256, 256, 3), dtype=np.uint8)
+WARM_UP_FRAME.flags.writeable = False
+
+
+class PosePool:
+    """
+    Süreç başına MediaPipe Pose model havuzu.
+
+    Her video için yeni mp_pose.Pose oluşturmak model grafiğini yeniden yükler ve
+    tamponları yeniden ayırır. Havuz, modelleri yapılandırmaya (PoseConfig) göre
+    saklar ve işler arasında yeniden kullanır. Bir iş bitince modelin takip durumu
+    (önceki karenin ROI'si, landmark yumuşatma filtreleri) reset() ile sıfırlanır
+    ve model yeniden ısıtılır. Bu işlem arka planda yapılır, böylece işin sonucu
+    beklemez; bir sonraki iş gerekirse modelin hazır olmasını bekler.
+    """
+
+    def __init__(self):
+        self._idle = {}        # config -> boşta, ısınmış modeller
+        self._recycling = {}   # config -> sıfırlanmakta olan model sayısı
+        self._condition = threading.Condition()
+
+    @staticmethod
+    def _warm(model):
+        model.process(WARM_UP_FRAME)
+
+    def _create(self, config):
+        start_time = time.perf_counter()
+        model = mp_pose.Pose(**asdict(config))
+        self._warm(model)
+        print(f" [i] Poz modeli yüklendi ve ısıtıldı ({config}, {time.perf_counter() - start_time:.2f} sn).")
+        return model
+
+    def warm_up(self, config, count=1):
+        """Havuzda 'config' için en az 'count' hazır model olmasını sağlar."""
+        with self._condition:
+            missing = count - len(self._idle.get(config, [])) - self._recycling.get(config, 0)
+        for _ in range(missing):
+            model = self._create(config)
+            with self._condition:
+                self._idle.setdefault(config, []).append(model)
+                self._condition.notify_all()
+
+    def _take(self, config):
+        with self._condition:
+            while True:
+                idle = self._idle.get(config)
+                if idle:
+                    return idle.pop()
+                if not self._recycling.get(config):
+                    break
+                # Sıfırlanmakta olan model birazdan hazır olur: yenisini yüklemekten ucuz
+                self._condition.wait()
+        return self._create(config)
+
+    def _recycle(self, config, model):
+        try:
+            model.reset()
+            self._warm(model)
+        except Exception as e:
+            print(f" [!] Poz modeli sıfırlanamadı, havuzdan çıkarılıyor: {e}")
+            model.close()
+            model = None
+        with self._condition:
+            self._recycling[config] -= 1
+            if model is not None:
+                self._idle.setdefault(config, []).append(model)
+            self._condition.notify_all()
+
+    def drain(self, timeout=5.0):
+        """Arka planda sıfırlanan modelleri bekler (süreç kapanırken grafik yarıda kesilmesin)."""
+        with self._condition:
+            self._condition.wait_for(lambda: not any(self._recycling.values()), timeout)
+
+    @contextmanager
+    def acquire(self, config):
+        """Bir video boyunca kullanılacak modeli verir; çıkışta model havuza geri döner."""
+        model = self._take(config)
+        try:
+            yield model
+        finally:
+            with self._condition:
+                self._recycling[config] = self._recycling.get(config, 0) + 1
+            threading.Thread(target=self._recycle, args=(config, model), name="pose-recycle", daemon=True).start()
+
+
+_pool = PosePool()
+atexit.register(_pool.drain)
+
+
+def acquire_pose(config):
+    """Süreç havuzundan 'config' yapılandırmalı bir poz modeli alır (context manager)."""
+    return _pool.acquire(config)
+
+
+def warm_up_pose_models(config, count=1):
+    """İşçi süreci başlarken modelleri önceden yükler ve ısıtır (ProcessPoolExecutor initializer)."""
+    _pool.warm_up(config, count)
@@ -0,0 +1,110 @@
+import os
+import struct
+from dataclasses import dataclass
+
+import requests
+
+from analyzers.sources import local_path
+
+# MP4 başlığını bulmak için okunan parça boyutu
+PROBE_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class VideoInfo:
+    """Videonun tamamı indirilmeden öğrenilen bilgiler (bilinmiyorsa None)."""
+    size_bytes: int = None
+    duration_seconds: float = None
+
+
+def _read_range(video_url, start, length, session, mounts=(), allow_local_files=False):
+    """
+    [start, start + length) aralığını okur; (veri, toplam dosya boyutu) döner.
+    HTTP'de tek bir Range isteği yapılır: 206 yanıtının Content-Range başlığı
+    dosya boyutunu da verir (ayrı bir HEAD isteğine gerek kalmaz).
+    Yerel dosyalar (file://, bağlı klasörler) doğrudan diskten okunur.
+    """
+    path = local_path(video_url, mounts, allow_local_files)
+    if path is not None:
+        with open(path, 'rb') as f:
+            f.seek(start)
+            return f.read(length), os.path.getsize(path)
+
+    headers = {'Range': f'bytes={start}-{start + length - 1}'}
+    with session.get(video_url, headers=headers, stream=True, timeout=(3, 5)) as response:
+        response.raise_for_status()
+        total = None
+        if response.status_code == 206 and '/' in response.headers.get('Content-Range', ''):
+            total_text = response.headers['Content-Range'].rsplit('/', 1)[1]
+            total = int(total_text) if total_text.isdigit() else None
+        elif response.headers.get('Content-Length', '').isdigit():
+            total = int(response.headers['Content-Length'])
+            if start > 0:
+                return b'', total  # Sunucu Range desteklemiyor: dosyanın ortasına atlanamaz
+        data = response.raw.read(length, decode_content=True)
+        return data, total
+
+
+def _boxes(data):
+    """Bir tampon içindeki MP4 kutularını (box) (tür, başlangıç, içerik başı, bitiş) olarak gezer."""
+    offset = 0
+    while offset + 8 <= len(data):
+        size, kind = struct.unpack('>I4s', data[offset:offset + 8])
+        header = 8
+        if size == 1:
+            if offset + 16 > len(data):
+                return
+            size = struct.unpack('>Q', data[offset + 8:offset + 16])[0]
+            header = 16
+        elif size == 0:
+            size = len(data) - offset  # Dosya sonuna kadar
+        if size < header:
+            return
+        yield kind, offset, offset + header, offset + size
+        offset += size
+
+
+def _mvhd_duration(moov):
+    """moov kutusunun içeriğinden mvhd süresini (sn) okur."""
+    for kind, _, body, end in _boxes(moov):
+        if kind != b'mvhd':
+            continue
+        if body >= len(moov):
+            return None
+        version = moov[body]
+        if version == 1 and body + 32 <= len(moov):
+            timescale, duration = struct.unpack('>IQ', moov[body + 20:body + 32])
+        elif body + 20 <= len(moov):
+            timescale, duration = struct.unpack('>II', moov[body + 12:body + 20])
+        else:
+            return None
+        return duration / timescale if timescale else None
+    return None
+
+
+def probe_video(video_url, session=None, mounts=(), allow_local_files=False):
+    """
+    Videonun boyutunu ve (MP4/MOV ise) süresini en fazla iki küçük okuma ile bulur.
+    Süre, 'moov/mvhd' kutusundan okunur: moov dosya başındaysa (faststart) ilk
+    parçada, değilse 'mdat'tan hemen sonradır ve konumu mdat boyutundan bilinir.
+    Hata durumunda bilinmeyen alanlar None kalır; analiz yine yapılır.
+    """
+    session = session or requests
+    try:
+        data, total = _read_range(video_url, 0, PROBE_BYTES, session, mounts, allow_local_files)
+        for kind, start, body, end in _boxes(data):
+            if kind == b'moov':
+                # mvhd, moov'un ilk çocuğudur: kutunun tamamı okunmamış olsa da yeterli
+                return VideoInfo(total, _mvhd_duration(data[body:end]))
+            if end > len(data):
+                # Büyük kutu (genelde mdat): moov hemen arkasından gelir
+                header, _ = _read_range(video_url, end, PROBE_BYTES, session, mounts, allow_local_files)
+                for next_kind, _, next_body, _ in _boxes(header):
+                    if next_kind == b'moov':
+                        return VideoInfo(total, _mvhd_duration(header[next_body:]))
+                    break
+                return VideoInfo(total, None)
+        return VideoInfo(total, None)
+    except (OSError, requests.exceptions.RequestException, struct.error, ValueError) as e:
+        print(f" [!] Video bilgisi okunamadı ({type(e).__name__}: {e})")
+        return VideoInfo()
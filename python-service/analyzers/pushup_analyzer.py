@@ -1,22 +1,39 @@
-def analyze_pushup(video_url):
+from analyzers.engine import ExerciseSpec, FormRule, JointAngle, PoseLandmark, run_analysis
+from analyzers.geometry import VISIBILITY
+
+
+def hips_below_line(landmarks):
     """
-    (SAHTE ANALİZ)
-    Gelecekte, bu fonksiyon da video_url'i kullanarak 
-    OpenCV ve MediaPipe ile video işleyecek.
+    Kalça ve ayak bileği görünürken kalça, omuz-ayak bileği çizgisinin altındaysa True döner.
+    body_line açısı yönsüzdür: kalçanın yukarıda kırılması (pike) sarkma sayılmaz.
     """
-    
-    print("--- UZMAN: PUSHUP ANALİZİ ÇALIŞTI (SAHTE) ---")
-    
-    # Gerçek analizde burada bir 'frame_count' olurdu
-    # Şimdilik sahte bir değer verelim
-    frame_count = 150 
-    
-    correct_reps = 5
-    wrong_reps = 5
-    feedback = f"Şınav analizi (pushup_analyzer.py dosyasından) {frame_count} kare üzerinden başarılı. (Bu sahte bir sonuçtur)."
-    
-    return {
-        "correct_reps": correct_reps,
-        "wrong_reps": wrong_reps,
-        "feedback": feedback
-    }
\ No newline at end of file
+    shoulder = landmarks[..., PoseLandmark.LEFT_SHOULDER, :]
+    hip = landmarks[..., PoseLandmark.LEFT_HIP, :]
+    ankle = landmarks[..., PoseLandmark.LEFT_ANKLE, :]
+    visible = (hip[..., VISIBILITY] > 0.5) & (ankle[..., VISIBILITY] > 0.5)
+    return visible & (hip[..., 1] > (shoulder[..., 1] + ankle[..., 1]) / 2)
+
+
+# Dirsek açısına göre tekrar sayar (kollar açık, yukarıda başlar).
+# Göğüs yeterince alçalmazsa 'Yanlış Tekrar' sayar.
+# Omuz-kalça-ayak bileği çizgisi kalçada aşağı doğru kırılırsa kalça sarkıyor demektir.
+PUSHUP = ExerciseSpec(
+    name="push-up",
+    joints=(PoseLandmark.LEFT_SHOULDER, PoseLandmark.LEFT_ELBOW, PoseLandmark.LEFT_WRIST),
+    rest_state="up",
+    active_state="down",
+    extend_threshold=150,  # Kolların açık sayıldığı açı
+    depth_threshold=90,    # Doğru tekrar için dirseğin bükülmesi gereken açı
+    shallow_feedback="HATA: Yeterince asagi inmediniz",
+    angle_label="DIRSEK ACISI",
+    angles=(JointAngle("body_line", (PoseLandmark.LEFT_SHOULDER, PoseLandmark.LEFT_HIP, PoseLandmark.LEFT_ANKLE)),),
+    # Düz vücutta çizgi ~180 derecedir; landmark titreşimi ve vücut oranları 10-15 derecelik
+    # sapma yaratır. 150 altı (30 derecelik kırılma) yandan bakışta belirgin sarkmadır.
+    form_rules=(FormRule("HATA: Kalcaniz sarkiyor", hips_below_line, angle="body_line", below=150),),
+    output_suffix="_pushup",
+)
+
+
+def analyze_pushup(video_url, video_id, options=None):
+    """Ana Şınav (Push-up) analiz fonksiyonu."""
+    return run_analysis(video_url, video_id, PUSHUP, options)
@@ -0,0 +1,126 @@
+import importlib
+import inspect
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class AnalyzerEntry:
+    """
+    Kayıt defterindeki bir hareket analizcisi.
+    name: Kanonik ad (metrik etiketi, raporlar).
+    target: "modül:fonksiyon". Analizci modülleri cv2 ve mediapipe'i (TFLite, protobuf)
+        yüklediği için modül ilk iş geldiğinde veya ısınmada import edilir.
+    spec: "modül:değişken" biçiminde ExerciseSpec; verilirse uzun videolar parçalara
+        bölünüp paralel analiz edilebilir (bkz. engine.analyze_segment).
+    aliases: Mesajlarda gelebilecek diğer adlar (normalize edilerek eşleşir).
+    signature: Fonksiyonun aldığı parametreler; çağrı bu adlarla (keyword) yapılır
+        ve modül yüklenirken fonksiyonun gerçek imzasıyla doğrulanır.
+    cpu_weight: Bir işin göreli CPU maliyeti (1.0: tek işçiyi tam kullanır); zamanlayıcı için.
+    needs_video_output: Analizci her zaman çizimli çıktı videosu üretmeli mi.
+    version: Analiz mantığı değiştiğinde artırılır; sonuçlara ve raporlara yazılır.
+    """
+    name: str
+    target: str
+    spec: str = None
+    aliases: tuple = ()
+    signature: tuple = ('video_url', 'video_id', 'options')
+    cpu_weight: float = 1.0
+    needs_video_output: bool = False
+    version: str = "1"
+
+
+_SEPARATORS = re.compile(r'[\s_\-]+')
+
+
+def normalize_name(exercise_name):
+    """'Push-Up', 'push_up', ' push up ' -> 'push up'."""
+    return _SEPARATORS.sub(' ', exercise_name.strip().lower())
+
+
+_entries = {}     # normalize edilmiş ad / takma ad -> AnalyzerEntry
+_loaded = {}      # target -> fonksiyon
+_lock = threading.Lock()
+
+
+def register(entry):
+    """Analizciyi kanonik adı ve takma adlarıyla kaydeder."""
+    for alias in (entry.name,) + tuple(entry.aliases):
+        key = normalize_name(alias)
+        existing = _entries.get(key)
+        if existing is not None and existing.name != entry.name:
+            raise ValueError(f"'{alias}' adı zaten '{existing.name}' için kayıtlı.")
+        _entries[key] = entry
+    return entry
+
+
+register(AnalyzerEntry(
+    name='squat',
+    target='analyzers.squat_analyzer:analyze_squat',
+    spec='analyzers.squat_analyzer:SQUAT',
+    version='4',  # 2: One-Euro landmark filtresi; 3: iki taraflı açılar, açı kuralları; 4: yöne duyarlı diz kuralı
+))
+register(AnalyzerEntry(
+    name='pushup',
+    target='analyzers.pushup_analyzer:analyze_pushup',
+    spec='analyzers.pushup_analyzer:PUSHUP',
+    version='3',
+    aliases=('push-up',),
+))
+register(AnalyzerEntry(
+    name='barbell_curl',
+    target='analyzers.barbell_curl_analyzer:analyze_barbell_curl',
+    spec='analyzers.barbell_curl_analyzer:BARBELL_CURL',
+    version='3',
+    aliases=('barbell curl', 'curl', 'barbel-curl'),
+))
+
+
+def lookup(exercise_name):
+    """Hareketin kaydını döner (modül yüklemeden, O(1)); yoksa None."""
+    if not exercise_name:
+        return None
+    return _entries.get(normalize_name(exercise_name))
+
+
+def entries():
+    """Kayıtlı analizciler (her biri bir kez)."""
+    return list({entry.name: entry for entry in _entries.values()}.values())
+
+
+def _resolve(target):
+    module_name, attribute = target.split(':')
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def _load(entry):
+    with _lock:
+        if entry.target not in _loaded:
+            module_name = entry.target.split(':')[0]
+            start_time = time.perf_counter()
+            function = _resolve(entry.target)
+            missing = set(entry.signature) - set(inspect.signature(function).parameters)
+            if missing:
+                raise TypeError(f"{entry.target} şu parametreleri almıyor: {', '.join(sorted(missing))}")
+            _loaded[entry.target] = function
+            print(f" [i] Analizci yüklendi: {module_name} ({time.perf_counter() - start_time:.2f} sn)")
+        return _loaded[entry.target]
+
+
+def load_spec(entry):
+    """Hareketin ExerciseSpec'ini döner (parçalı analiz için); tanımlı değilse None."""
+    return _resolve(entry.spec) if entry.spec else None
+
+
+def run(entry, **arguments):
+    """Analizciyi (gerekirse ilk kez yükleyerek) imzasındaki argümanlarla çağırır."""
+    function = _load(entry)
+    return function(**{name: arguments[name] for name in entry.signature})
+
+
+def load_all():
+    """Tüm analizci modüllerini önceden yükler (arka plan ısınması için)."""
+    for entry in entries():
+        _load(entry)
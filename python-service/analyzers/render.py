@@ -0,0 +1,130 @@
+import cv2
+import mediapipe as mp
+import numpy as np
+import os
+from functools import lru_cache
+
+from analyzers.geometry import VISIBILITY, select_side
+
+POSE_CONNECTIONS = tuple(mp.solutions.pose.POSE_CONNECTIONS)
+
+# Çizim renkleri (BGR)
+JOINT_COLOR = (245, 66, 230)
+BONE_COLOR = (245, 117, 66)
+PANEL_COLOR = (24, 24, 24)
+LABEL_COLOR = (255, 255, 255)
+VALUE_COLOR = (57, 255, 20)
+ERROR_COLOR = (0, 0, 255)
+
+PANEL_SIZE = (300, 200)  # (genişlik, yükseklik)
+FEEDBACK_HEIGHT = 50
+
+
+@lru_cache(maxsize=1024)
+def _text_patch(text, scale, color, thickness, background):
+    """
+    Metni bir kez küçük bir yamaya (patch) çizer ve önbelleğe alır.
+    Sayaç/durum/açı değerleri sınırlı olduğundan her kare putText yerine kopyalanır.
+    """
+    (width, height), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+    patch = np.full((height + baseline + thickness, width + thickness, 3), background, dtype=np.uint8)
+    cv2.putText(patch, text, (0, height), cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness, cv2.LINE_AA)
+    patch.flags.writeable = False
+    return patch, height
+
+
+def _blit(image, patch, origin):
+    """Yamayı, sol-alt köşesi putText'teki gibi 'origin' olacak şekilde kareye kopyalar."""
+    patch, height = patch
+    x, y = origin[0], origin[1] - height
+    h = min(patch.shape[0], image.shape[0] - y)
+    w = min(patch.shape[1], image.shape[1] - x)
+    if h > 0 and w > 0 and x >= 0 and y >= 0:
+        image[y:y + h, x:x + w] = patch[:h, :w]
+
+
+class OverlayRenderer:
+    """
+    Hafif çıktı çizicisi.
+    - İstatistik kutusu ve etiketleri bir kez çizilir, her karede sadece kopyalanır.
+    - Değişen değerler (tekrar, durum, açı) önbellekli metin yamalarıyla yazılır.
+    - Kare, çizimden önce 'scale' oranında küçültülür (daha az çizim ve kodlama).
+    """
+
+    def __init__(self, spec, frame_size, scale=1.0):
+        self.spec = spec
+        width, height = frame_size
+        self.scale = scale
+        self.output_size = (max(1, int(width * scale)) // 2 * 2, max(1, int(height * scale)) // 2 * 2)
+        self.panel = self._render_panel()
+        self._output = None  # Küçültülmüş karenin her karede yeniden kullanılan tamponu
+
+    def _render_panel(self):
+        panel_w, panel_h = PANEL_SIZE
+        panel = np.full((panel_h, panel_w, 3), PANEL_COLOR, dtype=np.uint8)
+        for label, origin in (('DOGRU REPS', (15, 30)), ('YANLIS REPS', (150, 30)),
+                              ('STATE', (15, 110)), (self.spec.angle_label, (150, 110))):
+            cv2.putText(panel, label, origin, cv2.FONT_HERSHEY_SIMPLEX, 0.7, LABEL_COLOR, 1, cv2.LINE_AA)
+        return panel
+
+    def _draw_skeleton(self, image, landmarks):
+        if not self.spec.draw_full_skeleton and self.spec.bilateral:
+            landmarks = select_side(landmarks, self.spec.joints)  # Sayılan (görünen) taraf çizilir
+        h, w = image.shape[:2]
+        points = np.empty((33, 2), dtype=np.int32)
+        points[:, 0] = (landmarks[:, 0] * w).astype(np.int32)
+        points[:, 1] = (landmarks[:, 1] * h).astype(np.int32)
+
+        if self.spec.draw_full_skeleton:
+            visible = landmarks[:, VISIBILITY] >= 0.5
+            bones = [points[[start, end]] for start, end in POSE_CONNECTIONS if visible[start] and visible[end]]
+            cv2.polylines(image, bones, False, BONE_COLOR, 2)
+            for index in np.flatnonzero(visible):
+                cv2.circle(image, tuple(points[index]), 2, JOINT_COLOR, 2)
+        else:
+            joints = points[list(self.spec.joints)]
+            cv2.polylines(image, [joints], False, BONE_COLOR, 3)
+            for point in joints:
+                cv2.circle(image, tuple(point), 6, JOINT_COLOR, -1)
+
+    def render(self, frame, landmarks, counter, feedback):
+        """
+        Kareyi çıktı boyutuna getirir, iskeleti ve istatistikleri çizip döner.
+        İskelet yoksa (landmarks None) kare çizimsiz yazılır. Dönen dizi bir sonraki
+        çağrıda üzerine yazılır: kare çağrı bitmeden yazılmalı / gösterilmelidir.
+        """
+        if self.output_size != (frame.shape[1], frame.shape[0]):
+            image = self._output = cv2.resize(frame, self.output_size, dst=self._output, interpolation=cv2.INTER_AREA)
+        else:
+            image = frame
+        if landmarks is None:
+            return image
+        h, w = image.shape[:2]
+
+        self._draw_skeleton(image, landmarks)
+
+        # İstatistik kutusu (önceden çizilmiş panel + değişen değerler)
+        panel_h, panel_w = min(self.panel.shape[0], h), min(self.panel.shape[1], w)
+        image[:panel_h, :panel_w] = self.panel[:panel_h, :panel_w]
+        angle_text = str(round(counter.angle, 1)) if counter.angle is not None else 'N/A'
+        for text, origin, color in ((str(counter.correct_reps), (20, 70), VALUE_COLOR),
+                                    (str(counter.wrong_reps), (155, 70), ERROR_COLOR),
+                                    (counter.state.upper(), (20, 150), VALUE_COLOR),
+                                    (angle_text, (155, 150), VALUE_COLOR)):
+            _blit(image, _text_patch(text, 1.5, color, 2, PANEL_COLOR), origin)
+
+        # Hata mesajı (ekranın altına)
+        if feedback:
+            image[max(0, h - FEEDBACK_HEIGHT):h] = PANEL_COLOR
+            _blit(image, _text_patch(feedback, 0.8, ERROR_COLOR, 2, PANEL_COLOR), (15, h - 20))
+        return image
+
+
+def open_writer(video_id, spec, fps, size):
+    """İşlenmiş videonun yazılacağı VideoWriter'ı açar."""
+    output_folder = 'analysis_videos'
+    if not os.path.exists(output_folder):
+        os.makedirs(output_folder)
+    output_filename = f"analysis_output_{video_id}{spec.output_suffix}.mp4"
+    output_path = os.path.join(output_folder, output_filename)
+    return cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, size), output_path
@@ -0,0 +1,60 @@
+import math
+
+
+def base_stride(fps, frame_stride=1, max_analysis_fps=None):
+    """
+    Sabit adım (stride) ve/veya azami analiz FPS'inden poz tahmini adımını hesaplar.
+    Örn: 60 FPS video + max_analysis_fps=30 -> her 2 karede bir tahmin.
+    """
+    stride = max(1, int(frame_stride))
+    if max_analysis_fps and fps > max_analysis_fps:
+        stride = max(stride, math.ceil(fps / max_analysis_fps))
+    return stride
+
+
+class FrameSampler:
+    """
+    Hangi karelerin poz modelinden geçeceğine karar verir.
+    Atlanan kareler için son landmark'lar ileri taşınır, böylece çıktı videosu
+    yine tam FPS ile yazılabilir.
+
+    Uyarlamalı (adaptive) modda açı, eşiklerden birine 'adaptive_band' dereceden
+    yakınsa (veya iskelet kaybolduysa) her kare analiz edilir; eşiklerden uzakken
+    taban adım kullanılır. Böylece UP/DOWN geçişleri tam çözünürlükte yakalanır.
+    """
+
+    def __init__(self, stride, angle_of, thresholds=(), adaptive=False, adaptive_band=15.0):
+        self.stride = stride
+        self.angle_of = angle_of
+        self.thresholds = tuple(thresholds)
+        self.adaptive = adaptive
+        self.adaptive_band = adaptive_band
+        self.landmarks = None
+        self.dense = True           # İlk kare her zaman analiz edilir
+        self.frames_since_sample = 0
+        self.sampled_frames = 0
+
+    def _near_threshold(self, landmarks):
+        if landmarks is None:
+            return True  # İskeleti yeniden yakalamak için sık örnekle
+        angle = self.angle_of(landmarks)
+        return any(abs(angle - t) <= self.adaptive_band for t in self.thresholds)
+
+    def should_sample(self):
+        stride = 1 if self.dense else self.stride
+        return self.frames_since_sample % stride == 0
+
+    def sample(self, frame, estimate):
+        """
+        Kareyi gerekiyorsa estimate(frame) ile analiz eder.
+        (landmarks, fresh) döner; fresh=False ise landmark'lar önceki kareden taşınmıştır.
+        """
+        if self.should_sample():
+            self.landmarks = estimate(frame)
+            self.sampled_frames += 1
+            self.frames_since_sample = 1
+            self.dense = self.adaptive and self._near_threshold(self.landmarks)
+            return self.landmarks, True
+
+        self.frames_since_sample += 1
+        return self.landmarks, False
@@ -0,0 +1,158 @@
+import numpy as np
+
+from analyzers.geometry import joint_angles, select_side
+from analyzers.smoothing import smooth_landmarks
+
+
+def summarize(spec, correct_reps, wrong_reps, feedback_list):
+    """Tekrar sayılarından ve toplanan hatalardan backend'e gidecek özeti üretir."""
+    if not feedback_list and correct_reps > 0 and wrong_reps == 0:
+        final_feedback = f"Toplam {correct_reps} tekrar yapıldı. Formunuz harika!"
+    elif correct_reps == 0 and wrong_reps == 0:
+        final_feedback = f"Videoda {spec.name} hareketi tespit edilemedi."
+    else:
+        final_feedback = " | ".join(feedback_list)
+
+    return {
+        "correct_reps": correct_reps,
+        "wrong_reps": wrong_reps,
+        "feedback": final_feedback
+    }
+
+
+def spec_angles(landmarks, spec):
+    """
+    Hareketin tüm açılarını tek geçişte hesaplar: (landmark'lar, açılar) döner.
+    spec.bilateral ise önce görünen taraf seçilir (bkz. geometry.select_side); dönen
+    landmark'lar bu tarafa göredir. Açılar, 'rep' (tekrar sayılan açı) ve spec.angles'daki
+    adlarla bir sözlüktür; tek kare için skaler, (kare, 33, 4) için kare başına dizidir.
+    Canlı sayım (RepCounter) ve iz puanlama aynı fonksiyonu kullanır.
+    """
+    if spec.bilateral:
+        landmarks = select_side(landmarks, spec.joints)
+    values = joint_angles(landmarks, (spec.joints,) + tuple(angle.joints for angle in spec.angles))
+    names = ('rep',) + tuple(angle.name for angle in spec.angles)
+    if values.ndim == 1:
+        return landmarks, {name: float(value) for name, value in zip(names, values)}
+    return landmarks, {name: values[:, index] for index, name in enumerate(names)}
+
+
+def rule_fires(rule, landmarks, angles):
+    """
+    Form kuralının tetiklenip tetiklenmediği (tek kare: bool, dizi: kare başına bool).
+    Kural, landmark koşulu (check) ve/veya paylaşılan bir açının eşiği (angle + below/above)
+    ile tanımlanır; ikisi de verilmişse birlikte sağlanmalıdır. NaN açılar tetiklemez.
+    """
+    fires = True
+    if rule.check is not None:
+        fires = rule.check(landmarks)
+    if rule.angle is not None:
+        value = angles[rule.angle]
+        with np.errstate(invalid='ignore'):
+            if rule.below is not None:
+                fires = fires & (value < rule.below)
+            if rule.above is not None:
+                fires = fires & (value > rule.above)
+    return fires
+
+
+def count_reps(angles, spec):
+    """
+    Kare başına açı serisinde (NaN = iskelet yok) tekrarları vektörel olarak bulur.
+    RepCounter.step ile birebir aynı kuralları uygular:
+      - rest -> active: açı < extend_threshold - start_margin
+      - active -> rest: açı > extend_threshold (tekrar biter)
+      - Tekrar, aktif fazda (giriş karesi hariç) açı depth_threshold altına indiyse doğrudur.
+
+    (active, reps) döner: active[i] i. kareden sonraki durumun aktif olup olmadığı,
+    reps ise (başlangıç karesi, bitiş karesi, doğru mu) üçlülerinden oluşan dizi.
+    """
+    angles = np.asarray(angles, dtype=np.float64)
+    frame_count = len(angles)
+    valid = np.flatnonzero(~np.isnan(angles))
+    values = angles[valid]
+
+    # Histerezis: durum, en son gerçekleşen olaya (giriş/çıkış eşiği) göre belirlenir
+    enter_zone = values < spec.extend_threshold - spec.start_margin
+    exit_zone = values > spec.extend_threshold
+    event = enter_zone | exit_zone
+    last_event = np.maximum.accumulate(np.where(event, np.arange(len(values)), -1))
+    active_after = (last_event >= 0) & enter_zone[np.maximum(last_event, 0)]
+    active_before = np.concatenate(([False], active_after[:-1]))
+
+    entries = ~active_before & enter_zone
+    exits = active_before & exit_zone
+
+    # Her kareyi ait olduğu aktif fazın numarasıyla etiketle
+    segment = np.cumsum(entries)
+    deep_segments = segment[active_before & (values < spec.depth_threshold)]
+    exit_segments = segment[exits]
+    correct = np.isin(exit_segments, deep_segments)
+
+    entry_frames = valid[entries]
+    reps = np.zeros(len(exit_segments), dtype=[('start', np.int64), ('end', np.int64), ('correct', bool)])
+    reps['start'] = entry_frames[exit_segments - 1]
+    reps['end'] = valid[exits]
+    reps['correct'] = correct
+
+    active = np.zeros(frame_count, dtype=bool)
+    # Geçersiz (NaN) karelerde durum değişmez: son geçerli karenin durumunu taşı
+    last_valid = np.maximum.accumulate(np.where(~np.isnan(angles), np.arange(frame_count), -1))
+    position = np.searchsorted(valid, np.maximum(last_valid, 0))
+    active[last_valid >= 0] = active_after[position[last_valid >= 0]]
+    return active, reps
+
+
+def score_landmarks(landmarks, spec, quality=None):
+    """
+    (kare, 33, 4) landmark dizisini (iskelet olmayan kareler NaN) tek geçişte puanlar.
+    Açı serisi tek bir vektörel çağrıyla hesaplanır, form kuralları tüm karelere
+    birlikte uygulanır. Kare kare RepCounter ile aynı sonucu, aynı hata sırasıyla üretir.
+    Tüm açılar (iki taraf seçimi dahil) tek bir spec_angles çağrısıyla hesaplanır.
+    quality (kare başına güvenilirlik) verilirse her tekrarın ortalama güvenilirliği
+    (giriş ve çıkış kareleri dahil) rep_confidence olarak eklenir.
+    """
+    landmarks, shared_angles = spec_angles(np.asarray(landmarks), spec)
+    angles = shared_angles['rep']
+    active, reps = count_reps(angles, spec)
+
+    # Hataların ilk görüldüğü kare: canlı analizdeki ekleme sırasını korumak için
+    first_seen = []
+    wrong = np.flatnonzero(~reps['correct'])
+    if len(wrong):
+        first_seen.append((reps['end'][wrong[0]], 0, spec.shallow_feedback))
+    for order, rule in enumerate(spec.form_rules, start=1):
+        with np.errstate(invalid='ignore'):
+            hits = np.flatnonzero(active & ~np.isnan(angles) & rule_fires(rule, landmarks, shared_angles))
+        if len(hits):
+            first_seen.append((hits[0], order, rule.message))
+
+    feedback_list = []
+    for _, _, message in sorted(first_seen):
+        if message not in feedback_list:
+            feedback_list.append(message)
+
+    correct_reps = int(reps['correct'].sum())
+    result = summarize(spec, correct_reps, len(reps) - correct_reps, feedback_list)
+    result["reps"] = [(int(start), int(end), bool(ok)) for start, end, ok in reps]
+    if quality is not None:
+        result["rep_confidence"] = [round(float(np.mean(quality[start:end + 1])), 2) for start, end, _ in reps]
+    return result
+
+
+def score_track(track, spec, smoothing=None):
+    """
+    Bir LandmarkTrack'i puanlar; canlı analizdeki gibi sadece poz modelinden
+    geçmiş kareler kullanılır. Tekrar sınırları videodaki kare numaralarıdır.
+    smoothing verilirse landmark'lar canlı sayımdaki LandmarkFilter'dan aynı
+    kare numaralarıyla geçirilir (filtre özyinelemeli olduğundan kare kare çalışır).
+    """
+    sampled_frames = np.flatnonzero(track.sampled)
+    landmarks, quality = smooth_landmarks(track.landmarks[sampled_frames], sampled_frames, track.fps,
+                                          spec.joints, smoothing, spec.bilateral)
+    result = score_landmarks(landmarks, spec, quality)
+    result["reps"] = [
+        (int(sampled_frames[start]), int(sampled_frames[end]), ok)
+        for start, end, ok in result["reps"]
+    ]
+    return result
@@ -0,0 +1,113 @@
+import math
+import numpy as np
+
+from analyzers.geometry import VISIBILITY, select_side
+from analyzers.options import SmoothingConfig
+
+
+def visibility_weight(visibility, config):
+    """Görünürlüğü ölçüm ağırlığına çevirir: min_visibility altı 0, full_visibility üstü 1."""
+    span = config.full_visibility - config.min_visibility
+    return np.clip((visibility - config.min_visibility) / span, 0.0, 1.0)
+
+
+def frame_quality(landmarks, joints, config=None, bilateral=False):
+    """
+    Karenin sayım için güvenilirliği (0-1): hareket eklemlerinin ortalama görünürlük ağırlığı.
+    İskelet yoksa 0. config None ise varsayılan görünürlük eşikleri kullanılır.
+    bilateral ise eklemler, sayımın kullandığı (daha görünür) taraftan okunur.
+    """
+    config = config or SmoothingConfig()
+    if landmarks is None:
+        return 0.0
+    if bilateral:
+        landmarks = select_side(landmarks, joints)
+    weight = float(np.mean(visibility_weight(landmarks[list(joints), VISIBILITY], config)))
+    return 0.0 if math.isnan(weight) else weight
+
+
+def _alpha(cutoff, dt):
+    """One-Euro yumuşatma katsayısı (cutoff skaler veya dizi olabilir)."""
+    tau = 1.0 / (2.0 * np.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class LandmarkFilter:
+    """
+    Landmark'lar için nedensel (causal) One-Euro filtresi.
+
+    - x, y, z koordinatları filtrelenir; görünürlük sütunu ham bırakılır (form kuralları onu okur).
+    - Her eklemin ölçümü görünürlük ağırlığıyla (visibility_weight) karışır: görünmeyen
+      eklem son tahminde kalır, yarı görünen eklem daha yavaş güncellenir.
+    - Kareler arası süre (dt) kare numarasından hesaplanır; atlanan (örneklenmeyen) kareler
+      ve kısa iskelet kayıpları filtreyi bozmaz. Kayıp max_gap_seconds'tan kısaysa son
+      tahmin döner (boşluk köprülenir), uzunsa filtre sıfırlanır ve None döner.
+    Canlı sayımda (RepCounter) ve önbellekteki izin puanlanmasında (scoring.score_track)
+    aynı sınıf kare kare kullanılır; iki yol birebir aynı sonucu verir.
+    """
+
+    def __init__(self, config, fps):
+        self.config = config
+        self.fps = fps if fps and fps > 0 else 30.0
+        self.reset()
+
+    def reset(self):
+        self.estimate = None
+        self.velocity = None
+        self.frame = None
+
+    def update(self, landmarks, frame_index):
+        """Kare numarası frame_index olan ölçümü işler; filtrelenmiş (33, 4) diziyi veya None döner."""
+        config = self.config
+        gap = (frame_index - self.frame) / self.fps if self.frame is not None else None
+        if landmarks is None:
+            if gap is not None and gap <= config.max_gap_seconds:
+                return self.estimate
+            self.reset()
+            return None
+        if self.estimate is None or gap > config.max_gap_seconds or gap <= 0:
+            self.estimate = landmarks.copy()
+            self.velocity = np.zeros((len(landmarks), 3))
+            self.frame = frame_index
+            return self.estimate
+
+        weight = visibility_weight(landmarks[:, VISIBILITY], config)[:, None]
+        weight = np.nan_to_num(weight)
+        previous = self.estimate[:, :3].astype(np.float64)
+        measured = landmarks[:, :3].astype(np.float64)
+
+        # Hız tahmini (türev) de yumuşatılır; kesim frekansı hız ile artar
+        velocity = (measured - previous) / gap
+        self.velocity = self.velocity + _alpha(config.derivative_cutoff, gap) * weight * (velocity - self.velocity)
+        self.velocity = np.nan_to_num(self.velocity)
+        cutoff = config.min_cutoff + config.beta * np.abs(self.velocity)
+        smoothed = previous + _alpha(cutoff, gap) * weight * (measured - previous)
+        # Önceden tahmini olmayan (NaN) eklemler ölçümle başlar
+        smoothed = np.where(np.isnan(previous), measured, smoothed)
+
+        estimate = np.empty_like(landmarks)
+        estimate[:, :3] = smoothed
+        estimate[:, VISIBILITY] = landmarks[:, VISIBILITY]
+        self.estimate = estimate
+        self.frame = frame_index
+        return estimate
+
+
+def smooth_landmarks(landmarks, frame_indices, fps, joints, config, bilateral=False):
+    """
+    (kare, 33, 4) landmark dizisini (iskelet yok = NaN) LandmarkFilter'dan kare kare geçirir.
+    (filtrelenmiş dizi, kare güvenilirliği) döner; filtre None dönen kareler NaN kalır.
+    config None ise landmark'lar filtrelenmez, sadece güvenilirlik hesaplanır.
+    """
+    smoothed = np.full(landmarks.shape, np.nan, dtype=landmarks.dtype)
+    quality = np.zeros(len(landmarks))
+    landmark_filter = LandmarkFilter(config, fps) if config else None
+    for index, frame_index in enumerate(frame_indices):
+        frame = landmarks[index]
+        frame = None if np.isnan(frame[0, 0]) else frame  # LandmarkTrack.frame ile aynı ölçüt
+        quality[index] = frame_quality(frame, joints, config, bilateral)
+        if landmark_filter is not None:
+            frame = landmark_filter.update(frame, frame_index)
+        if frame is not None:
+            smoothed[index] = frame
+    return smoothed, quality
@@ -0,0 +1,52 @@
+import os
+from urllib.parse import unquote, urlparse
+
+# Bu modül hafiftir (cv2 import etmez): consumer'ın ana süreci video bilgisini
+# okurken (probe) de aynı yol çözümlemesini kullanır.
+
+
+def parse_mounts(text):
+    """
+    'önek=klasör;önek2=klasör2' biçimindeki bağlama (mount) tanımlarını
+    ((önek, klasör), ...) demetine çevirir. Boş girdiler atlanır.
+    Örn: 'https://res.cloudinary.com/demo/video/upload/=/mnt/videos;s3://repvision/=/mnt/minio/repvision'
+    """
+    mounts = []
+    for item in (text or '').split(';'):
+        if '=' not in item:
+            continue
+        prefix, directory = item.split('=', 1)
+        if prefix.strip() and directory.strip():
+            mounts.append((prefix.strip(), directory.strip()))
+    return tuple(mounts)
+
+
+def is_remote(video_url):
+    """Video HTTP(S) üzerinden mi geliyor (akış / indirme yapılabilir mi)."""
+    return urlparse(video_url).scheme in ('http', 'https')
+
+
+def local_path(video_url, mounts=(), allow_local_files=False):
+    """
+    Video yerel diskten okunabiliyorsa dosya yolunu, değilse None döner.
+    - 'mounts' içindeki bir önekle başlayan URL'ler (paylaşılan klasör, örn. aynı makinedeki
+      nesne deposu / MinIO klasörü) önekin yerine klasör konarak çözülür; dosya yoksa None.
+    - file:// URL'leri ve şemasız mutlak yollar sadece allow_local_files ile doğrudan açılır
+      (yerel geliştirme, benchmark). Kuyruğa mesaj yazabilen herkes aksi halde makinedeki
+      herhangi bir dosyayı okutabilirdi; serviste yerel klasörler 'mounts' ile tanımlanmalıdır.
+    """
+    parsed = urlparse(video_url)
+    if allow_local_files:
+        if parsed.scheme == 'file':
+            return unquote(parsed.path)
+        if not parsed.scheme and os.path.isabs(video_url):
+            return video_url
+    for prefix, directory in mounts:
+        if video_url.startswith(prefix):
+            relative = unquote(urlparse(video_url[len(prefix):]).path).lstrip('/')
+            path = os.path.normpath(os.path.join(directory, relative))
+            # '..' ile bağlama klasörünün dışına çıkılmasın
+            if os.path.commonpath([path, os.path.normpath(directory)]) == os.path.normpath(directory) \
+                    and os.path.isfile(path):
+                return path
+    return None
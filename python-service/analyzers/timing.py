@@ -0,0 +1,86 @@
+import bisect
+import threading
+import time
+
+from analyzers.memory import current_rss
+
+# Kare başına poz tahmini süresi histogram sınırları (saniye)
+INFERENCE_BUCKETS = (0.005, 0.01, 0.02, 0.03, 0.05, 0.075, 0.1, 0.15, 0.25, 0.5, 1.0)
+
+
+class JobTimer:
+    """
+    Bir analiz işinin aşama aşama süre ölçümü.
+    Aşamalar: open (indirme/akış açma), decode, preprocess, inference (pose.process),
+    scoring, draw, encode, cache. Pipeline'da her aşama kendi thread'inde
+    ölçüldüğü için toplamlar duvar saatinden (total) büyük olabilir.
+    Poz tahmini süreleri ayrıca sabit sınırlı bir histogramda tutulur;
+    İşçi sürecinin iş boyunca görülen tepe RSS'i (peak_rss_mb) da rapora eklenir;
+    rapor (report) düz bir dict olduğundan işçi sürecinden ana sürece taşınabilir.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}  # aşama -> [toplam saniye, çağrı sayısı]
+        self.inference_counts = [0] * (len(INFERENCE_BUCKETS) + 1)
+        self.peak_rss = current_rss()
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        with self._lock:
+            entry = self.stages.setdefault(stage, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+    def observe_inference(self, seconds):
+        """Tek bir pose.process çağrısının süresini kaydeder."""
+        self.add('inference', seconds)
+        index = bisect.bisect_left(INFERENCE_BUCKETS, seconds)
+        with self._lock:
+            self.inference_counts[index] += 1
+
+    def observe_rss(self, rss):
+        """İş sırasında örneklenen RSS değerini (bayt) tepe değere işler."""
+        with self._lock:
+            self.peak_rss = max(self.peak_rss, rss)
+
+    def merge(self, report):
+        """
+        Başka bir zamanlayıcının raporundaki aşama sürelerini ve histogramı ekler.
+        Tepe RSS toplanmaz, en büyüğü alınır (parçalar ayrı işçilerde çalışır).
+        """
+        with self._lock:
+            self.peak_rss = max(self.peak_rss, report.get("peak_rss_mb", 0) * 1024 * 1024)
+            for stage, entry in report["stages"].items():
+                total = self.stages.setdefault(stage, [0.0, 0])
+                total[0] += entry["seconds"]
+                total[1] += entry["calls"]
+            for index, count in enumerate(report["inference_histogram"]["counts"]):
+                self.inference_counts[index] += count
+
+    def wrap(self, stage, function):
+        """Fonksiyonun her çağrısını 'stage' aşamasına sayan bir sarmalayıcı döner."""
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.add(stage, time.perf_counter() - start)
+        return timed
+
+    def report(self):
+        """JSON'a yazılabilir zamanlama raporu."""
+        self.observe_rss(current_rss())
+        with self._lock:
+            return {
+                "total_seconds": round(time.perf_counter() - self.started, 4),
+                "stages": {
+                    stage: {"seconds": round(seconds, 4), "calls": calls}
+                    for stage, (seconds, calls) in self.stages.items()
+                },
+                "inference_histogram": {
+                    "buckets": list(INFERENCE_BUCKETS),
+                    "counts": list(self.inference_counts),
+                },
+                "peak_rss_mb": round(self.peak_rss / 1024 / 1024, 1),
+            }
@@ -0,0 +1,267 @@
+"""
+Analizci performans ve doğruluk testi (benchmark).
+
+Derlemdeki (corpus.json) her video / landmark izi için analizciyi ayrı bir
+süreçte çalıştırır; duvar süresi, kare/sn, tepe bellek (peak RSS) ve tekrar
+sayılarını kaydeder ve kayıtlı referansla (baseline.json) karşılaştırır.
+Verim belirlenen toleranstan fazla düşerse veya tekrar sayıları değişirse
+çıkış kodu 1 olur.
+
+Kare/sn makineye bağlıdır: verim, aynı koşuda ölçülen ve analiz kodundan bağımsız
+bir kalibrasyon iş yüküne (calibrate) oranlanarak (relative_fps) karşılaştırılır.
+Böylece referans başka bir makinede üretilmiş olsa da karşılaştırma anlamlıdır.
+Referansta kaydı veya relative_fps'i olmayan girdiler hata sayılır: verim kapısı
+sessizce atlanmaz, referans --update-baseline ile (mediapipe kurulu bir makinede) üretilmelidir.
+
+Kullanım (python-service klasöründen):
+    python -m benchmarks.run_benchmarks                   # karşılaştır
+    python -m benchmarks.run_benchmarks --update-baseline # referansı güncelle
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+import cv2
+import numpy as np
+
+from analyzers import squat_analyzer, pushup_analyzer, barbell_curl_analyzer
+from analyzers.engine import AnalysisOptions, analyze_track
+from analyzers.landmark_cache import LandmarkTrack
+from benchmarks.synthetic import synthetic_track, synthetic_video
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+
+# Hareket adı -> (spec, analizci fonksiyonu)
+EXERCISES = {
+    'squat': (squat_analyzer.SQUAT, squat_analyzer.analyze_squat),
+    'pushup': (pushup_analyzer.PUSHUP, pushup_analyzer.analyze_pushup),
+    'barbell_curl': (barbell_curl_analyzer.BARBELL_CURL, barbell_curl_analyzer.analyze_barbell_curl),
+}
+
+# Bu süreden kısa ölçümlerde kare/sn gürültülüdür; verim karşılaştırması yapılmaz
+MIN_TIMED_SECONDS = 0.05
+
+# İz puanlama milisaniyeler sürer: ölçüm, en az bu süre dolana kadar tekrarlanır
+TRACK_MIN_SECONDS = 0.5
+
+# Kalibrasyon iş yükünün süresi (sn)
+CALIBRATION_SECONDS = 0.5
+
+
+def case_url(case):
+    """Derlem girdisinin file:// URL'ini döner (göreli yollar benchmarks/ klasörüne göredir)."""
+    if 'url' in case:
+        return case['url']
+    return (BENCHMARK_DIR / case['path']).as_uri()
+
+
+def ensure_corpus(corpus):
+    """Derlemdeki 'synthetic' girdilerinin dosyalarını yoksa üretir (tohum sabit: her seferinde aynı)."""
+    for case in corpus:
+        synthetic = case.get('synthetic')
+        if not synthetic:
+            continue
+        path = BENCHMARK_DIR / case['path']
+        if path.exists():
+            continue
+        path.parent.mkdir(parents=True, exist_ok=True)
+        print(f" [i] Sentetik derlem dosyası üretiliyor: {path}")
+        if case['kind'] == 'track':
+            spec = EXERCISES[case['exercise']][0]
+            synthetic_track(spec, synthetic['reps'], seed=synthetic.get('seed', 0), noise=synthetic.get('noise', 0.0),
+                            outlier_ratio=synthetic.get('outlier_ratio', 0.0),
+                            stride=synthetic.get('stride', 1),
+                            moving=synthetic.get('moving', 'first')).save(str(path))
+        else:
+            synthetic_video(str(path), tuple(synthetic.get('size', (1280, 720))),
+                            synthetic.get('frames', 150), seed=synthetic.get('seed', 0))
+
+
+def calibrate():
+    """
+    Makinenin hızını ölçen sabit iş yükü (analiz kodundan bağımsız): saniyedeki tur sayısını döner.
+    Analizcinin iş profiline benzer şekilde numpy, OpenCV ve saf Python işlemlerini karıştırır.
+    """
+    rng = np.random.default_rng(0)
+    matrix = rng.random((96, 96))
+    frame = rng.integers(0, 256, (360, 640, 3), dtype=np.uint8)
+    rounds = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < CALIBRATION_SECONDS:
+        matrix @ matrix
+        cv2.resize(frame, (320, 180), interpolation=cv2.INTER_AREA)
+        sum(math.atan2(i, 7) for i in range(500))
+        rounds += 1
+    return rounds / (time.perf_counter() - start)
+
+
+def measure_calibration(repeat):
+    """Kalibrasyonu benchmark girdileri gibi ayrı süreçte 'repeat' kez ölçer; en hızlısını döner."""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context, max_tasks_per_child=1) as executor:
+        return max(executor.submit(calibrate).result() for _ in range(repeat))
+
+
+def run_case(case, render_output):
+    """
+    Tek bir girdiyi analiz eder. Her girdi yeni bir süreçte çalıştığı için
+    ru_maxrss o girdinin tepe bellek kullanımıdır.
+    İzler önce bir kez ölçülmeden puanlanır (ısınma), sonra en az TRACK_MIN_SECONDS
+    boyunca tekrar puanlanır; kare/sn tüm turların ortalamasıdır.
+    """
+    spec, analyze = EXERCISES[case['exercise']]
+    url = case_url(case)
+    iterations = 1
+    start = time.perf_counter()
+    if case['kind'] == 'track':
+        track = LandmarkTrack.load(unquote(urlparse(url).path))
+        smoothing = AnalysisOptions().smoothing
+        result = analyze_track(track, spec, smoothing=smoothing)  # Isınma: dosya okuma ve ilk çağrı hariç
+        start = time.perf_counter()
+        while True:
+            result = analyze_track(track, spec, smoothing=smoothing)
+            if time.perf_counter() - start >= TRACK_MIN_SECONDS:
+                break
+            iterations += 1
+    else:
+        # Sentetik videolar file:// URL'leriyle verilir
+        options = AnalysisOptions(landmark_cache=None, render_output=render_output, allow_local_files=True)
+        result = analyze(url, case['name'], options)
+    wall = time.perf_counter() - start
+
+    frames = result.get('frame_count', 0)
+    return {
+        'wall_seconds': round(wall, 4),
+        'iterations': iterations,
+        'fps': round(frames * iterations / wall, 2) if wall > 0 else 0.0,
+        'frame_count': frames,
+        'analyzed_frames': result.get('analyzed_frames', 0),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'correct_reps': result['correct_reps'],
+        'wrong_reps': result['wrong_reps'],
+        'feedback': result['feedback'],
+    }
+
+
+def measure(case, repeat, render_output, calibration):
+    """
+    Girdiyi 'repeat' kez ölçer; en hızlı koşuyu ve en yüksek belleği raporlar.
+    relative_fps: kare/sn'nin kalibrasyon turu/sn'ye oranı (makineden bağımsız verim).
+    """
+    context = multiprocessing.get_context('spawn')
+    runs = []
+    with ProcessPoolExecutor(max_workers=1, mp_context=context, max_tasks_per_child=1) as executor:
+        for _ in range(repeat):
+            runs.append(executor.submit(run_case, case, render_output).result())
+
+    best = max(runs, key=lambda run: run['fps'])
+    best['relative_fps'] = round(best['fps'] / calibration, 4)
+    best['peak_rss_mb'] = max(run['peak_rss_mb'] for run in runs)
+    outputs = {(run['correct_reps'], run['wrong_reps'], run['feedback']) for run in runs}
+    best['deterministic'] = len(outputs) == 1
+    return best
+
+
+def compare(name, case, current, baseline, fps_tolerance):
+    """Ölçümü beklenen değerler ve referansla karşılaştırır; hata mesajlarını döner."""
+    problems = []
+    if not current['deterministic']:
+        problems.append("tekrarlı koşularda farklı sonuç üretti")
+
+    expected = case.get('expected', {})
+    for key, value in expected.items():
+        if current.get(key) != value:
+            problems.append(f"{key} beklenen {value}, ölçülen {current.get(key)}")
+
+    if baseline is None:
+        return problems
+    for key in ('correct_reps', 'wrong_reps', 'feedback'):
+        if current[key] != baseline[key]:
+            problems.append(f"{key} değişti: {baseline[key]!r} -> {current[key]!r}")
+
+    # Eski referanslarda sadece mutlak kare/sn vardır (başka makinede ölçülmüş olabilir)
+    if not baseline.get('relative_fps', 0) > 0:
+        problems.append("referansta relative_fps yok: verim karşılaştırılamadı (--update-baseline ile yeniden üretin)")
+    elif current['wall_seconds'] >= MIN_TIMED_SECONDS:
+        ratio = current['relative_fps'] / baseline['relative_fps']
+        if ratio < 1 - fps_tolerance:
+            problems.append(f"göreli verim düştü: {baseline['relative_fps']} -> {current['relative_fps']} "
+                            f"({(ratio - 1) * 100:+.0f}%, {current['fps']} kare/sn)")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RepVision analizci benchmark'ı")
+    parser.add_argument('--corpus', default=str(BENCHMARK_DIR / 'corpus.json'))
+    parser.add_argument('--baseline', default=str(BENCHMARK_DIR / 'baseline.json'))
+    parser.add_argument('--update-baseline', action='store_true', help="Ölçümleri yeni referans olarak kaydet")
+    parser.add_argument('--repeat', type=int, default=3, help="Girdi başına koşu sayısı (en hızlısı alınır)")
+    parser.add_argument('--fps-tolerance', type=float, default=0.25, help="İzin verilen verim düşüşü (0.25 = %%25)")
+    parser.add_argument('--render-output', action='store_true', help="Çizimli çıktı videosu da üret")
+    parser.add_argument('--only', nargs='*', help="Sadece bu isimdeki girdileri çalıştır")
+    parser.add_argument('--output', help="Ölçümleri bu JSON dosyasına da yaz")
+    args = parser.parse_args(argv)
+
+    with open(args.corpus, encoding='utf-8') as f:
+        corpus = json.load(f)
+    if args.only:
+        corpus = [case for case in corpus if case['name'] in args.only]
+    ensure_corpus(corpus)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    # Referans güncellenirken sadece beklenen değerlerle karşılaştırılır
+    reference = {} if args.update_baseline else baseline
+
+    calibration = measure_calibration(args.repeat)
+    print(f" [i] Kalibrasyon: {calibration:.1f} tur/sn")
+
+    results = {}
+    failures = {}
+    for case in corpus:
+        name = case['name']
+        print(f"\n--- BENCHMARK: {name} ({case['exercise']}, {case['kind']}) ---")
+        current = measure(case, args.repeat, args.render_output, calibration)
+        results[name] = current
+        print(f"    -> {current['wall_seconds']:.3f} sn ({current['iterations']} tur), {current['fps']:.1f} kare/sn "
+              f"(göreli {current['relative_fps']:.3f}), "
+              f"tepe bellek {current['peak_rss_mb']:.0f} MB, {current['correct_reps']} doğru / {current['wrong_reps']} yanlış")
+        problems = compare(name, case, current, reference.get(name), args.fps_tolerance)
+        if name not in reference and not args.update_baseline:
+            problems.append("referansta kayıt yok: verim karşılaştırılamadı (--update-baseline ile üretin)")
+        if problems:
+            failures[name] = problems
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    print("\n--- ÖZET ---")
+    for name, current in results.items():
+        status = "HATA" if name in failures else "OK"
+        print(f" [{status}] {name}: {current['fps']:.1f} kare/sn, {current['peak_rss_mb']:.0f} MB, "
+              f"{current['correct_reps']}/{current['wrong_reps']}")
+        for problem in failures.get(name, []):
+            print(f"        - {problem}")
+
+    if args.update_baseline:
+        baseline.update(results)  # --only ile çalıştırılmayan girdilerin referansı korunur
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f" [i] Referans güncellendi: {args.baseline}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
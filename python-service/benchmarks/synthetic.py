@@ -0,0 +1,90 @@
+import cv2
+import numpy as np
+
+from analyzers.engine import PoseLandmark
+from analyzers.landmark_cache import LandmarkTrack
+
+REST_ANGLE = 170.0
+
+
+def angle_profile(spec, reps, fps=30.0, rep_seconds=2.0, rest_seconds=1.0, seed=0):
+    """
+    Tekrar dizisine ('deep' / 'shallow') karşılık gelen gürültülü eklem açısı serisi üretir.
+    deep tekrarlar depth_threshold altına iner (doğru), shallow tekrarlar aktif faza
+    girip derinliğe ulaşmadan döner (yanlış).
+    """
+    rng = np.random.default_rng(seed)
+    deep_angle = spec.depth_threshold - 15.0
+    shallow_angle = (spec.depth_threshold + spec.extend_threshold - spec.start_margin) / 2
+    rest = np.full(int(rest_seconds * fps), REST_ANGLE)
+
+    segments = [rest]
+    for kind in reps:
+        bottom = deep_angle if kind == 'deep' else shallow_angle
+        phase = np.linspace(0, 2 * np.pi, int(rep_seconds * fps))
+        segments.append(bottom + (REST_ANGLE - bottom) * (1 + np.cos(phase)) / 2)
+        segments.append(rest)
+    angles = np.concatenate(segments)
+    return angles + rng.normal(0, 1.5, len(angles))
+
+
+def synthetic_track(spec, reps, fps=30.0, gap_ratio=0.05, seed=0, noise=0.0, outlier_ratio=0.0, stride=1,
+                    moving='first'):
+    """
+    Açı serisini spec.joints üzerinde gerçekleyen bir LandmarkTrack üretir.
+    Eklem dışındaki landmark'lar NaN'dır (form kuralları tetiklenmez);
+    gap_ratio oranındaki karelerde iskelet yoktur.
+    noise: Açıya eklenen ek gürültü (derece, standart sapma).
+    outlier_ratio: Bu oranda karede hareketli eklem 30-60 derece sıçrar ve görünürlüğü düşer
+        (poz modelinin kısa süreli yanlış tespitleri).
+    stride: Her N karede bir poz tahmini yapılmış gibi işaretlenir (seyrek örnekleme).
+    moving: Köşe etrafında dönen eklem: 'first' (örn. squat'ta kalça, alt eklem sabit aşağıda)
+        veya 'last' (örn. curl'de bilek, üst eklem sabit yukarıda).
+    """
+    rng = np.random.default_rng(seed)
+    angles = angle_profile(spec, reps, fps, seed=seed)
+    angles = angles + rng.normal(0, noise, len(angles)) if noise else angles
+    outliers = rng.random(len(angles)) < outlier_ratio if outlier_ratio else np.zeros(len(angles), dtype=bool)
+    angles[outliers] += rng.choice((-1, 1), outliers.sum()) * rng.uniform(30, 60, outliers.sum())
+    angles = np.radians(angles)
+    first, vertex, last = spec.joints
+
+    landmarks = np.full((len(angles), 33, 4), np.nan, dtype=np.float32)
+    landmarks[:, PoseLandmark.NOSE] = (0.5, 0.2, 0.0, 1.0)
+    landmarks[:, vertex] = (0.5, 0.5, 0.0, 1.0)
+    if moving == 'last':
+        fixed, moving_joint, direction = first, last, -1.0
+    else:
+        fixed, moving_joint, direction = last, first, 1.0
+    landmarks[:, fixed] = (0.5, 0.5 + 0.25 * direction, 0.0, 1.0)
+    landmarks[:, moving_joint, 0] = 0.5 + 0.25 * np.sin(angles)
+    landmarks[:, moving_joint, 1] = 0.5 + 0.25 * direction * np.cos(angles)
+    landmarks[:, moving_joint, 2:] = (0.0, 1.0)
+    landmarks[outliers, moving_joint, 3] = 0.2
+
+    landmarks[rng.random(len(angles)) < gap_ratio] = np.nan
+    sampled = np.arange(len(angles)) % stride == 0
+    return LandmarkTrack(landmarks, sampled, fps)
+
+
+def synthetic_video(path, size=(1280, 720), frames=150, fps=30.0, seed=0):
+    """
+    Kişi içermeyen, hareketli desenli bir test videosu yazar.
+    Tekrar sayımı için değil; çözme + poz tahmini verimini ölçmek içindir.
+    """
+    rng = np.random.default_rng(seed)
+    width, height = size
+    noise = rng.integers(0, 64, (height, width, 3), dtype=np.uint8)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, size)
+    try:
+        for index in range(frames):
+            gradient = ((x + index * 4) % 256).astype(np.uint8)
+            frame = np.empty((height, width, 3), dtype=np.uint8)
+            frame[:] = gradient[None, :, None]
+            cv2.add(frame, noise, dst=frame)
+            writer.write(frame)
+    finally:
+        writer.release()
+
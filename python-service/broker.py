@@ -0,0 +1,113 @@
+import asyncio
+
+import pika
+from pika.adapters.asyncio_connection import AsyncioConnection
+
+
+class AsyncChannel:
+    """
+    pika'nın asyncio bağdaştırıcısı (AsyncioConnection) üzerinde tek kanallı RabbitMQ bağlantısı.
+
+    pika'nın geri çağrı (callback) tabanlı API'si await edilebilir hale getirilir.
+    Bağlantı olay döngüsünün (event loop) içinde çalışır: heartbeat'ler, mesaj alma,
+    ack / nack ve yayınlar aynı thread'de işlenir. Bu yüzden tüm metotlar döngü
+    thread'inden çağrılmalı ve döngüde bloklayan iş (ağ, disk, analiz) yapılmamalıdır.
+    """
+
+    def __init__(self, host):
+        self.host = host
+        self.connection = None
+        self.channel = None
+        self._closed = None
+        self._consumer_tag = None
+        self._waiting = set()   # Yanıtı beklenen kanal işlemleri (kanal kapanırsa hata alır)
+
+    async def connect(self):
+        """Bağlantıyı ve kanalı açar; bağlanılamazsa AMQPConnectionError fırlatır."""
+        loop = asyncio.get_running_loop()
+        opened = loop.create_future()
+        self._closed = loop.create_future()
+
+        def on_close(connection, reason):
+            if not opened.done():
+                opened.set_exception(pika.exceptions.AMQPConnectionError(str(reason) or type(reason).__name__))
+            self._fail_waiting(reason)
+            if not self._closed.done():
+                self._closed.set_result(reason)
+
+        self.connection = AsyncioConnection(
+            pika.ConnectionParameters(host=self.host),
+            on_open_callback=lambda connection: opened.done() or opened.set_result(connection),
+            on_open_error_callback=on_close,
+            on_close_callback=on_close,
+            custom_ioloop=loop,
+        )
+        await opened
+        self.channel = await self._call(self.connection.channel, callback_name='on_open_callback')
+        self.channel.add_on_close_callback(self._on_channel_closed)
+
+    def _on_channel_closed(self, channel, reason):
+        # Kanal hatası (örn. kuyruk farklı ayarlarla tanımlı): bağlantıyı da kapat
+        print(f" [!] RabbitMQ kanalı kapandı: {reason}")
+        self._fail_waiting(reason)
+        if self.connection.is_open:
+            self.connection.close()
+
+    def _fail_waiting(self, reason):
+        for future in list(self._waiting):
+            if not future.done():
+                future.set_exception(pika.exceptions.AMQPChannelError(reason))
+        self._waiting.clear()
+
+    def _call(self, method, *args, callback_name='callback', **kwargs):
+        """pika metodunu çağırır; geri çağrının argümanıyla tamamlanan bir future döner."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.add(future)
+        future.add_done_callback(self._waiting.discard)
+        kwargs[callback_name] = lambda result: future.done() or future.set_result(result)
+        method(*args, **kwargs)
+        return future
+
+    async def queue_declare(self, queue, durable=False):
+        await self._call(self.channel.queue_declare, queue=queue, durable=durable)
+
+    async def basic_qos(self, prefetch_count):
+        await self._call(self.channel.basic_qos, prefetch_count=prefetch_count)
+
+    def basic_consume(self, queue, on_message):
+        """on_message(channel, method, properties, body) döngü thread'inde çağrılır."""
+        self._consumer_tag = self.channel.basic_consume(queue=queue, on_message_callback=on_message)
+        return self._consumer_tag
+
+    async def cancel(self):
+        """Mesaj almayı bırakır (alınmış ama onaylanmamış mesajlar kanalda kalır)."""
+        if self._consumer_tag is not None and self.is_open:
+            await self._call(self.channel.basic_cancel, self._consumer_tag)
+            self._consumer_tag = None
+
+    @property
+    def is_open(self):
+        return self.channel is not None and self.channel.is_open
+
+    def ack(self, delivery_tag):
+        # Kanal kapandıysa mesaj zaten RabbitMQ tarafından yeniden teslim edilecek
+        if self.is_open:
+            self.channel.basic_ack(delivery_tag=delivery_tag)
+
+    def nack(self, delivery_tag, requeue=True):
+        if self.is_open:
+            self.channel.basic_nack(delivery_tag=delivery_tag, requeue=requeue)
+
+    def publish(self, routing_key, body, properties=None, exchange=''):
+        self.channel.basic_publish(exchange=exchange, routing_key=routing_key, body=body, properties=properties)
+
+    async def closed(self):
+        """Bağlantı kapanana kadar bekler; kapanma nedenini döner."""
+        return await asyncio.shield(self._closed)
+
+    async def close(self):
+        """Bağlantıyı kapatır ve kapanmasını bekler."""
+        if self.connection is not None and not (self.connection.is_closing or self.connection.is_closed):
+            self.connection.close()
+        if self._closed is not None:
+            await self.closed()
@@ -1,12 +1,35 @@
+import asyncio
 import pika
+import dataclasses
+import functools
 import json
+import multiprocessing
+import signal
 import sys
-import requests
 import os 
+import threading
+import time
+import requests
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
+from urllib3.util.retry import Retry
 
-# SADECE UZMANLARI VE YARDIMCILARI IMPORT ET
-from analyzers import squat_analyzer, pushup_analyzer, barbell_curl_analyzer
+# Analizci modülleri (cv2, mediapipe) burada import EDİLMEZ: kayıt defteri (registry)
+# onları ilk işte veya bağlantı kurulduktan sonra arka planda yükler.
+from analyzers import registry
+from analyzers.checkpoint import CheckpointStore, Interrupted, set_interrupt_event
+from analyzers.download_cache import DownloadCache
+from analyzers.landmark_cache import LandmarkCache, track_key
+from analyzers.options import AnalysisOptions, PoseConfig, SmoothingConfig
+from analyzers.probe import probe_video
+from analyzers.sources import local_path, parse_mounts
+from broker import AsyncChannel
+from delivery import ResultDelivery
+from job_store import COMPLETED, IN_FLIGHT, JobStore, message_fingerprint
+from metrics import JOBS, QUEUE_LAG, record_job, set_health, start_metrics_server
+from scheduler import LONG, SHORT, Job, LaneScheduler, LoopExecutor, estimate_cost
 # 'video_processor' import'u kaldırıldı
 
 # .env dosyasındaki değişkenleri yükle
@@ -33,104 +56,796 @@ if missing_vars:
 
 BACKEND_URL = f"http://{BACKEND_HOST}:{BACKEND_PORT}{BACKEND_RESULTS_PATH}"
 
+# --- OPSİYONEL AYARLAR ---
+def env_flag(name, default):
+    """'1' / 'true' / 'yes' değerlerini True kabul eden .env okuyucusu."""
+    return os.getenv(name, default).lower() in ('1', 'true', 'yes')
+
+ANALYSIS_OPTIONS = AnalysisOptions(
+    # Önizleme (gerçek zamanlı pencere + waitKey beklemesi) sadece hata ayıklama içindir.
+    # Varsayılan: başsız (headless) mod, kareler beklemeden işlenir.
+    preview=env_flag('ANALYSIS_PREVIEW', 'false'),
+    # Okuma / poz tahmini / yazma aşamalarını thread'lerde örtüştür
+    pipelined=env_flag('ANALYSIS_PIPELINED', 'true'),
+    # Poz tahmini hızı: sabit adım ve/veya azami analiz FPS'i
+    frame_stride=int(os.getenv('ANALYSIS_FRAME_STRIDE', '1')),
+    max_analysis_fps=float(os.getenv('ANALYSIS_MAX_FPS')) if os.getenv('ANALYSIS_MAX_FPS') else None,
+    # Eşik geçişlerine yakınken her kareyi analiz et
+    adaptive_sampling=env_flag('ANALYSIS_ADAPTIVE_SAMPLING', 'false'),
+    # Videoyu indirme bitmeden (URL'den akış olarak) çözmeye başla
+    streaming=env_flag('ANALYSIS_STREAMING', 'true'),
+    # Tekrar kuyruğa giren videolar için kare landmark önbelleği (boyut sınırlı LRU)
+    landmark_cache=LandmarkCache(
+        os.getenv('LANDMARK_CACHE_DIR', 'landmark_cache'),
+        int(os.getenv('LANDMARK_CACHE_MAX_MB', '512')) * 1024 * 1024
+    ) if env_flag('LANDMARK_CACHE', 'true') else None,
+    # HTTP'den indirilen videoların disk önbelleği (ETag/boyut doğrulamalı, boyut sınırlı LRU)
+    download_cache=DownloadCache(
+        os.getenv('DOWNLOAD_CACHE_DIR', 'download_cache'),
+        int(os.getenv('DOWNLOAD_CACHE_MAX_MB', '2048')) * 1024 * 1024,
+        max_age=float(os.getenv('DOWNLOAD_CACHE_MAX_AGE', '3600')),
+    ) if env_flag('DOWNLOAD_CACHE', 'true') else None,
+    # Paylaşılan klasörden okunacak URL önekleri: 'önek=klasör;önek2=klasör2' (örn. MinIO verisi)
+    video_mounts=parse_mounts(os.getenv('VIDEO_MOUNTS', '')),
+    # file:// ve mutlak yollu mesajlar doğrudan açılsın mı (sadece yerel geliştirme; kuyruğa yazan
+    # herkes makinedeki dosyaları okutabilir). Serviste yerel klasörler VIDEO_MOUNTS ile verilir.
+    allow_local_files=env_flag('ALLOW_LOCAL_VIDEO_FILES', 'false'),
+    # Kapanışta yarıda kalan analizlerin kontrol noktaları (başka pod'da devam için paylaşılan disk olmalı)
+    checkpoints=CheckpointStore(os.getenv('CHECKPOINT_DIR', 'checkpoints')) if env_flag('CHECKPOINTS', 'true') else None,
+    # Çizimli çıktı videosu: mesajda 'renderOutput' yoksa bu varsayılan kullanılır
+    render_output=env_flag('ANALYSIS_RENDER_OUTPUT', 'false'),
+    render_scale=float(os.getenv('ANALYSIS_RENDER_SCALE', '0.5')),
+    # Poz tahmini öncesi karenin uzun kenarı (piksel, 0: küçültme yok)
+    inference_max_side=int(os.getenv('ANALYSIS_INFERENCE_MAX_SIDE', '640')) or None,
+    # Poz modeli: işçi başlarken bir kez yüklenir ve işler arasında yeniden kullanılır
+    pose_config=PoseConfig(
+        model_complexity=int(os.getenv('POSE_MODEL_COMPLEXITY', '1')),
+        min_detection_confidence=float(os.getenv('POSE_MIN_DETECTION_CONFIDENCE', '0.5')),
+        min_tracking_confidence=float(os.getenv('POSE_MIN_TRACKING_CONFIDENCE', '0.5')),
+    ),
+    # Poz tahmini ile sayım arasındaki One-Euro landmark filtresi (görünürlük ağırlıklı)
+    smoothing=SmoothingConfig(
+        min_cutoff=float(os.getenv('SMOOTHING_MIN_CUTOFF', '1.0')),
+        beta=float(os.getenv('SMOOTHING_BETA', '8.0')),
+        max_gap_seconds=float(os.getenv('SMOOTHING_MAX_GAP_SECONDS', '0.5')),
+    ) if env_flag('LANDMARK_SMOOTHING', 'true') else None,
+    # İşçi başına bellek (RSS) bütçesi (MB, boş: sınırsız); aşılırsa kare havuzu ve çözünürlük düşer
+    memory_budget_mb=int(os.getenv('MEMORY_BUDGET_MB')) if os.getenv('MEMORY_BUDGET_MB') else None,
+)
+
+# Aynı anda analiz edilecek video sayısı (işçi süreci). Prefetch de buna eşitlenir.
+WORKER_COUNT = int(os.getenv('WORKER_COUNT', os.cpu_count() or 1))
+
+# Kısa / uzun iş şeritleri: tahmini süresi (video süresi x CPU ağırlığı) bu değeri aşan işler
+# uzun şeride girer. SHORT_RESERVED_WORKERS işçi sadece kısa işlere ayrılır. Kuyruktaki kısa
+# işlerin uzun olanların arkasında kalmaması için prefetch işçi sayısından büyük tutulur.
+SHORT_JOB_MAX_SECONDS = float(os.getenv('SHORT_JOB_MAX_SECONDS', '30'))
+SHORT_RESERVED_WORKERS = int(os.getenv('SHORT_RESERVED_WORKERS', '1' if WORKER_COUNT > 1 else '0'))
+PREFETCH_COUNT = int(os.getenv('PREFETCH_COUNT', str(WORKER_COUNT * 4)))
+
+# Uzun videolar en az SEGMENT_MIN_SECONDS uzunluğunda parçalara bölünüp paralel analiz edilir
+# (0: kapalı). Her parça bir öncekinin son SEGMENT_OVERLAP_SECONDS'ını ısınma için yeniden işler.
+SEGMENT_MIN_SECONDS = float(os.getenv('SEGMENT_MIN_SECONDS', '20'))
+SEGMENT_OVERLAP_SECONDS = float(os.getenv('SEGMENT_OVERLAP_SECONDS', '2'))
+
+# Sistemde kullanılabilir bellek MEMORY_RESERVE_MB'nin altındaysa yeni iş başlatılmaz
+# (çalışan iş yoksa yine de bir iş başlar). Varsayılan: işçi bellek bütçesi.
+MEMORY_RESERVE_MB = int(os.getenv('MEMORY_RESERVE_MB', str(ANALYSIS_OPTIONS.memory_budget_mb or 0)))
+
+# Bağlantı kurulunca işçileri başlatıp analizcileri ve poz modelini arka planda yükle.
+# Kapalıysa her analizci, o hareketin ilk işi geldiğinde yüklenir.
+ANALYZER_WARM_UP = env_flag('ANALYZER_WARM_UP', 'true')
+
+# Sonuç teslimatı: teslim edilemeyen sonuçların bekletildiği klasör ve toplu gönderim boyutu
+RESULT_OUTBOX_DIR = os.getenv('RESULT_OUTBOX_DIR', 'result_outbox')
+RESULT_BATCH_SIZE = int(os.getenv('RESULT_BATCH_SIZE', '1'))
+RESULT_POST_CONCURRENCY = int(os.getenv('RESULT_POST_CONCURRENCY', '4'))
+
+# Olay döngüsünü bloklamaması için thread'lerde yapılan I/O: video bilgisi (Range isteği),
+# iş deposu ve outbox yazımı IO_CONCURRENCY thread'inde; şeritte bekleyen işlerin videoları
+# (indirme önbelleği açıksa) DOWNLOAD_CONCURRENCY thread'inde önceden indirilir.
+IO_CONCURRENCY = int(os.getenv('IO_CONCURRENCY', '8'))
+DOWNLOAD_CONCURRENCY = int(os.getenv('DOWNLOAD_CONCURRENCY', '4'))
+DOWNLOAD_PREFETCH = env_flag('DOWNLOAD_PREFETCH', 'true')
+
+# İş durumu deposu (SQLite): tamamlanan işler yeniden gelirse analiz tekrar çalışmaz.
+# Başarısız işler JOB_MAX_ATTEMPTS denemeye kadar kuyruğa geri bırakılır, sonra
+# DEAD_LETTER_QUEUE'ya gönderilir. Kayıtlar JOB_STORE_RETENTION_DAYS gün saklanır.
+JOB_STORE_PATH = os.getenv('JOB_STORE_PATH', 'job_state.sqlite3')
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+# Başarısız iş hemen değil JOB_RETRY_DELAY_SECONDS * 2^(deneme-1) sn sonra (en fazla
+# JOB_RETRY_MAX_DELAY_SECONDS) kuyruğa geri bırakılır: geçici bir arıza (örn. video sunucusu)
+# deneme haklarını saniyeler içinde tüketmesin. Beklerken mesaj bir prefetch yerini tutar.
+JOB_RETRY_DELAY_SECONDS = float(os.getenv('JOB_RETRY_DELAY_SECONDS', '10'))
+JOB_RETRY_MAX_DELAY_SECONDS = float(os.getenv('JOB_RETRY_MAX_DELAY_SECONDS', '120'))
+JOB_STORE_RETENTION_DAYS = float(os.getenv('JOB_STORE_RETENTION_DAYS', '30'))
+DEAD_LETTER_QUEUE = os.getenv('DEAD_LETTER_QUEUE', f"{QUEUE_NAME}_dead_letter")
+
+# Kapanış (SIGTERM / CTRL+C): yeni mesaj alınmaz, bekleyen işler kuyruğa geri bırakılır ve
+# çalışan işler DRAIN_TIMEOUT_SECONDS beklenir. Bitmeyen analizler ilerlemelerini kontrol
+# noktasına kaydeder (en fazla CHECKPOINT_TIMEOUT_SECONDS), mesajları kuyruğa geri bırakılır ve
+# iş yeniden geldiğinde kaldığı kareden devam eder. Toplam süre pod'un
+# terminationGracePeriodSeconds değerinden (varsayılan 30 sn) kısa olmalıdır.
+DRAIN_TIMEOUT_SECONDS = float(os.getenv('DRAIN_TIMEOUT_SECONDS', '20'))
+CHECKPOINT_TIMEOUT_SECONDS = float(os.getenv('CHECKPOINT_TIMEOUT_SECONDS', '8'))
+CHECKPOINT_RETENTION_HOURS = float(os.getenv('CHECKPOINT_RETENTION_HOURS', '24'))
+
+# Prometheus metrik ve /ready, /healthz uç noktalarının portu (0: kapalı)
+# ve iş başına JSON zamanlama raporlarının klasörü (boş: kapalı)
+METRICS_PORT = int(os.getenv('METRICS_PORT', '9100'))
+TIMING_REPORT_DIR = os.getenv('TIMING_REPORT_DIR')
+
+
+def process_job(video_id, video_url, exercise_name, render_output=None):
+    """
+    Tek bir analiz işini çalıştırır ve sonucu döner.
+    İşçi (worker) süreçlerinde çalışır; hata olursa hata sonucu döner.
+    render_output None değilse, bu iş için çizimli çıktı ayarını ezer.
+    """
+    try:
+        entry = registry.lookup(exercise_name)
+        options = ANALYSIS_OPTIONS
+        if render_output is not None:
+            options = dataclasses.replace(options, render_output=bool(render_output))
+        if entry is not None and entry.needs_video_output:
+            options = dataclasses.replace(options, render_output=True)
+        print(f" [>] Uzman analizci çağrılıyor: {exercise_name} (Video ID: {video_id}, PID: {os.getpid()})")
+
+        if entry is not None:
+            # Uzmana URL'i VE video_id'yi gönderiyoruz
+            analysis_result = registry.run(entry, video_url=video_url, video_id=video_id, options=options)
+            analysis_result["analyzer_version"] = f"{entry.name}@{entry.version}"
+        else:
+            print(f" [!] UYARI: '{exercise_name}' için bir analizci bulunamadı.")
+            analysis_result = {
+                "correct_reps": 0, "wrong_reps": 0,
+                "feedback": f"'{exercise_name}' hareketi için analiz modülü henüz eklenmemiş."
+            }
+
+        timings = analysis_result.get("timings", {})
+        print(f" [>] Analiz tamamlandı. Sonuç: {analysis_result.get('correct_reps')} doğru, "
+              f"{analysis_result.get('wrong_reps')} yanlış ({timings.get('total_seconds', 0):.2f} sn, "
+              f"tepe RSS {timings.get('peak_rss_mb', 0)} MB)")
+        return analysis_result
+
+    except Interrupted as e:
+        # Süreç kapanıyor: ilerleme (varsa) kaydedildi, mesaj kuyruğa geri bırakılacak
+        print(f" [↺] {e}")
+        return {"feedback": str(e), "correct_reps": 0, "wrong_reps": 0, "interrupted": True}
+    except Exception as e:
+        print(f" [!] İşlem sırasında beklenmedik bir hata oluştu: {e}")
+        return {"feedback": f"Analiz hatası: {e}", "correct_reps": 0, "wrong_reps": 0, "failed": True}
+
+
+def process_segment(video_url, exercise_name, start_seconds, end_seconds):
+    """Uzun videonun bir parçasının landmark izini çıkarır (işçi sürecinde)."""
+    from analyzers.engine import analyze_segment
+    end_text = f"{end_seconds:.1f}" if end_seconds is not None else "son"
+    print(f" [>] Parça analizi: {exercise_name} {start_seconds:.1f} - {end_text} sn (PID: {os.getpid()})")
+    spec = registry.load_spec(registry.lookup(exercise_name))
+    return analyze_segment(video_url, spec, ANALYSIS_OPTIONS, start_seconds, end_seconds, SEGMENT_OVERLAP_SECONDS)
+
+
+def finish_segments(video_id, video_url, exercise_name, segments):
+    """
+    Parça izlerini birleştirip puanlar ve process_job ile aynı biçimde sonucu döner.
+    Birleştirilemezse (örn. CAP_PROP_POS_FRAMES yanlış konumlandı, değişken kare hızlı
+    videoda bir parça erken bitti) hata fırlatır: video bütün olarak yeniden analiz edilir.
+    """
+    from analyzers.engine import analyze_segmented
+    entry = registry.lookup(exercise_name)
+    analysis_result = analyze_segmented(video_url, segments, registry.load_spec(entry), ANALYSIS_OPTIONS)
+    analysis_result["analyzer_version"] = f"{entry.name}@{entry.version}"
+    print(f" [>] Parçalı analiz tamamlandı ({len(segments)} parça). Sonuç: {analysis_result['correct_reps']} doğru, "
+          f"{analysis_result['wrong_reps']} yanlış")
+    return analysis_result
+
 
-def send_results_to_backend(video_id, result):
-    """Analiz sonucunu Spring Boot API'sine POST eder."""
-    payload = {
-        "videoId": video_id,
-        "correctReps": result.get("correct_reps", 0),
-        "wrongReps": result.get("wrong_reps", 0),
-        "feedback": result.get("feedback", "Analiz sırasında hata oluştu.")
+def segment_count(entry, info, message_data, scheduler, track_cached=False):
+    """
+    Video kaç parçada paralel analiz edilmeli (1: parçalama yok).
+    track_cached: Videonun landmark izi önbellekte mi (disk kontrolü çağıran tarafından I/O thread'inde yapılır).
+    """
+    render_output = message_data.get('renderOutput')
+    if render_output is None:
+        render_output = ANALYSIS_OPTIONS.render_output
+    if (SEGMENT_MIN_SECONDS <= 0 or entry is None or entry.spec is None or info.duration_seconds is None
+            or render_output or entry.needs_video_output or ANALYSIS_OPTIONS.preview):
+        return 1  # Çizimli çıktı tek bir VideoWriter'a sırayla yazılmalı
+    if track_cached:
+        return 1  # İz önbellekte: video zaten çözülmeyecek
+    return max(1, min(scheduler.long_capacity, int(info.duration_seconds // SEGMENT_MIN_SECONDS)))
+
+
+def schedule_segments(scheduler, message_data, duration, count, on_done):
+    """
+    Videoyu 'count' eşit parçaya böler; parçalar uzun şeritte paralel çalışır.
+    Hepsi bitince birleştirme işi gönderilir. Bir parça başarısız olursa veya parçalar
+    birleştirilemezse video bütün olarak (parçalamadan) yeniden analiz edilir; aksi halde
+    yeniden deneme videoyu aynı şekilde bölüp aynı hatayı alırdı.
+    """
+    video_id = message_data['videoId']
+    video_url = message_data['videoUrl']
+    exercise_name = message_data['exerciseName']
+    length = duration / count
+    bounds = [(index * length, (index + 1) * length if index < count - 1 else None) for index in range(count)]
+    futures = [None] * count
+    remaining = [count]
+    lock = threading.Lock()
+
+    def analyze_whole():
+        scheduler.submit(Job(
+            process_job, (video_id, video_url, exercise_name, message_data.get('renderOutput')),
+            on_done, lane=LONG, cost_seconds=duration
+        ))
+
+    def stitched(future):
+        if not future.cancelled() and future.exception() is not None \
+                and not isinstance(future.exception(), Interrupted):
+            print(f" [!] Video ID {video_id} parçaları birleştirilemedi ({future.exception()}), "
+                  f"video bütün olarak analiz ediliyor.")
+            analyze_whole()
+        else:
+            on_done(future)
+
+    def segment_done(index, future):
+        futures[index] = future
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        stopped = [future for future in futures if future.cancelled() or isinstance(future.exception(), Interrupted)]
+        if stopped:
+            on_done(stopped[0])  # Süreç kapanıyor: iş kuyruğa geri bırakılır
+            return
+        errors = [future.exception() for future in futures if future.exception() is not None]
+        if errors:
+            print(f" [!] Video ID {video_id} parça analizi başarısız ({errors[0]}), video bütün olarak analiz ediliyor.")
+            analyze_whole()
+        else:
+            scheduler.submit(Job(
+                finish_segments, (video_id, video_url, exercise_name, [future.result() for future in futures]),
+                stitched, lane=SHORT
+            ))
+
+    print(f" [i] Video ID {video_id}: {count} parçada paralel analiz edilecek ({length:.1f} sn / parça).")
+    for index, (start_seconds, end_seconds) in enumerate(bounds):
+        scheduler.submit(Job(
+            process_segment, (video_url, exercise_name, start_seconds, end_seconds),
+            functools.partial(segment_done, index), lane=LONG, cost_seconds=length
+        ))
+
+
+def init_worker(interrupt, pose_config=None, warmed=None):
+    """
+    İşçi süreci başlangıcı (executor initializer).
+    CTRL+C / SIGTERM işçiyi analizin ortasında öldürmez: kapanışı ana süreç yönetir ve
+    gerekirse 'interrupt' olayıyla ilerlemenin kaydedilip analizin durmasını ister.
+    warmed verilirse analizciler ve poz modeli önceden yüklenir (bkz. warm_up_worker).
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    set_interrupt_event(interrupt)
+    if warmed is not None:
+        warm_up_worker(pose_config, warmed)
+
+
+def warm_up_worker(pose_config, warmed):
+    """
+    İşçi süreci başlarken analizci modüllerini ve poz modelini yükler (executor initializer).
+    Bitince 'warmed' semaforunu bir artırır.
+    """
+    try:
+        registry.load_all()
+        from analyzers.pose_pool import warm_up_pose_models
+        warm_up_pose_models(pose_config)
+    except Exception as e:
+        # Isınma başarısız olsa da işçi çalışır: modüller ilk işte yeniden denenir
+        print(f" [!] İşçi ısınması başarısız: {e}")
+    finally:
+        warmed.release()
+
+
+def worker_ready():
+    return os.getpid()
+
+
+def warm_up_workers(executor, warmed, timeout=300):
+    """
+    Tüm işçi süreçlerini başlatır (her biri açılışta warm_up_worker çalıştırır),
+    hepsi ısınınca hazır sinyalini 'warm' olarak işaretler. Arka plan thread'inde
+    çalışır; bu sırada ana thread mesaj almaya devam eder.
+    """
+    start_time = time.perf_counter()
+    # spawn bağlamında işçiler talep üzerine açılır: her gönderim yeni bir süreç başlatır
+    for _ in range(WORKER_COUNT):
+        executor.submit(worker_ready)
+    for _ in range(WORKER_COUNT):
+        if not warmed.acquire(timeout=timeout):
+            print(f" [!] İşçi ısınması {timeout} sn içinde bitmedi.")
+            return
+    set_health(warm=True)
+    print(f" [*] {WORKER_COUNT} işçi süreci ısındı ({time.perf_counter() - start_time:.2f} sn).")
+
+
+def write_timing_report(video_id, exercise_name, result, queue_lag):
+    """İşin aşama sürelerini TIMING_REPORT_DIR/<video_id>.json dosyasına yazar."""
+    os.makedirs(TIMING_REPORT_DIR, exist_ok=True)
+    report = {
+        "video_id": video_id,
+        "exercise": exercise_name,
+        "analyzer_version": result.get("analyzer_version"),
+        "queue_lag_seconds": round(queue_lag, 3),
+        "frame_count": result.get("frame_count"),
+        "analyzed_frames": result.get("analyzed_frames"),
+        "rep_confidence": result.get("rep_confidence"),
+        "timings": result.get("timings"),
     }
+    with open(os.path.join(TIMING_REPORT_DIR, f"{video_id}.json"), 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def analyzer_version(exercise_name):
+    """Hareketin analizci sürümü ('ad@sürüm'); iş parmak izine girer."""
+    entry = registry.lookup(exercise_name)
+    return f"{entry.name}@{entry.version}" if entry else None
+
+
+def dead_letter(amqp, delivery_tag, body, reason, attempts=0):
+    """
+    Mesajı ölü mektup kuyruğuna yayınlar ve orijinalini onaylar (döngü thread'inde çağrılır).
+    Kuyruk backend tarafından argümansız tanımlandığı için (x-dead-letter-exchange yok)
+    mesaj nack ile değil, açıkça yeniden yayınlanarak taşınır; neden başlıklarda saklanır.
+    """
+    if not amqp.is_open:
+        return  # Kanal kapandı: mesaj RabbitMQ tarafından yeniden teslim edilecek
+    amqp.publish(
+        routing_key=DEAD_LETTER_QUEUE,
+        body=body,
+        properties=pika.BasicProperties(
+            content_type='application/json',
+            delivery_mode=2,
+            timestamp=int(time.time()),
+            headers={"x-original-queue": QUEUE_NAME, "x-attempts": attempts, "x-reason": str(reason)[:500]},
+        )
+    )
+    amqp.ack(delivery_tag)
+
+
+# settle_result sonuçları: mesaja ne yapılacağı
+RETRY = "retry"               # Başarısız, deneme hakkı var: kuyruğa geri bırak
+REQUEUE = "requeue"           # Sonuç kaydedilemedi: deneme saymadan kuyruğa geri bırak
+DEAD_LETTER = "dead_letter"   # Deneme hakkı bitti: hata sonucu teslim edildi, ölü mektuba taşı
+ACK = "ack"
+
+
+def settle_result(video_id, result, delivery, store, fingerprint, attempts):
+    """
+    Sonucu kalıcı hale getirir (outbox, iş deposu) ve mesaja ne yapılacağını döner.
+    Disk yazdığı (fsync, SQLite) için I/O thread'inde çalışır.
+    """
+    failed = result.get("failed", False)
+    if failed and store is not None and attempts < JOB_MAX_ATTEMPTS:
+        store.fail(video_id, fingerprint, result.get("feedback"))
+        return RETRY
     try:
-        response = requests.post(BACKEND_URL, json=payload) 
-        if response.status_code == 200:
-            print(f" [i] Video ID {video_id} için sonuçlar backend'e başarıyla gönderildi.")
+        delivery.submit(video_id, result)
+    except OSError as e:
+        # Sonuç diske yazılamadı: mesajı kuyruğa geri bırak (deneme sayılmaz)
+        print(f" [!] Video ID {video_id} sonucu outbox'a yazılamadı: {e}")
+        if store is not None:
+            store.release(video_id, fingerprint)
+        return REQUEUE
+    if failed and store is not None:
+        store.fail(video_id, fingerprint, result.get("feedback"), dead=True)
+        return DEAD_LETTER
+    if store is not None:
+        store.complete(video_id, fingerprint, result)
+    return ACK
+
+
+def ack_when_done(amqp, io, delivery_tag, video_id, exercise_name, published_at, delivery, lane=SHORT,
+                  body=None, store=None, fingerprint=None, attempts=1):
+    """
+    İş bittiğinde sonucu teslimata veren ve mesajı onaylayan (ack) future callback'ini üretir.
+    Sonuç önce outbox'a kalıcı yazılır, iş deposunda tamamlandı olarak işaretlenir, sonra
+    ack edilir: backend kapalı olsa bile kaybolmaz, mesaj yeniden gelirse analiz tekrarlanmaz.
+    Başarısız işler (store varsa) JOB_MAX_ATTEMPTS denemeye kadar kuyruğa geri bırakılır;
+    son denemede hata sonucu backend'e gönderilir ve mesaj ölü mektup kuyruğuna taşınır.
+    Callback döngü thread'inde çalışır: disk işleri 'io' havuzunda beklenir, ack / nack
+    doğrudan kanala yapılır.
+    published_at: mesajın yayınlanma zamanı (epoch sn); kuyruk gecikmesi buna göre ölçülür.
+    """
+    async def finish(future):
+        loop = asyncio.get_running_loop()
+        if future.cancelled() or isinstance(future.exception(), Interrupted):
+            result = {"interrupted": True}  # Başlamadan iptal edildi / parça yarıda kaldı
+        elif future.exception() is not None:
+            # İşçi süreci çöktü (örn. BrokenProcessPool)
+            print(f" [!] Video ID {video_id} işçi sürecinde çöktü: {future.exception()}")
+            result = {"feedback": f"Analiz hatası: {future.exception()}", "correct_reps": 0, "wrong_reps": 0, "failed": True}
         else:
-            print(f" [!] Backend hatası! Video ID: {video_id}, Durum: {response.status_code}, Yanıt: {response.text}")
-    except requests.exceptions.ConnectionError:
-        print(f" [!] Backend'e bağlanılamadı! ({BACKEND_URL}) Spring Boot çalışıyor mu?")
+            result = future.result()
 
+        entry = registry.lookup(exercise_name)
+        exercise = entry.name if entry else "unknown"
+        if result.get("interrupted"):
+            # Süreç kapanıyor: deneme sayılmadan kuyruğa geri bırakılır; iş yeniden
+            # geldiğinde (bu veya başka bir süreçte) varsa kontrol noktasından devam eder
+            if store is not None:
+                await loop.run_in_executor(io, store.release, video_id, fingerprint)
+            print(f" [↺] Video ID {video_id} bitirilemedi, kuyruğa geri bırakılıyor.")
+            JOBS.inc(exercise=exercise, status="interrupted")
+            amqp.nack(delivery_tag, requeue=True)
+            return
+        action = await loop.run_in_executor(io, settle_result, video_id, result, delivery, store, fingerprint, attempts)
+        if action == RETRY:
+            delay = retry_delay(attempts)
+            print(f" [!] Video ID {video_id} başarısız (deneme {attempts}/{JOB_MAX_ATTEMPTS}), "
+                  f"{delay:.0f} sn sonra kuyruğa geri bırakılacak.")
+            JOBS.inc(exercise=exercise, status="retried")
+            requeue_later(amqp, delivery_tag, delay)
+            return
+        if action == REQUEUE:
+            JOBS.inc(exercise=exercise, status="requeued")
+            amqp.nack(delivery_tag, requeue=True)
+            return
+        if action == DEAD_LETTER:
+            print(f" [✗] Video ID {video_id} {attempts} denemede analiz edilemedi, ölü mektup kuyruğuna gönderildi.")
+            record_job(exercise, result, status="dead_lettered")
+            dead_letter(amqp, delivery_tag, body, result.get("feedback"), attempts)
+        else:
+            record_job(exercise, result, status="failed" if result.get("failed") else "ok")
+            amqp.ack(delivery_tag)
+            print(f" [✓] Video ID {video_id} işlendi ve kuyruktan silindi.")
+
+        queue_lag = max(0.0, time.time() - published_at)
+        QUEUE_LAG.observe(queue_lag, exercise=exercise, lane=lane)
+        if TIMING_REPORT_DIR:
+            try:
+                await loop.run_in_executor(io, write_timing_report, video_id, exercise_name, result, queue_lag)
+            except OSError as e:
+                print(f" [!] Zamanlama raporu yazılamadı: {e}")
+
+    return lambda future: spawn(finish(future))
+
+
+def retry_delay(attempts):
+    """Başarısız denemeden sonra mesajın kuyruğa geri bırakılmadan önce bekleyeceği süre (üstel)."""
+    return min(JOB_RETRY_MAX_DELAY_SECONDS, JOB_RETRY_DELAY_SECONDS * 2 ** max(0, attempts - 1))
+
+
+_delayed_requeues = {}  # delivery_tag -> (zamanlayıcı, kuyruğa bırakma fonksiyonu)
+
+
+def requeue_later(amqp, delivery_tag, delay):
+    """Mesajı 'delay' sn sonra kuyruğa geri bırakır (nack); o zamana kadar kanalda onaysız kalır."""
+    def requeue():
+        _delayed_requeues.pop(delivery_tag, None)
+        amqp.nack(delivery_tag, requeue=True)
+
+    if delay <= 0:
+        requeue()
+        return
+    _delayed_requeues[delivery_tag] = (asyncio.get_running_loop().call_later(delay, requeue), requeue)
+
+
+def flush_delayed_requeues():
+    """Kapanışta bekleyen yeniden denemeleri beklemeden kuyruğa geri bırakır."""
+    for timer, requeue in list(_delayed_requeues.values()):
+        timer.cancel()
+        requeue()
+
+
+_background = set()
+
+
+def spawn(coroutine):
+    """Görevi arka planda başlatır (referansı tutulur, yoksa çöp toplayıcı görevi silebilir)."""
+    task = asyncio.ensure_future(coroutine)
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+    return task
+
+
+# Kapanışta süren önceden indirmeleri yarıda keser
+PREFETCH_CANCEL = threading.Event()
+
+
+def prefetch_video(video_url, session):
+    """
+    Şeritte bekleyen işin videosunu indirme önbelleğine indirir (indirme thread'inde).
+    İşçi işi aldığında video diskten açılır; böylece işçiler (çekirdekler) analizle
+    meşgulken sıradaki videoların indirmesi paralel ilerler.
+    """
+    cache = ANALYSIS_OPTIONS.download_cache
+    try:
+        # İşçi indirme bitmeden başlarsa akış açmak yerine bu indirmeyi bekler (dosya kilidi)
+        cache.mark_seen(video_url)
+        cache.fetch(video_url, session, cancel=PREFETCH_CANCEL)
+    except Exception as e:
+        print(f" [!] Video önceden indirilemedi ({type(e).__name__}: {e}); işçi videoyu kendisi açacak.")
+
+
+async def should_prefetch(video_url, scheduler, io):
+    """
+    Video önceden indirilmeli mi: önbellek açık, HTTP videosu, paylaşılan klasörde değil ve
+    işler şeritte bekliyor. Klasör kontrolü diske baktığı için 'io' havuzunda yapılır.
+    """
+    if not DOWNLOAD_PREFETCH or ANALYSIS_OPTIONS.download_cache is None:
+        return False
+    if urlparse(video_url).scheme not in ('http', 'https') or not any(scheduler.waiting().values()):
+        return False
+    path = await asyncio.get_running_loop().run_in_executor(
+        io, local_path, video_url, ANALYSIS_OPTIONS.video_mounts, ANALYSIS_OPTIONS.allow_local_files
+    )
+    return path is None
+
+
+async def schedule_job(amqp, delivery_tag, message_data, published_at, scheduler, delivery, session, io, downloads,
+                       body=None, store=None):
+    """
+    Videonun boyutunu / süresini okuyup işi kısa veya uzun şeride koyar.
+    Ağ ve disk istekleri (iş deposu, Range isteği) 'io' thread havuzunda beklenir:
+    olay döngüsü bu sırada diğer mesajları ve heartbeat'leri işlemeye devam eder.
+    İş deposu (store) verilirse önce iş durumuna bakılır: tamamlanmış veya hâlâ
+    çalışan bir işin mesajı analiz edilmeden onaylanır; tamamlanmış işin saklanan sonucu
+    yeniden teslim edilir (ilk teslim backend'e ulaşmamış olabilir; backend kaydı
+    üzerine yazar). İş şeritte beklemek zorundaysa
+    videosu 'downloads' havuzunda önceden indirilir.
+    """
+    loop = asyncio.get_running_loop()
+    video_id = message_data['videoId']
+    video_url = message_data['videoUrl']
+    exercise_name = message_data['exerciseName']
+    entry = registry.lookup(exercise_name)
+
+    fingerprint, attempts = None, 1
+    if store is not None:
+        fingerprint = message_fingerprint(message_data, analyzer_version(exercise_name))
+        state = await loop.run_in_executor(io, store.begin, video_id, fingerprint)
+        if state.outcome in (COMPLETED, IN_FLIGHT):
+            if state.outcome == COMPLETED:
+                result = state.result
+                try:
+                    await loop.run_in_executor(io, delivery.submit, video_id, result)
+                except OSError as e:
+                    print(f" [!] Video ID {video_id} saklanan sonucu outbox'a yazılamadı: {e}")
+                    amqp.nack(delivery_tag, requeue=True)
+                    return
+                print(f" [=] Video ID {video_id} daha önce analiz edildi ({result.get('correct_reps')} doğru, "
+                      f"{result.get('wrong_reps')} yanlış); saklanan sonuç yeniden gönderiliyor, mesaj onaylanıyor.")
+            else:
+                print(f" [=] Video ID {video_id} zaten analiz ediliyor; yinelenen mesaj onaylanıyor.")
+            JOBS.inc(exercise=entry.name if entry else "unknown", status="duplicate")
+            amqp.ack(delivery_tag)
+            return
+        attempts = state.attempts
+
+    info = await loop.run_in_executor(io, probe_video, video_url, session, ANALYSIS_OPTIONS.video_mounts,
+                                      ANALYSIS_OPTIONS.allow_local_files)
+    cost = estimate_cost(info, entry.cpu_weight if entry else 1.0)
+    lane = SHORT if cost is None or cost <= SHORT_JOB_MAX_SECONDS else LONG
+    duration_text = f"{info.duration_seconds:.1f} sn" if info.duration_seconds is not None else "süre bilinmiyor"
+    size_text = f"{info.size_bytes / 1024 / 1024:.1f} MB" if info.size_bytes is not None else "boyut bilinmiyor"
+    attempt_text = f", deneme {attempts}/{JOB_MAX_ATTEMPTS}" if attempts > 1 else ""
+    print(f" [i] Video ID {video_id}: {duration_text}, {size_text} -> {lane} şeridi{attempt_text}")
+    on_done = ack_when_done(amqp, io, delivery_tag, video_id, exercise_name, published_at, delivery,
+                            lane, body=body, store=store, fingerprint=fingerprint, attempts=attempts)
+
+    count = 1
+    if lane == LONG:
+        cache = ANALYSIS_OPTIONS.landmark_cache
+        track_cached = cache is not None and await loop.run_in_executor(io, cache.contains, track_key(video_url))
+        count = segment_count(entry, info, message_data, scheduler, track_cached)
+    if count > 1:
+        schedule_segments(scheduler, message_data, info.duration_seconds, count, on_done)
+    else:
+        scheduler.submit(Job(
+            process_job,
+            (video_id, video_url, exercise_name, message_data.get('renderOutput')),
+            on_done,
+            lane=lane,
+            cost_seconds=cost,
+        ))
+    if await should_prefetch(video_url, scheduler, io):
+        print(f" [i] Video ID {video_id} şeritte bekliyor, video önceden indiriliyor.")
+        loop.run_in_executor(downloads, prefetch_video, video_url, session)
 
-def callback(ch, method, properties, body):
-    """Kuyruktan bir mesaj alındığında bu fonksiyon çalışır."""
+
+async def schedule_or_requeue(amqp, delivery_tag, message_data, *args, **kwargs):
+    """schedule_job'u çalıştırır; beklenmedik bir hatada (örn. iş deposu) mesajı kuyruğa geri bırakır."""
+    try:
+        await schedule_job(amqp, delivery_tag, message_data, *args, **kwargs)
+    except Exception as e:
+        print(f" [!] Video ID {message_data.get('videoId')} zamanlanamadı ({type(e).__name__}: {e}), "
+              f"kuyruğa geri bırakılıyor.")
+        amqp.nack(delivery_tag, requeue=True)
+
+
+def callback(ch, method, properties, body, amqp, scheduler, delivery, session, io, downloads, store=None):
+    """
+    Kuyruktan bir mesaj alındığında bu fonksiyon çalışır (olay döngüsü thread'inde).
+    İş, video bilgisi okunduktan sonra zamanlayıcı üzerinden işçi havuzuna gönderilir;
+    döngü hiç bloklanmaz ve uzun analizler sırasında heartbeat'ler akmaya devam eder.
+    Okunamayan (bozuk) mesajlar yeniden denenmeden ölü mektup kuyruğuna gönderilir.
+    """
     print(f"\n--- [x] YENİ MESAJ ALINDI ---")
-    
-    video_id = None
-    analysis_result = None
 
     try:
         message_data = json.loads(body.decode('utf-8'))
-        
+
         video_id = message_data.get('videoId')
         video_url = message_data.get('videoUrl')
         exercise_name = message_data.get('exerciseName')
 
         if not video_id or not video_url or not exercise_name:
             print(f" [!] Hatalı mesaj formatı: {body.decode('utf-8')}")
-            ch.basic_ack(delivery_tag=method.delivery_tag)
+            dead_letter(amqp, method.delivery_tag, body, "Hatalı mesaj formatı")
             return
 
-        print(f" [i] Video ID: {video_id}, Hareket: {exercise_name}")
-        
-        # 1. Dağıtım (Senin istediğin mantık)
-        # 'video_processor' yok. Doğrudan 'uzman' çağrılıyor.
-        print(f" [>] Uzman analizci çağrılıyor: {exercise_name}")
-        
-        if exercise_name.lower() == 'squat':
-            # Uzmana URL'i VE video_id'yi gönderiyoruz
-            analysis_result = squat_analyzer.analyze_squat(video_url, video_id)
-            
-        elif exercise_name.lower() in ['push-up', 'pushup']:
-            # Push-up uzmanını çağır
-            analysis_result = pushup_analyzer.analyze_pushup(video_url, video_id)
-
-        elif exercise_name.lower() in ['barbell curl', 'barbell_curl', 'curl', 'barbel-curl']:
-            # Barbell Curl uzmanını çağır
-            analysis_result = barbell_curl_analyzer.analyze_barbell_curl(video_url, video_id)
-            
-        else:
-            print(f" [!] UYARI: '{exercise_name}' için bir analizci bulunamadı.")
-            analysis_result = {
-                "correct_reps": 0, "wrong_reps": 0,
-                "feedback": f"'{exercise_name}' hareketi için analiz modülü henüz eklenmemiş."
-            }
+        print(f" [i] Video ID: {video_id}, Hareket: {exercise_name}{' (yeniden teslim)' if method.redelivered else ''}")
+        # AMQP timestamp'i (saniye) backend'in yayın zamanıdır; yoksa alınma anı kullanılır
+        published_at = properties.timestamp or time.time()
+        spawn(schedule_or_requeue(amqp, method.delivery_tag, message_data, published_at, scheduler, delivery,
+                                  session, io, downloads, body=body, store=store))
 
-        print(f" [>] Analiz tamamlandı. Sonuç: {analysis_result}")
+    except Exception as e:
+        print(f" [!] Mesaj işlenemedi: {e}")
+        dead_letter(amqp, method.delivery_tag, body, f"Mesaj işlenemedi: {e}")
 
-        # 2. Sonuçları Geri Gönder
-        send_results_to_backend(video_id, analysis_result)
-        
-        print(f" [✓] Mesaj başarıyla işlendi ve kuyruktan silindi.")
-        ch.basic_ack(delivery_tag=method.delivery_tag)
 
-    except Exception as e:
-        print(f" [!] İşlem sırasında beklenmedik bir hata oluştu: {e}")
-        if video_id:
-             send_results_to_backend(video_id, {"feedback": f"Analiz hatası: {e}", "correct_reps": 0, "wrong_reps": 0})
-        ch.basic_ack(delivery_tag=method.delivery_tag)
+def build_session(pool_size):
+    """Video bilgisi okuma ve önceden indirme için bağlantı havuzlu, yeniden denemeli oturum."""
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504), allowed_methods=('GET', 'HEAD'))
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+async def wait_idle(scheduler, timeout):
+    """Çalışan iş ve bekleyen ack / nack kalmayana kadar en fazla 'timeout' sn bekler."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while scheduler.running() or _background:
+        if loop.time() >= deadline:
+            return False
+        await asyncio.sleep(0.2)
+    return True
+
+
+async def drain(amqp, scheduler, interrupt, drain_timeout=DRAIN_TIMEOUT_SECONDS):
+    """
+    Kapanış: mesaj almayı bırakır, bekleyen (başlamamış) işleri ve gecikmeli yeniden
+    denemeleri kuyruğa geri bırakır ve çalışan işlerin bitmesini 'drain_timeout' sn
+    bekler. Süre dolarsa işçilerden
+    ilerlemeyi kontrol noktasına kaydedip durmaları istenir; yarıda kalan işlerin
+    mesajları deneme sayılmadan kuyruğa geri bırakılır.
+    """
+    set_health(ready=False)
+    if amqp.is_open:
+        await amqp.cancel()
+    flush_delayed_requeues()
+    scheduler.close()
+    PREFETCH_CANCEL.set()
+    running = scheduler.running()
+    if running:
+        print(f" [*] {running} çalışan işin bitmesi bekleniyor (en fazla {drain_timeout:.0f} sn)...")
+    if await wait_idle(scheduler, drain_timeout):
+        return
+    print(f" [*] Süre doldu: çalışan {scheduler.running()} analiz ilerlemesini kaydedip duruyor...")
+    interrupt.set()
+    if not await wait_idle(scheduler, CHECKPOINT_TIMEOUT_SECONDS):
+        print(f" [!] {scheduler.running()} iş {CHECKPOINT_TIMEOUT_SECONDS:.0f} sn içinde durmadı; "
+              f"mesajları bağlantı kapanınca yeniden teslim edilecek.")
+
+
+async def serve():
+    """
+    Bağlantıyı açar ve bağlantı kapanana veya kapatma sinyali (SIGTERM / CTRL+C) gelene
+    kadar mesajları işler. Sinyalde çalışan işler bitirilir ya da kaydedilir (bkz. drain);
+    ikinci sinyal beklemeyi keser ve ilerlemenin hemen kaydedilmesini ister.
+    """
+    loop = asyncio.get_running_loop()
+    # 'spawn': MediaPipe/TFLite thread'leri fork sonrası kilitlenebilir
+    context = multiprocessing.get_context('spawn')
+    warmed = context.Semaphore(0)
+    interrupt = context.Event()
+    executor = ProcessPoolExecutor(
+        max_workers=WORKER_COUNT,
+        mp_context=context,
+        initializer=init_worker,
+        initargs=(interrupt, ANALYSIS_OPTIONS.pose_config, warmed) if ANALYZER_WARM_UP else (interrupt,)
+    )
+    delivery = ResultDelivery(
+        BACKEND_URL,
+        RESULT_OUTBOX_DIR,
+        batch_url=f"{BACKEND_URL.rstrip('/')}/batch",
+        batch_size=RESULT_BATCH_SIZE,
+        concurrency=RESULT_POST_CONCURRENCY
+    )
+    # Analiz işleri run_in_executor ile süreç havuzuna gider; callback'ler döngüde çalışır
+    scheduler = LaneScheduler(LoopExecutor(loop, executor), WORKER_COUNT, SHORT_RESERVED_WORKERS,
+                              memory_reserve_bytes=MEMORY_RESERVE_MB * 1024 * 1024 or None)
+    # Bloklayan küçük I/O (Range isteği, SQLite, outbox fsync) ve uzun indirmeler ayrı havuzlarda:
+    # indirmeler I/O thread'lerini doldurup yeni mesajların zamanlanmasını bekletmesin
+    io = ThreadPoolExecutor(max_workers=IO_CONCURRENCY, thread_name_prefix="io")
+    downloads = ThreadPoolExecutor(max_workers=DOWNLOAD_CONCURRENCY, thread_name_prefix="download")
+    session = build_session(IO_CONCURRENCY + DOWNLOAD_CONCURRENCY)
+    store = JobStore(JOB_STORE_PATH) if JOB_STORE_PATH else None
+    if store is not None:
+        interrupted = store.recover()
+        if interrupted:
+            print(f" [i] Önceki çalışmada yarım kalan {interrupted} iş başarısız deneme sayıldı.")
+        store.prune(JOB_STORE_RETENTION_DAYS * 24 * 3600)
+    if ANALYSIS_OPTIONS.checkpoints is not None:
+        ANALYSIS_OPTIONS.checkpoints.prune(CHECKPOINT_RETENTION_HOURS * 3600)
+
+    stopping = asyncio.Event()
+
+    def on_signal():
+        if stopping.is_set():
+            print(" [*] İkinci kapatma sinyali: analizler beklemeden kaydedilip durduruluyor.")
+            interrupt.set()
+        stopping.set()
+
+    for signal_number in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signal_number, on_signal)
+
+    delivery.start()
+    if METRICS_PORT:
+        start_metrics_server(METRICS_PORT)
+    amqp = AsyncChannel(RABBITMQ_HOST)
+    try:
+        await amqp.connect()
+        await amqp.queue_declare(QUEUE_NAME, durable=False)
+        await amqp.queue_declare(DEAD_LETTER_QUEUE, durable=True)
+        # Prefetch işçi sayısından büyük: kısa işler, uzun işlerin arkasından öne alınabilsin
+        await amqp.basic_qos(prefetch_count=max(PREFETCH_COUNT, WORKER_COUNT))
+        amqp.basic_consume(QUEUE_NAME, functools.partial(
+            callback, amqp=amqp, scheduler=scheduler, delivery=delivery, session=session,
+            io=io, downloads=downloads, store=store
+        ))
+        # Mesaj almaya hemen başla; modeller arka planda yüklenir
+        if ANALYZER_WARM_UP:
+            threading.Thread(target=warm_up_workers, args=(executor, warmed), name="warm-up", daemon=True).start()
+        set_health(ready=True)
+        print(f' [*] Kuyruk dinleniyor: {QUEUE_NAME} ({WORKER_COUNT} işçi süreci, {scheduler.reserved_short} tanesi kısa işlere ayrılmış)')
+        print(' [*] Mesaj bekleniyor. Çıkmak için CTRL+C basın (çalışan işler bitirilir veya kaydedilir)')
+        closed = asyncio.ensure_future(amqp.closed())
+        signalled = asyncio.ensure_future(stopping.wait())
+        await asyncio.wait((closed, signalled), return_when=asyncio.FIRST_COMPLETED)
+        signalled.cancel()
+        if stopping.is_set():
+            print("\n [*] Kapatma sinyali alındı: yeni mesaj alınmıyor.")
+            await drain(amqp, scheduler, interrupt)
+        else:
+            # Kanal kapandı, ack gönderilemez: mesajlar yeniden teslim edilecek, işler kaydedilip durur
+            print(f" [!] RabbitMQ bağlantısı kapandı: {closed.result()}")
+            await drain(amqp, scheduler, interrupt, drain_timeout=0)
+
+    except pika.exceptions.AMQPError as e:
+        print(f"HATA: RabbitMQ sunucusuna bağlanılamadı ({RABBITMQ_HOST}): {e}")
+    finally:
+        set_health(ready=False)
+        PREFETCH_CANCEL.set()
+        downloads.shutdown(wait=False, cancel_futures=True)
+        executor.shutdown(wait=False, cancel_futures=True)
+        await delivery.stop()
+        io.shutdown(wait=False, cancel_futures=True)
+        await amqp.close()
+        print(' [*] Kapatıldı.')
+
 
 def main():
     """Ana dinleyici fonksiyonu."""
     try:
-        connection = pika.BlockingConnection(
-            pika.ConnectionParameters(host=RABBITMQ_HOST)
-        )
-        channel = connection.channel()
-        channel.queue_declare(queue=QUEUE_NAME, durable=False) 
-        channel.basic_consume(
-            queue=QUEUE_NAME,
-            on_message_callback=callback
-        )
-        print(f' [*] Kuyruk dinleniyor: {QUEUE_NAME}')
-        print(' [*] Mesaj bekleniyor. Çıkmak için CTRL+C basın')
-        channel.start_consuming()
-
-    except pika.exceptions.AMQPConnectionError as e:
-        print(f"HATA: RabbitMQ sunucusuna bağlanılamadı ({RABBITMQ_HOST}).")
+        asyncio.run(serve())
     except KeyboardInterrupt:
         print('\nKapatıldı.')
     sys.exit(0)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
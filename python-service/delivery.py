@@ -0,0 +1,275 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import RESULT_POST
+
+
+def build_payload(video_id, result):
+    """Analiz sonucunu backend'in beklediği AnalysisResultRequest biçimine çevirir."""
+    return {
+        "videoId": video_id,
+        "correctReps": result.get("correct_reps", 0),
+        "wrongReps": result.get("wrong_reps", 0),
+        "feedback": result.get("feedback", "Analiz sırasında hata oluştu.")
+    }
+
+
+class ResultDelivery:
+    """
+    Analiz sonuçlarını Spring Boot API'sine arka planda teslim eder.
+
+    - Her sonuç önce diskteki 'outbox' klasörüne yazılır (kalıcı), sonra gönderilir;
+      başarılı teslimde dosya silinir. Süreç çökerse bekleyen sonuçlar açılışta tekrar gönderilir.
+    - Bağlantı havuzlu (keep-alive) tek Session, bağlantı/okuma zaman aşımları.
+    - Geçici hatalarda (bağlantı, zaman aşımı, 5xx, 429) üstel geri çekilmeyle yeniden dener;
+      denemeler tükenirse sonuç outbox'ta kalır ve backend düzelince tekrar oynatılır.
+    - batch_size > 1 ise bekleyen sonuçlar tek istekte toplu gönderilir; backend'in geçici
+      hatayla kaydedemediği sonuçlar (failedVideoIds) outbox'ta kalır ve tekrar denenir.
+    Gönderim olay döngüsünde (asyncio) bir görev olarak çalışır; en fazla 'concurrency'
+    istek aynı anda yoldadır. HTTP istekleri kendi thread havuzunda yapılır, böylece
+    yavaş bir backend ne döngüyü (RabbitMQ heartbeat'leri) ne de analizi bekletir.
+    """
+
+    def __init__(self, url, outbox_dir, batch_url=None, batch_size=1, batch_wait=0.5,
+                 max_attempts=5, backoff=0.5, replay_interval=30.0, timeout=(3, 10), concurrency=4):
+        self.url = url
+        self.batch_url = batch_url
+        self.outbox_dir = outbox_dir
+        self.batch_size = max(1, batch_size) if batch_url else 1
+        self.batch_wait = batch_wait
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.replay_interval = replay_interval
+        self.timeout = timeout
+        self.concurrency = max(1, concurrency)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="result-post")
+        self._loop = None
+        self._queue = None
+        self._pending = set()  # Kuyrukta veya gönderimde olan outbox dosyaları (sadece döngü thread'inde)
+        self._stop = None
+        self._task = None
+
+    # --- Outbox ---
+    def _persist(self, payload):
+        os.makedirs(self.outbox_dir, exist_ok=True)
+        name = f"{payload['videoId']}-{uuid.uuid4().hex}.json"
+        path = os.path.join(self.outbox_dir, name)
+        temp_path = os.path.join(self.outbox_dir, f".{name}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        return path
+
+    def _enqueue(self, path, payload):
+        if path in self._pending:
+            return
+        self._pending.add(path)
+        self._queue.put_nowait((path, payload))
+
+    @staticmethod
+    def _remove(paths):
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    async def _done(self, entries, undelivered):
+        """
+        Gönderimi biten sonuçları bırakır; 'undelivered' dışındakilerin dosyası (thread havuzunda)
+        silinir. Dosyalar silinene kadar 'bekliyor' sayılır: arada outbox yeniden oynatılırsa
+        aynı sonuç tekrar kuyruğa alınmaz.
+        """
+        kept = {path for path, _ in undelivered}
+        delivered = [path for path, _ in entries if path not in kept]
+        try:
+            if delivered:
+                await self._loop.run_in_executor(self._executor, self._remove, delivered)
+        finally:
+            for path, _ in entries:
+                self._pending.discard(path)
+
+    def _read_outbox(self):
+        """Outbox'taki sonuçları (yol, içerik) olarak okur."""
+        if not os.path.isdir(self.outbox_dir):
+            return []
+        entries = []
+        for name in sorted(os.listdir(self.outbox_dir)):
+            if not name.endswith('.json') or name.startswith('.'):
+                continue
+            path = os.path.join(self.outbox_dir, name)
+            try:
+                with open(path, encoding='utf-8') as f:
+                    entries.append((path, json.load(f)))
+            except (OSError, ValueError) as e:
+                print(f" [!] Outbox dosyası okunamadı ({path}): {e}")
+        # Okuma sürerken teslim edilip silinmiş olabilir
+        return [(path, payload) for path, payload in entries if os.path.exists(path)]
+
+    async def replay_outbox(self):
+        """Outbox'ta bekleyen (henüz kuyrukta olmayan) sonuçları yeniden kuyruğa alır."""
+        for path, payload in await self._loop.run_in_executor(self._executor, self._read_outbox):
+            self._enqueue(path, payload)
+
+    # --- Dışarıya açık API ---
+    def submit(self, video_id, result):
+        """
+        Sonucu kalıcı olarak outbox'a yazar ve gönderim kuyruğuna ekler.
+        Döndüğünde sonuç diskte güvendedir; mesaj artık onaylanabilir (ack).
+        Disk yazımı bloklar: döngü thread'inde değil, bir I/O thread'inde çağrılmalıdır.
+        """
+        payload = build_payload(video_id, result)
+        path = self._persist(payload)
+        self._loop.call_soon_threadsafe(self._enqueue, path, payload)
+
+    def start(self):
+        """Gönderim görevini başlatır (açılışta outbox yüklenir). Olay döngüsünde çağrılmalıdır."""
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._stop = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self, timeout=10.0):
+        """Kuyruktakileri göndermek için en fazla 'timeout' sn bekler; kalanlar outbox'ta kalır."""
+        if self._task is None:
+            return
+        self._stop.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # --- Gönderim ---
+    async def _next_batch(self):
+        try:
+            first = await asyncio.wait_for(self._queue.get(), timeout=1.0)
+        except asyncio.TimeoutError:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _post(self, entries):
+        """
+        Tek bir HTTP isteği yapar (thread havuzunda). Tekrar denenmesi gereken sonuçları döner;
+        boş liste: hepsi teslim edildi veya kalıcı hata aldı.
+        """
+        if len(entries) == 1:
+            url, body = self.url, entries[0][1]
+        else:
+            url, body = self.batch_url, [payload for _, payload in entries]
+        video_ids = [payload['videoId'] for _, payload in entries]
+
+        start = time.perf_counter()
+        try:
+            response = self.session.post(url, json=body, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            RESULT_POST.observe(time.perf_counter() - start, status="connection_error")
+            print(f" [!] Backend'e bağlanılamadı! ({url}) Spring Boot çalışıyor mu? ({type(e).__name__})")
+            return entries
+        RESULT_POST.observe(time.perf_counter() - start, status=str(response.status_code))
+
+        if response.ok:
+            failed = self._batch_failures(response, entries) if len(entries) > 1 else []
+            if failed:
+                print(f" [!] Backend toplu gönderimde şu sonuçları kaydedemedi, tekrar denenecek: "
+                      f"{[payload['videoId'] for _, payload in failed]}")
+            else:
+                print(f" [i] Video ID {video_ids} için sonuçlar backend'e başarıyla gönderildi.")
+            return failed
+        if response.status_code >= 500 or response.status_code in (408, 429):
+            print(f" [!] Backend geçici hata verdi! Video ID: {video_ids}, Durum: {response.status_code}")
+            return entries
+        # 4xx: tekrar denemek sonucu değiştirmez (örn. kayıt bulunamadı)
+        print(f" [!] Backend hatası! Video ID: {video_ids}, Durum: {response.status_code}, Yanıt: {response.text}")
+        return []
+
+    @staticmethod
+    def _batch_failures(response, entries):
+        """
+        Toplu yanıttaki 'failedVideoIds' (backend'in geçici hatayla kaydedemedikleri) sonuçlarını döner.
+        'missingVideoIds' (kayıt yok) kalıcı hatadır, tekrar denenmez. Yanıt okunamazsa
+        hiçbir sonuç silinmemesi için hepsi tekrar denenir.
+        """
+        try:
+            body = response.json()
+            failed_ids = {str(video_id) for video_id in body.get('failedVideoIds', [])}
+            missing_ids = body.get('missingVideoIds', [])
+        except (ValueError, AttributeError, TypeError):
+            print(f" [!] Toplu gönderim yanıtı okunamadı, sonuçlar tekrar denenecek: {response.text[:200]}")
+            return entries
+        if missing_ids:
+            print(f" [!] Backend'de kaydı bulunamayan videolar: {missing_ids}")
+        return [(path, payload) for path, payload in entries if str(payload['videoId']) in failed_ids]
+
+    async def _deliver(self, entries):
+        """Teslim edilemeyen sonuçları döner (boş: hepsi teslim edildi)."""
+        for attempt in range(self.max_attempts):
+            entries = await self._loop.run_in_executor(self._executor, self._post, entries)
+            if not entries:
+                return []
+            if self._stop.is_set():
+                break
+            # Üstel geri çekilme: 0.5, 1, 2, 4 ... sn
+            try:
+                await asyncio.wait_for(self._stop.wait(), self.backoff * (2 ** attempt))
+            except asyncio.TimeoutError:
+                pass
+        print(f" [!] {len(entries)} sonuç teslim edilemedi, outbox'ta bekletiliyor.")
+        return entries
+
+    async def _send(self, batch, slots):
+        try:
+            await self._done(batch, await self._deliver(batch))
+        except Exception as e:
+            print(f" [!] Sonuç gönderimi başarısız: {e}")
+            await self._done(batch, batch)
+        finally:
+            slots.release()
+
+    async def _run(self):
+        slots = asyncio.Semaphore(self.concurrency)
+        sending = set()
+        await self.replay_outbox()
+        last_replay = time.monotonic()
+        while True:
+            # Periyodik olarak outbox'ı yeniden oynat: backend düzelmiş olabilir
+            if not self._stop.is_set() and time.monotonic() - last_replay >= self.replay_interval:
+                await self.replay_outbox()
+                last_replay = time.monotonic()
+
+            batch = await self._next_batch()
+            if not batch:
+                if self._stop.is_set():
+                    break
+                continue
+            await slots.acquire()
+            task = self._loop.create_task(self._send(batch, slots))
+            sending.add(task)
+            task.add_done_callback(sending.discard)
+        if sending:
+            await asyncio.wait(sending)
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+# İş durumları
+RUNNING = "running"   # Bu süreçte analiz ediliyor
+DONE = "done"         # Sonuç outbox'a yazıldı (teslimat ResultDelivery'de)
+FAILED = "failed"     # Son deneme başarısız; mesaj yeniden kuyruğa bırakıldı
+DEAD = "dead"         # Deneme hakkı bitti; mesaj ölü mektup kuyruğuna gönderildi
+
+# begin() sonuçları
+NEW = "new"           # İş ilk kez (veya ölü mektuptan sonra yeniden) başlıyor
+RETRY = "retry"       # Başarısız bir iş yeniden deneniyor
+COMPLETED = "completed"
+IN_FLIGHT = "in_flight"
+
+
+def message_fingerprint(message_data, analyzer_version=None):
+    """
+    Mesajın analiz sonucunu belirleyen alanlarının özeti.
+    Aynı video farklı bir hareketle, çizimli çıktı ayarıyla veya yeni bir analizci
+    sürümüyle gelirse parmak izi değişir ve iş yeniden çalışır.
+    """
+    fields = {
+        "videoUrl": message_data.get('videoUrl'),
+        "exerciseName": message_data.get('exerciseName', '').strip().lower(),
+        "renderOutput": message_data.get('renderOutput'),
+        "analyzer": analyzer_version,
+    }
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode('utf-8')).hexdigest()[:32]
+
+
+@dataclass
+class JobState:
+    """begin() sonucu: ne yapılacağı, kaçıncı deneme olduğu ve (tamamlandıysa) saklanan sonuç."""
+    outcome: str
+    attempts: int = 0
+    result: dict = None
+
+
+class JobStore:
+    """
+    İşlerin durumunu (videoId + mesaj parmak izi) yerel bir SQLite dosyasında tutar.
+
+    - Tamamlanmış bir iş yeniden gelirse (RabbitMQ yeniden teslimi, backend'in aynı
+      videoyu tekrar yayınlaması) analiz çalıştırılmaz, saklanan sonuç döner.
+    - Aynı iş bu süreçte hâlâ çalışıyorsa yinelenen mesaj 'in_flight' olarak işaretlenir.
+    - Deneme sayısı mesaj yeniden kuyruğa bırakılsa da korunur; consumer bu sayıyla
+      yeniden denemeyi sınırlar ve hakkı biten işi ölü mektup kuyruğuna gönderir.
+    Dosya tek bir consumer sürecine aittir: açılışta 'running' kalan işler (süreç
+    çökmüş) başarısız deneme sayılır.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                video_id TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (video_id, fingerprint)
+            )
+        """)
+        self._lock = threading.Lock()
+
+    def _set(self, video_id, fingerprint, **values):
+        values["updated_at"] = time.time()
+        assignments = ", ".join(f"{column} = ?" for column in values)
+        self._connection.execute(
+            f"UPDATE jobs SET {assignments} WHERE video_id = ? AND fingerprint = ?",
+            (*values.values(), video_id, fingerprint)
+        )
+
+    def begin(self, video_id, fingerprint):
+        """İşi 'running' olarak işaretler; iş zaten tamamlandıysa veya çalışıyorsa bunu bildirir."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status, attempts, result FROM jobs WHERE video_id = ? AND fingerprint = ?",
+                (video_id, fingerprint)
+            ).fetchone()
+            if row is None:
+                self._connection.execute(
+                    "INSERT INTO jobs (video_id, fingerprint, status, attempts, updated_at) VALUES (?, ?, ?, 1, ?)",
+                    (video_id, fingerprint, RUNNING, time.time())
+                )
+                return JobState(NEW, 1)
+            status, attempts, result = row
+            if status == DONE:
+                return JobState(COMPLETED, attempts, json.loads(result))
+            if status == RUNNING:
+                return JobState(IN_FLIGHT, attempts)
+            # Ölü mektuptan sonra yeniden yayınlanan iş sıfırdan deneme hakkı alır
+            attempts = 1 if status == DEAD else attempts + 1
+            self._set(video_id, fingerprint, status=RUNNING, attempts=attempts, error=None)
+            return JobState(NEW if status == DEAD else RETRY, attempts)
+
+    def complete(self, video_id, fingerprint, result):
+        with self._lock:
+            self._set(video_id, fingerprint, status=DONE, result=json.dumps(result, ensure_ascii=False), error=None)
+
+    def fail(self, video_id, fingerprint, error, dead=False):
+        """İşi başarısız (veya deneme hakkı bittiyse ölü) olarak işaretler."""
+        with self._lock:
+            self._set(video_id, fingerprint, status=DEAD if dead else FAILED, error=str(error)[:1000])
+
+    def release(self, video_id, fingerprint):
+        """Çalışan işi, denemesini saymadan bırakır (örn. mesaj teslim edilemeden kuyruğa döndü)."""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, attempts = MAX(attempts - 1, 0), updated_at = ? "
+                "WHERE video_id = ? AND fingerprint = ? AND status = ?",
+                (FAILED, time.time(), video_id, fingerprint, RUNNING)
+            )
+
+    def recover(self):
+        """Önceki süreçten 'running' kalan işleri başarısız sayar; sayısını döner."""
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE status = ?",
+                (FAILED, "Süreç iş bitmeden kapandı.", time.time(), RUNNING)
+            )
+            return cursor.rowcount
+
+    def prune(self, max_age_seconds):
+        """Son güncellemesi max_age_seconds'tan eski kayıtları siler; silinen sayısını döner."""
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM jobs WHERE status != ? AND updated_at < ?",
+                (RUNNING, time.time() - max_age_seconds)
+            )
+            return cursor.rowcount
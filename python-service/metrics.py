@@ -0,0 +1,195 @@
+import bisect
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from analyzers.timing import INFERENCE_BUCKETS
+
+# Süre histogramları için varsayılan sınırlar (saniye)
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Counter:
+    """Etiketli, sadece artan sayaç (Prometheus 'counter')."""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    """
+    Etiketli histogram (Prometheus 'histogram').
+    observe() tek değer ekler; merge() işçi süreçlerinde aynı sınırlarla
+    önceden toplanmış kova sayılarını ekler (kare başına veri taşımamak için).
+    """
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DURATION_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}  # etiketler -> [kova sayıları (son: +Inf), toplam]
+        self._lock = threading.Lock()
+
+    def _entry(self, labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        return self._values.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0])
+
+    def observe(self, value, **labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._entry(labels)
+            entry[0][index] += 1
+            entry[1] += value
+
+    def merge(self, counts, total, **labels):
+        if len(counts) != len(self.buckets) + 1:
+            raise ValueError(f"{self.name}: kova sayısı uyuşmuyor ({len(counts)})")
+        with self._lock:
+            entry = self._entry(labels)
+            for index, count in enumerate(counts):
+                entry[0][index] += count
+            entry[1] += total
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float('inf') else repr(bound)
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', le)])} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+# --- METRİKLER (ana süreçte toplanır) ---
+JOBS = Counter('repvision_jobs_total', 'Tamamlanan analiz işleri.', ('exercise', 'status'))
+FRAMES = Counter('repvision_frames_total', 'Çözülen (decoded) ve poz modelinden geçen (analyzed) kareler.', ('exercise', 'kind'))
+REPS = Counter('repvision_reps_total', 'Sayılan tekrarlar.', ('exercise', 'result'))
+STAGE_SECONDS = Counter('repvision_stage_seconds_total', 'Aşama başına harcanan toplam süre (sn).', ('exercise', 'stage'))
+JOB_DURATION = Histogram('repvision_job_duration_seconds', 'İşçide geçen toplam analiz süresi (sn).', ('exercise',))
+INFERENCE_LATENCY = Histogram('repvision_inference_latency_seconds', 'Kare başına pose.process süresi (sn).',
+                              ('exercise',), buckets=INFERENCE_BUCKETS)
+QUEUE_LAG = Histogram('repvision_queue_lag_seconds', 'Mesajın yayınlanmasından ack edilmesine kadar geçen süre (sn).',
+                      ('exercise', 'lane'))
+RESULT_POST = Histogram('repvision_result_post_seconds', "Sonuçların backend'e gönderim süresi (sn).",
+                        ('status',), buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0))
+JOB_PEAK_RSS = Histogram('repvision_job_peak_rss_megabytes', 'İş boyunca işçi sürecinin tepe RSS değeri (MB).',
+                         ('exercise',), buckets=(128, 256, 384, 512, 768, 1024, 1536, 2048, 3072, 4096))
+
+REGISTRY = (JOBS, FRAMES, REPS, STAGE_SECONDS, JOB_DURATION, INFERENCE_LATENCY, QUEUE_LAG, RESULT_POST, JOB_PEAK_RSS)
+
+
+def render_metrics():
+    """Tüm metrikleri Prometheus metin biçiminde döner."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def record_job(exercise, result, status="ok"):
+    """
+    Sonuçlanan (ack / ölü mektup) bir işin sonucunu ve işçiden gelen zamanlama raporunu
+    metriklere ekler. Yeniden denenecek işler için çağrılmaz: her iş bir kez sayılır.
+    """
+    JOBS.inc(exercise=exercise, status=status)
+    REPS.inc(result.get("correct_reps", 0), exercise=exercise, result="correct")
+    REPS.inc(result.get("wrong_reps", 0), exercise=exercise, result="wrong")
+    if "frame_count" in result:
+        FRAMES.inc(result["frame_count"], exercise=exercise, kind="decoded")
+        FRAMES.inc(result.get("analyzed_frames", 0), exercise=exercise, kind="analyzed")
+
+    timings = result.get("timings")
+    if not timings:
+        return
+    JOB_DURATION.observe(timings["total_seconds"], exercise=exercise)
+    if "peak_rss_mb" in timings:
+        JOB_PEAK_RSS.observe(timings["peak_rss_mb"], exercise=exercise)
+    for stage, entry in timings["stages"].items():
+        STAGE_SECONDS.inc(entry["seconds"], exercise=exercise, stage=stage)
+    inference = timings["inference_histogram"]
+    if tuple(inference["buckets"]) == INFERENCE_LATENCY.buckets and any(inference["counts"]):
+        INFERENCE_LATENCY.merge(inference["counts"], timings["stages"]["inference"]["seconds"], exercise=exercise)
+
+
+# --- SAĞLIK / HAZIR OLMA SİNYALİ ---
+# ready: RabbitMQ'ya bağlı ve mesaj alıyor. warm: işçiler analizcileri ve modeli yükledi.
+_health = {"ready": False, "warm": False}
+_health_lock = threading.Lock()
+
+
+def set_health(**values):
+    with _health_lock:
+        _health.update(values)
+
+
+def get_health():
+    with _health_lock:
+        return dict(_health)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics (Prometheus), /ready (hazır değilse 503) ve /healthz (canlılık)."""
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        if path == '/metrics':
+            self._send(200, render_metrics(), 'text/plain; version=0.0.4; charset=utf-8')
+        elif path == '/ready':
+            health = get_health()
+            self._send(200 if health["ready"] else 503, json.dumps(health), 'application/json')
+        elif path == '/healthz':
+            self._send(200, json.dumps({"alive": True}), 'application/json')
+        else:
+            self.send_error(404)
+
+    def _send(self, status, text, content_type):
+        body = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Her scrape'i konsola basma
+
+
+def start_metrics_server(port, host='0.0.0.0'):
+    """Metrik ve sağlık uç noktalarını arka plan thread'inde sunar."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    print(f" [*] Metrikler yayında: http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,156 @@
+import collections
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+from analyzers.memory import available_memory
+
+SHORT = "short"
+LONG = "long"
+
+
+@dataclass
+class Job:
+    """Zamanlayıcıda bekleyen bir analiz işi."""
+    function: object
+    args: tuple
+    on_done: object
+    lane: str = SHORT
+    cost_seconds: float = None   # Tahmini analiz süresi (video süresi x CPU ağırlığı)
+
+
+class LoopExecutor:
+    """
+    İşleri asyncio olay döngüsü üzerinden (loop.run_in_executor) süreç havuzuna gönderir.
+    Dönen asyncio future'larının callback'leri döngü thread'inde çalışır: iş bitince
+    ack / nack doğrudan RabbitMQ kanalına yapılabilir. submit() döngü thread'inden çağrılmalıdır.
+    """
+
+    def __init__(self, loop, executor):
+        self.loop = loop
+        self.executor = executor
+
+    def submit(self, function, *args):
+        return self.loop.run_in_executor(self.executor, function, *args)
+
+
+def estimate_cost(info, cpu_weight=1.0, assumed_bytes_per_second=1024 * 1024):
+    """
+    İşin göreli maliyetini (sn) tahmin eder: video süresi biliniyorsa o,
+    değilse dosya boyutundan (varsayılan ~8 Mbit/sn telefon videosu) tahmin edilir.
+    Hiçbiri bilinmiyorsa None.
+    """
+    seconds = info.duration_seconds
+    if seconds is None and info.size_bytes is not None:
+        seconds = info.size_bytes / assumed_bytes_per_second
+    return None if seconds is None else seconds * cpu_weight
+
+
+class LaneScheduler:
+    """
+    İşleri kısa ve uzun iki şeritte (lane) bekletip işçi havuzuna dağıtır.
+
+    - Kısa işler her zaman önce başlar; şerit içinde sıra FIFO'dur.
+    - Uzun işler en fazla (worker_count - reserved_short) işçiyi kullanabilir:
+      ayrılan işçiler sadece kısa işlere açıktır. Böylece 3 dakikalık bir video
+      5 saniyelik klibi bekletmez ve tipik yüklemelerin p95 gecikmesi düşük kalır.
+    - Mesajlar iş bitene kadar onaylanmadığı (ack) için şeritlerde bekleyen
+      işler süreç ölürse RabbitMQ tarafından yeniden teslim edilir.
+    - memory_reserve_bytes verilirse, sistemde kullanılabilir bellek bunun altındayken
+      yeni iş başlatılmaz; bekleyen işler çalışan bir iş bitince yeniden denenir.
+      Hiç iş çalışmıyorsa biri yine de başlar (kuyruk durmasın).
+    - close() sonrası (süreç kapanırken) yeni iş başlatılmaz: bekleyen ve sonradan gelen
+      işler iptal edilmiş bir future ile on_done'a verilir, mesajları kuyruğa geri bırakılabilir.
+    """
+
+    def __init__(self, executor, worker_count, reserved_short=1, memory_reserve_bytes=None):
+        self.executor = executor
+        self.worker_count = worker_count
+        # En az bir işçi uzun işlere kalmalı, yoksa uzun işler hiç başlamaz
+        self.reserved_short = max(0, min(reserved_short, worker_count - 1))
+        self.memory_reserve_bytes = memory_reserve_bytes
+        self._lanes = {SHORT: collections.deque(), LONG: collections.deque()}
+        self._running = {SHORT: 0, LONG: 0}
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def long_capacity(self):
+        """Uzun işlerin aynı anda kullanabileceği işçi sayısı."""
+        return self.worker_count - self.reserved_short
+
+    def submit(self, job):
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._lanes[job.lane].append(job)
+        if closed:
+            self._cancel(job)
+            return
+        self._dispatch()
+
+    def waiting(self):
+        """Şerit başına bekleyen iş sayısı."""
+        with self._lock:
+            return {lane: len(queue) for lane, queue in self._lanes.items()}
+
+    def running(self):
+        """Çalışan iş sayısı."""
+        with self._lock:
+            return sum(self._running.values())
+
+    def close(self):
+        """Yeni iş başlatmayı bırakır ve bekleyen işleri iptal eder (çalışanlar sürer)."""
+        with self._lock:
+            self._closed = True
+            waiting = [job for queue in self._lanes.values() for job in queue]
+            for queue in self._lanes.values():
+                queue.clear()
+        for job in waiting:
+            self._cancel(job)
+
+    @staticmethod
+    def _cancel(job):
+        future = Future()
+        future.cancel()
+        job.on_done(future)
+
+    def _memory_low(self):
+        if not self.memory_reserve_bytes or not any(self._running.values()):
+            return False
+        available = available_memory()
+        return available is not None and available < self.memory_reserve_bytes
+
+    def _next_job(self):
+        if sum(self._running.values()) >= self.worker_count:
+            return None
+        if (self._lanes[SHORT] or self._lanes[LONG]) and self._memory_low():
+            return None
+        if self._lanes[SHORT]:
+            return self._lanes[SHORT].popleft()
+        if self._lanes[LONG] and self._running[LONG] < self.long_capacity:
+            return self._lanes[LONG].popleft()
+        return None
+
+    def _dispatch(self):
+        while True:
+            with self._lock:
+                job = self._next_job()
+                if job is None:
+                    return
+                self._running[job.lane] += 1
+            try:
+                future = self.executor.submit(job.function, *job.args)
+            except Exception as e:
+                # Havuz kapanmış / bozulmuş: iş hata sonucuyla tamamlanır
+                future = Future()
+                future.set_exception(e)
+            future.add_done_callback(lambda future, job=job: self._finished(job, future))
+
+    def _finished(self, job, future):
+        with self._lock:
+            self._running[job.lane] -= 1
+        try:
+            job.on_done(future)
+        finally:
+            self._dispatch()
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# Testler python-service klasöründen çalışır: 'analyzers', 'consumer' vb. doğrudan import edilir
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# consumer modülü import edilirken zorunlu ortam değişkenlerini arar (bağlantı kurulmaz)
+for name, value in {'RABBITMQ_HOST': 'localhost', 'QUEUE_NAME': 'video_analysis_queue', 'BACKEND_HOST': 'localhost',
+                    'BACKEND_PORT': '8080', 'BACKEND_RESULTS_PATH': '/api/videos/results'}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,161 @@
+import asyncio
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from job_store import COMPLETED, DEAD, DONE, FAILED, IN_FLIGHT, NEW, RETRY, RUNNING, JobStore, message_fingerprint
+
+MESSAGE = {'videoId': 7, 'videoUrl': 'https://example.com/v.mp4', 'exerciseName': 'squat'}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+def status(store, video_id, fingerprint):
+    return store._connection.execute(
+        "SELECT status, attempts FROM jobs WHERE video_id = ? AND fingerprint = ?", (video_id, fingerprint)
+    ).fetchone()
+
+
+def test_fingerprint_changes_with_result_affecting_fields():
+    base = message_fingerprint(MESSAGE, 'squat@3')
+    assert message_fingerprint(dict(MESSAGE, exerciseName=' Squat '), 'squat@3') == base
+    assert message_fingerprint(MESSAGE, 'squat@4') != base
+    assert message_fingerprint(dict(MESSAGE, renderOutput=True), 'squat@3') != base
+
+
+def test_duplicate_while_running_is_in_flight(store):
+    assert store.begin('7', 'f').outcome == NEW
+    state = store.begin('7', 'f')
+    assert (state.outcome, state.attempts) == (IN_FLIGHT, 1)
+    # Farklı parmak izi (örn. başka hareket) ayrı bir iştir
+    assert store.begin('7', 'g').outcome == NEW
+
+
+def test_completed_job_returns_stored_result(store):
+    store.begin('7', 'f')
+    store.complete('7', 'f', {"correct_reps": 4, "wrong_reps": 1, "feedback": "Güzel"})
+    state = store.begin('7', 'f')
+    assert state.outcome == COMPLETED
+    assert state.result == {"correct_reps": 4, "wrong_reps": 1, "feedback": "Güzel"}
+    assert status(store, '7', 'f') == (DONE, 1)
+
+
+def test_attempts_count_up_until_dead_letter(store):
+    assert store.begin('7', 'f').attempts == 1
+    store.fail('7', 'f', "indirilemedi")
+    state = store.begin('7', 'f')
+    assert (state.outcome, state.attempts) == (RETRY, 2)
+    store.fail('7', 'f', "indirilemedi")
+    assert store.begin('7', 'f').attempts == 3
+    store.fail('7', 'f', "indirilemedi", dead=True)
+    assert status(store, '7', 'f') == (DEAD, 3)
+    # Ölü mektuptan sonra yeniden yayınlanan iş sıfırdan deneme hakkı alır
+    state = store.begin('7', 'f')
+    assert (state.outcome, state.attempts) == (NEW, 1)
+
+
+def test_release_does_not_count_the_attempt(store):
+    store.begin('7', 'f')
+    store.release('7', 'f')
+    assert status(store, '7', 'f') == (FAILED, 0)
+    state = store.begin('7', 'f')
+    assert (state.outcome, state.attempts) == (RETRY, 1)
+
+
+def test_recover_counts_running_jobs_as_failed(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    crashed = JobStore(path)
+    crashed.begin('1', 'f')
+    crashed.begin('2', 'f')
+    crashed.complete('2', 'f', {"correct_reps": 1})
+
+    store = JobStore(path)  # Süreç çöktükten sonra yeniden açılış
+    assert store.recover() == 1
+    assert status(store, '1', 'f') == (FAILED, 1)
+    state = store.begin('1', 'f')
+    assert (state.outcome, state.attempts) == (RETRY, 2)
+    assert store.begin('2', 'f').outcome == COMPLETED
+
+
+def test_prune_keeps_running_jobs(store):
+    store.begin('1', 'f')
+    store.begin('2', 'f')
+    store.complete('2', 'f', {})
+    assert store.prune(-1) == 1
+    assert status(store, '1', 'f') == (RUNNING, 1)
+    assert status(store, '2', 'f') is None
+
+
+class FakeDelivery:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, video_id, result):
+        self.submitted.append((video_id, result))
+
+
+def test_failed_job_is_retried_then_dead_lettered(store, monkeypatch):
+    import consumer
+    monkeypatch.setattr(consumer, 'JOB_MAX_ATTEMPTS', 2)
+    delivery = FakeDelivery()
+    failure = {"feedback": "Analiz hatası", "correct_reps": 0, "wrong_reps": 0, "failed": True}
+
+    attempts = store.begin('7', 'f').attempts
+    assert consumer.settle_result('7', failure, delivery, store, 'f', attempts) == consumer.RETRY
+    assert delivery.submitted == []  # Ara denemelerin hatası backend'e gönderilmez
+
+    attempts = store.begin('7', 'f').attempts
+    assert consumer.settle_result('7', failure, delivery, store, 'f', attempts) == consumer.DEAD_LETTER
+    assert delivery.submitted == [('7', failure)]
+    assert status(store, '7', 'f') == (DEAD, 2)
+
+
+def test_retry_delay_backs_off_up_to_the_limit(monkeypatch):
+    import consumer
+    monkeypatch.setattr(consumer, 'JOB_RETRY_DELAY_SECONDS', 10.0)
+    monkeypatch.setattr(consumer, 'JOB_RETRY_MAX_DELAY_SECONDS', 30.0)
+    assert [consumer.retry_delay(attempt) for attempt in (1, 2, 3, 4)] == [10.0, 20.0, 30.0, 30.0]
+
+
+class FakeChannel:
+    def __init__(self):
+        self.calls = []
+
+    def ack(self, delivery_tag):
+        self.calls.append(('ack', delivery_tag))
+
+    def nack(self, delivery_tag, requeue=True):
+        self.calls.append(('nack', delivery_tag))
+
+
+def test_retried_job_is_counted_once_when_it_succeeds(store, monkeypatch):
+    import consumer
+    from metrics import JOBS, REPS
+    monkeypatch.setattr(consumer, 'JOB_MAX_ATTEMPTS', 3)
+    monkeypatch.setattr(consumer, 'JOB_RETRY_DELAY_SECONDS', 0.0)
+    monkeypatch.setattr(JOBS, '_values', {})
+    monkeypatch.setattr(REPS, '_values', {})
+    amqp = FakeChannel()
+    results = [{"feedback": "Analiz hatası", "correct_reps": 0, "wrong_reps": 0, "failed": True},
+               {"feedback": "Güzel", "correct_reps": 3, "wrong_reps": 1}]
+
+    async def deliver(tag, result):
+        attempts = store.begin('7', 'f').attempts
+        future = Future()
+        future.set_result(result)
+        consumer.ack_when_done(amqp, None, tag, '7', 'squat', time.time(), FakeDelivery(),
+                               store=store, fingerprint='f', attempts=attempts)(future)
+        await asyncio.gather(*consumer._background)
+
+    async def run():
+        for tag, result in enumerate(results, 1):
+            await deliver(tag, result)
+
+    asyncio.run(run())
+    assert amqp.calls == [('nack', 1), ('ack', 2)]
+    assert JOBS._values == {('squat', 'retried'): 1, ('squat', 'ok'): 1}
+    assert REPS._values == {('squat', 'correct'): 3, ('squat', 'wrong'): 1}
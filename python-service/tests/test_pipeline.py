@@ -0,0 +1,99 @@
+import dataclasses
+import types
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+import pytest
+
+from analyzers import engine
+from analyzers.engine import AnalysisOptions, analyze_capture
+from analyzers.squat_analyzer import SQUAT
+from benchmarks.synthetic import synthetic_track
+
+TRACK = synthetic_track(SQUAT, ['deep', 'shallow', 'deep', 'deep', 'shallow'], seed=9, noise=3.0)
+FRAME_SIZE = (64, 48)
+
+
+class FakeCapture:
+    """Kare numarasını piksellerde taşıyan (B: numara % 256, G: numara // 256) düz renkli kareler üretir."""
+
+    def __init__(self, frame_count):
+        self.frame_count = frame_count
+        self.position = 0
+
+    def get(self, prop):
+        return {cv2.CAP_PROP_FRAME_WIDTH: FRAME_SIZE[0], cv2.CAP_PROP_FRAME_HEIGHT: FRAME_SIZE[1],
+                cv2.CAP_PROP_FPS: TRACK.fps}.get(prop, 0)
+
+    def isOpened(self):
+        return True
+
+    def read(self, buffer=None):
+        if self.position >= self.frame_count:
+            return False, None
+        frame = buffer if buffer is not None else np.empty((FRAME_SIZE[1], FRAME_SIZE[0], 3), dtype=np.uint8)
+        frame[:] = (self.position % 256, self.position // 256, 0)
+        self.position += 1
+        return True, frame
+
+
+class FakePose:
+    """Kareden (RGB) numarayı okuyup sentetik izin o karedeki landmark'larını döner."""
+
+    def process(self, image):
+        index = int(image[0, 0, 1]) * 256 + int(image[0, 0, 2])
+        landmarks = TRACK.frame(index)
+        if landmarks is None:
+            return types.SimpleNamespace(pose_landmarks=None)
+        points = [types.SimpleNamespace(x=x, y=y, z=z, visibility=v) for x, y, z, v in landmarks]
+        return types.SimpleNamespace(pose_landmarks=types.SimpleNamespace(landmark=points))
+
+
+class FakeWriter:
+    def __init__(self):
+        self.frames = []
+
+    def write(self, image):
+        self.frames.append(image.copy())  # Çizici aynı tamponu her karede yeniden kullanır
+
+    def release(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fake_pose(monkeypatch):
+    @contextmanager
+    def acquire_pose(config):
+        yield FakePose()
+
+    monkeypatch.setattr(engine, 'acquire_pose', acquire_pose)
+
+
+def analyze(options, monkeypatch):
+    writer = FakeWriter()
+    monkeypatch.setattr(engine, 'open_writer', lambda video_id, spec, fps, size: (writer, 'output.mp4'))
+    result, track = analyze_capture(FakeCapture(len(TRACK.sampled)), 1, SQUAT, options, record_track=True)
+    return result, track, writer.frames
+
+
+@pytest.mark.parametrize("options", [
+    AnalysisOptions(),
+    AnalysisOptions(frame_stride=3, adaptive_sampling=True),
+    AnalysisOptions(render_output=True),
+    AnalysisOptions(render_output=True, frame_stride=2, smoothing=None),
+], ids=["default", "adaptive", "render", "render-stride-raw"])
+def test_pipelined_capture_matches_sequential(options, monkeypatch):
+    sequential = analyze(dataclasses.replace(options, pipelined=False), monkeypatch)
+    pipelined = analyze(dataclasses.replace(options, pipelined=True), monkeypatch)
+
+    (result, track, frames), (expected, expected_track, expected_frames) = pipelined, sequential
+    assert expected['correct_reps'] + expected['wrong_reps'] > 0
+    for key in ('correct_reps', 'wrong_reps', 'feedback', 'rep_confidence', 'frame_count', 'analyzed_frames'):
+        assert result[key] == expected[key], key
+    np.testing.assert_array_equal(track.sampled, expected_track.sampled)
+    np.testing.assert_array_equal(track.landmarks, expected_track.landmarks)
+
+    assert len(frames) == len(expected_frames) == (len(TRACK.sampled) if options.render_output else 0)
+    for index, (frame, expected_frame) in enumerate(zip(frames, expected_frames)):
+        np.testing.assert_array_equal(frame, expected_frame, err_msg=f"kare {index}")
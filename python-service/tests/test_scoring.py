@@ -0,0 +1,214 @@
+import numpy as np
+import pytest
+
+from analyzers.barbell_curl_analyzer import BARBELL_CURL
+from analyzers.engine import AnalysisOptions, PoseLandmark, RepCounter
+from analyzers.geometry import MIRROR, VISIBILITY, calculate_angle, joint_angles, select_side
+from analyzers.landmark_cache import LandmarkTrack
+from analyzers.pushup_analyzer import PUSHUP
+from analyzers.scoring import count_reps, score_track
+from analyzers.squat_analyzer import SQUAT
+from benchmarks.synthetic import synthetic_track
+
+SPECS = [SQUAT, PUSHUP, BARBELL_CURL]
+MOVING = {BARBELL_CURL.name: 'last'}  # Curl'de bilek döner, diğerlerinde üst eklem
+
+
+def random_angles(seed, frames=2000):
+    """Eşikler etrafında gezinen, tam sayıya yuvarlanmış (eşiklere eşit değerler de çıkar) açı serisi."""
+    rng = np.random.default_rng(seed)
+    angles = np.clip(np.cumsum(rng.normal(0, 12, frames)) % 200, 20, 180).round()
+    angles[rng.random(frames) < 0.1] = np.nan
+    return angles
+
+
+def step_through(angles, spec):
+    """RepCounter.step ile kare kare sayar (NaN kareler, canlı analizdeki gibi atlanır)."""
+    counter = RepCounter(spec)
+    active = np.zeros(len(angles), dtype=bool)
+    reps = []
+    start = None
+    for index, angle in enumerate(angles):
+        if not np.isnan(angle):
+            was_active = counter.state == spec.active_state
+            correct_before = counter.correct_reps
+            counter.step(angle)
+            now_active = counter.state == spec.active_state
+            if now_active and not was_active:
+                start = index
+            if was_active and not now_active:
+                reps.append((start, index, counter.correct_reps > correct_before))
+        active[index] = counter.state == spec.active_state
+    return active, reps, counter
+
+
+def live_summary(track, spec, smoothing=None):
+    """İzi canlı analizdeki gibi RepCounter.update ile kare kare sayar."""
+    counter = RepCounter(spec, smoothing, track.fps)
+    for index in np.flatnonzero(track.sampled):
+        counter.update(track.frame(index), int(index))
+    return counter.summary()
+
+
+@pytest.mark.parametrize("spec", SPECS, ids=lambda spec: spec.name)
+@pytest.mark.parametrize("seed", range(20))
+def test_count_reps_matches_state_machine(spec, seed):
+    angles = random_angles(seed)
+    active, reps = count_reps(angles, spec)
+    expected_active, expected_reps, counter = step_through(angles, spec)
+
+    np.testing.assert_array_equal(active, expected_active)
+    assert [(int(start), int(end), bool(ok)) for start, end, ok in reps] == expected_reps
+    assert int(reps['correct'].sum()) == counter.correct_reps
+    assert int((~reps['correct']).sum()) == counter.wrong_reps
+
+
+@pytest.mark.parametrize("spec", SPECS, ids=lambda spec: spec.name)
+@pytest.mark.parametrize("smoothing", [None, AnalysisOptions().smoothing], ids=["raw", "smoothed"])
+def test_score_track_matches_live_counter(spec, smoothing):
+    reps = ['deep', 'shallow', 'deep', 'deep', 'shallow', 'deep', 'shallow']
+    track = synthetic_track(spec, reps, seed=11, noise=6.0, outlier_ratio=0.08, stride=2,
+                            moving=MOVING.get(spec.name, 'first'))
+
+    live = live_summary(track, spec, smoothing)
+    offline = score_track(track, spec, smoothing)
+
+    assert (offline['correct_reps'], offline['wrong_reps']) == (live['correct_reps'], live['wrong_reps'])
+    assert offline['feedback'] == live['feedback']
+    assert offline['rep_confidence'] == live['rep_confidence']
+
+
+def test_joint_angles_computes_vertex_and_segment_angles_together():
+    rng = np.random.default_rng(0)
+    landmarks = rng.random((50, 33, 4)).astype(np.float32)
+    left = (PoseLandmark.LEFT_HIP, PoseLandmark.LEFT_KNEE, PoseLandmark.LEFT_ANKLE)
+    values = joint_angles(landmarks, (left, (PoseLandmark.LEFT_SHOULDER, PoseLandmark.LEFT_HIP)))
+    np.testing.assert_array_equal(values[:, 0], calculate_angle(*(landmarks[:, joint] for joint in left)))
+    assert joint_angles(landmarks[0], (left,))[0] == values[0, 0]
+
+    # (üst, alt) doğrultusu: dik 0, yatay 90, 45 derece eğik 45 (yönden bağımsız)
+    frame = np.zeros((33, 4))
+    frame[PoseLandmark.LEFT_HIP, :2] = (0.5, 0.5)
+    for shoulder, expected in (((0.5, 0.2), 0.0), ((0.8, 0.5), 90.0), ((0.2, 0.2), 45.0)):
+        frame[PoseLandmark.LEFT_SHOULDER, :2] = shoulder
+        segment = (PoseLandmark.LEFT_SHOULDER, PoseLandmark.LEFT_HIP)
+        assert joint_angles(frame, (segment,))[0] == pytest.approx(expected)
+
+
+def test_select_side_mirrors_frames_where_right_side_is_more_visible():
+    rng = np.random.default_rng(1)
+    landmarks = rng.random((6, 33, 4)).astype(np.float32)
+    left = list(SQUAT.joints)
+    right = [MIRROR[joint] for joint in left]
+    landmarks[::2, left, VISIBILITY], landmarks[::2, right, VISIBILITY] = 0.9, 0.2
+    landmarks[1::2, left, VISIBILITY], landmarks[1::2, right, VISIBILITY] = 0.2, 0.9
+
+    selected = select_side(landmarks, SQUAT.joints)
+    np.testing.assert_array_equal(selected[::2], landmarks[::2])
+    np.testing.assert_array_equal(selected[1::2, left], landmarks[1::2][:, right])
+    for frame, expected in zip(landmarks, selected):
+        np.testing.assert_array_equal(select_side(frame, SQUAT.joints), expected)
+
+
+def mirror(track, spec):
+    """
+    İzi sağ taraftan çekilmiş gibi aynalar: hareket sağ eklemlerde, kapalı kalan sol
+    eklemler ise düşük görünürlükle tek noktada (sol taraf seçilirse açı 0 çıkar).
+    """
+    landmarks = track.landmarks[:, list(MIRROR)].copy()
+    landmarks[..., 0] = 1.0 - landmarks[..., 0]
+    present = ~np.isnan(landmarks[:, PoseLandmark.NOSE, 0])
+    landmarks[np.ix_(present, spec.joints)] = (0.5, 0.5, 0.0, 0.1)
+    return LandmarkTrack(landmarks, track.sampled, track.fps)
+
+
+def knees_forward(track):
+    """
+    Squat izine dik bir gövde (omuz) ve +x yönüne bakan bir ayak (topuk, ayak ucu) ekler;
+    bacak diz etrafında döndürülür (diz açısı aynı): diz, baktığı yönde bileğin ~0.09
+    önündedir (dizler öne kayıyor).
+    """
+    landmarks = track.landmarks.copy()
+    rotate(landmarks, (PoseLandmark.LEFT_HIP, PoseLandmark.LEFT_ANKLE), PoseLandmark.LEFT_KNEE, 20)
+    with_joint(landmarks, PoseLandmark.LEFT_SHOULDER, PoseLandmark.LEFT_HIP, (0.0, -0.25))
+    with_joint(landmarks, PoseLandmark.LEFT_HEEL, PoseLandmark.LEFT_ANKLE, (-0.02, 0.02))
+    with_joint(landmarks, PoseLandmark.LEFT_FOOT_INDEX, PoseLandmark.LEFT_ANKLE, (0.1, 0.02))
+    return LandmarkTrack(landmarks, track.sampled, track.fps)
+
+
+@pytest.mark.parametrize("spec", SPECS, ids=lambda spec: spec.name)
+@pytest.mark.parametrize("smoothing", [None, AnalysisOptions().smoothing], ids=["raw", "smoothed"])
+def test_mirrored_track_counts_like_left_side(spec, smoothing):
+    track = synthetic_track(spec, ['deep', 'shallow', 'deep', 'deep', 'shallow'], seed=4, stride=2,
+                            moving=MOVING.get(spec.name, 'first'))
+    if spec is SQUAT:
+        track = knees_forward(track)  # x yönüne bağlı kural (knees_past_toes) iki tarafta da denenir
+    expected = score_track(track, spec, smoothing)
+    assert (expected['correct_reps'], expected['wrong_reps']) == (3, 2)
+    if spec is SQUAT:
+        assert "HATA: Dizleriniz one kayiyor" in expected['feedback']
+
+    mirrored = mirror(track, spec)
+    for result in (score_track(mirrored, spec, smoothing), live_summary(mirrored, spec, smoothing)):
+        assert (result['correct_reps'], result['wrong_reps']) == (3, 2)
+        assert result['feedback'] == expected['feedback']
+        assert result['rep_confidence'] == expected['rep_confidence']
+
+
+def with_joint(landmarks, joint, origin, offset):
+    """joint eklemini origin ekleminden offset (x, y) kadar uzağa, origin'in görünürlüğüyle yazar."""
+    landmarks[:, joint] = landmarks[:, origin]
+    landmarks[:, joint, 0] += offset[0]
+    landmarks[:, joint, 1] += offset[1]
+
+
+def lean_torso(track, degrees):
+    """Squat izine kalçadan dikeyle 'degrees' açı yapan bir gövde (omuz) ekler."""
+    landmarks = track.landmarks.copy()
+    radians = np.radians(degrees)
+    with_joint(landmarks, PoseLandmark.LEFT_SHOULDER, PoseLandmark.LEFT_HIP,
+               (0.25 * np.sin(radians), -0.25 * np.cos(radians)))
+    return LandmarkTrack(landmarks, track.sampled, track.fps)
+
+
+def rotate(landmarks, joints, center, degrees):
+    """joints eklemlerini center eklemi etrafında 'degrees' döndürür (center'daki açı değişmez)."""
+    radians = np.radians(degrees)
+    rotation = np.array([[np.cos(radians), -np.sin(radians)], [np.sin(radians), np.cos(radians)]])
+    pivot = landmarks[:, center, :2]
+    for joint in joints:
+        landmarks[:, joint, :2] = pivot + (landmarks[:, joint, :2] - pivot) @ rotation.T
+
+
+def swing_upper_arm(track, degrees):
+    """Curl izinde kolu dirsek etrafında döndürür: dirsek açısı aynı, üst kol dikeyden 'degrees' sapar."""
+    landmarks = track.landmarks.copy()
+    rotate(landmarks, (PoseLandmark.LEFT_SHOULDER, PoseLandmark.LEFT_WRIST), PoseLandmark.LEFT_ELBOW, degrees)
+    return LandmarkTrack(landmarks, track.sampled, track.fps)
+
+
+def drop_hips(track, drop):
+    """Şınav izine yatay bir vücut çizgisi ekler; kalça çizginin 'drop' altında (negatifse üstünde)."""
+    landmarks = track.landmarks.copy()
+    with_joint(landmarks, PoseLandmark.LEFT_HIP, PoseLandmark.LEFT_SHOULDER, (0.3, drop))
+    with_joint(landmarks, PoseLandmark.LEFT_ANKLE, PoseLandmark.LEFT_SHOULDER, (0.6, 0.0))
+    return LandmarkTrack(landmarks, track.sampled, track.fps)
+
+
+@pytest.mark.parametrize("spec, bend, clean, broken, message", [
+    # Gövde eğimi 45: normal squat; 70: öne kapanma (eşik 60)
+    (SQUAT, lean_torso, (0, 45), 70, "HATA: Govdeniz fazla one egiliyor"),
+    # Üst kol 20: tepe noktasında olağan; 55: dirsek öne kaçıyor (eşik 40)
+    (BARBELL_CURL, swing_upper_arm, (0, 20), 55, "HATA: Dirseginizi govdenize sabitleyin"),
+    # Kalça çizginin 0.02 altında: ~172 derece; 0.1 üstünde (pike): ~143 ama sarkma değil;
+    # 0.1 altında: ~143 derece sarkma (eşik 150)
+    (PUSHUP, drop_hips, (0.02, -0.1), 0.1, "HATA: Kalcaniz sarkiyor"),
+], ids=lambda value: getattr(value, 'name', None))
+def test_angle_rules_fire_only_on_broken_form(spec, bend, clean, broken, message):
+    track = synthetic_track(spec, ['deep'] * 3, seed=5, stride=2, moving=MOVING.get(spec.name, 'first'))
+    for amount in clean + (broken,):
+        bent = bend(track, amount)
+        result = score_track(bent, spec)
+        assert (result['correct_reps'], result['wrong_reps']) == (3, 0)
+        assert (message in result['feedback']) == (amount == broken), amount
+        assert live_summary(bent, spec)['feedback'] == result['feedback']
@@ -0,0 +1,104 @@
+import dataclasses
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+
+from analyzers.engine import AnalysisOptions, analyze_segment, analyze_segmented, analyze_track, stitch_segments
+from analyzers.landmark_cache import LandmarkCache, LandmarkTrack, track_key
+from analyzers.squat_analyzer import SQUAT, analyze_squat
+from analyzers.timing import JobTimer
+from benchmarks.synthetic import synthetic_track, synthetic_video
+
+
+def split(track, bounds):
+    """İzi verilen kare sınırlarından analyze_segment çıktısı biçiminde parçalara böler."""
+    edges = [0, *bounds, len(track.sampled)]
+    return [
+        {"start_frame": start,
+         "track": LandmarkTrack(track.landmarks[start:end], track.sampled[start:end], track.fps),
+         "timings": JobTimer().report()}
+        for start, end in zip(edges, edges[1:])
+    ]
+
+
+@pytest.mark.parametrize("bounds", [[100], [95, 260, 400], [1, 2, 3]])
+def test_stitched_segments_score_like_whole_track(bounds):
+    # Sınırlar tekrarların ortasına da denk gelir: her tekrar tam bir kez sayılmalı
+    track = synthetic_track(SQUAT, ['deep', 'shallow', 'deep', 'deep', 'shallow', 'deep'], seed=7, stride=2)
+    segments = split(track, bounds)
+
+    whole = analyze_track(track, SQUAT, smoothing=AnalysisOptions().smoothing)
+    stitched = analyze_segmented('file:///video.mp4', segments[::-1], SQUAT)
+
+    assert (stitched['correct_reps'], stitched['wrong_reps']) == (whole['correct_reps'], whole['wrong_reps'])
+    assert stitched['feedback'] == whole['feedback']
+    assert stitched['frame_count'] == whole['frame_count']
+    assert stitched['segments'] == len(bounds) + 1
+
+
+def test_stitch_rejects_gaps_and_overlaps():
+    track = synthetic_track(SQUAT, ['deep', 'deep'], seed=1)
+    segments = split(track, [60, 120])
+    with pytest.raises(ValueError):
+        stitch_segments([segments[0], segments[2]])
+    segments[1]["start_frame"] -= 1
+    with pytest.raises(ValueError):
+        stitch_segments(segments)
+
+
+def test_segmented_video_matches_sequential_run(tmp_path):
+    video = tmp_path / "video.mp4"
+    synthetic_video(str(video), size=(320, 240), frames=150, seed=3)
+    url = video.as_uri()
+    cache = LandmarkCache(str(tmp_path / "cache"), 64 * 1024 * 1024)
+    options = AnalysisOptions(allow_local_files=True, frame_stride=2, inference_max_side=256)
+
+    sequential = analyze_squat(url, 1, dataclasses.replace(options, landmark_cache=cache))
+    expected = cache.get(track_key(url))
+
+    # consumer.schedule_segments ile aynı bölme: 5 sn'lik video, 3 eşit parça
+    length = 5.0 / 3
+    segments = [analyze_segment(url, SQUAT, options, index * length, (index + 1) * length if index < 2 else None, 1.0)
+                for index in range(3)]
+    stitched = stitch_segments(segments)
+
+    assert len(stitched.sampled) == len(expected.sampled) == sequential['frame_count']
+    np.testing.assert_array_equal(stitched.sampled, expected.sampled)
+    np.testing.assert_array_equal(stitched.landmarks, expected.landmarks)
+    result = analyze_segmented(url, segments, SQUAT, options)
+    assert (result['correct_reps'], result['wrong_reps']) == (sequential['correct_reps'], sequential['wrong_reps'])
+
+
+class InlineScheduler:
+    """İşleri hemen, çağıran thread'de çalıştıran sahte zamanlayıcı."""
+
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, job):
+        self.jobs.append(job.function.__name__)
+        future = Future()
+        try:
+            future.set_result(job.function(*job.args))
+        except Exception as e:
+            future.set_exception(e)
+        job.on_done(future)
+
+
+def test_unstitchable_segments_fall_back_to_whole_video(monkeypatch):
+    import consumer
+
+    track = synthetic_track(SQUAT, ['deep', 'deep'], seed=2)
+    segments = split(track, [60, 120])
+    segments[2]["start_frame"] += 3  # Örn. yanlış konumlanan CAP_PROP_POS_FRAMES
+    monkeypatch.setattr(consumer, 'process_segment', lambda url, name, start, end: segments.pop(0))
+    monkeypatch.setattr(consumer, 'process_job', lambda video_id, url, name, render: {"correct_reps": 2, "wrong_reps": 0})
+
+    results = []
+    scheduler = InlineScheduler()
+    message = {'videoId': 1, 'videoUrl': 'https://example.com/video.mp4', 'exerciseName': 'squat'}
+    consumer.schedule_segments(scheduler, message, 9.0, 3, lambda future: results.append(future.result()))
+
+    assert scheduler.jobs == ['<lambda>'] * 3 + ['finish_segments', '<lambda>']
+    assert results == [{"correct_reps": 2, "wrong_reps": 0}]